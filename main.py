@@ -1,5 +1,6 @@
-import pygame, os
-from src.settings import SCREEN, FPS, SCREEN_WIDTH, SCREEN_HEIGHT
+import pygame, os, argparse, time
+from src import settings
+from src.settings import FPS
 from src.player import Player
 from src.enemy_manager import EnemyManager
 from src.xp_manager import XPManager
@@ -13,12 +14,22 @@ from src.demo_timer import DemoTimer
 from src.game_over_screen import GameOverScreen
 from src.player_hud import PlayerHUD
 from src.enemy_health_bar import EnemyHealthBarManager
-from src.spatial_grid import SpatialGrid
+from src.broadphase import BROADPHASE_BACKENDS, create_broadphase
+from src.spatial_grid import rects_overlap
 from src.performance_monitor import PerformanceMonitor
 from src.parallax_manager import ParallaxManager
-
-pygame.init()
-SCREEN
+from src.asset_cache import asset_cache, tint_cache
+from src.texture_atlas import TextureAtlas, blit_group
+from src.asset_preloader import AssetPreloader
+from src.asset_pack import AssetPack, DEFAULT_PACK_PATH
+from src.loading_screen import LoadingScreen
+from src.world import World
+from src.flow_field import FlowField
+from src.wave_director import WaveDirector, load_timeline, DEFAULT_TIMELINE_PATH
+from src.enemy_archetypes import ArchetypeTable, load_archetypes, DEFAULT_ARCHETYPES_PATH
+
+# Rozmiary czcionek używane przez interfejs (wczytywane przez preloader)
+UI_FONT_SIZES = (24, 28, 32, 36, 48, 72)
 
 def load_background():
     try:
@@ -33,18 +44,124 @@ def scale_background():
     image = pygame.image.load(path).convert()
     image_width = image.get_width()
     image_height = image.get_height()
-    scaled_w = SCREEN_WIDTH / image_width
-    scaled_h = SCREEN_HEIGHT / image_height
+    scaled_w = settings.SCREEN_WIDTH / image_width
+    scaled_h = settings.SCREEN_HEIGHT / image_height
     scale = max(scaled_w, scaled_h)
     image_width *= scale
     image_height *= scale
     return pygame.transform.scale(image, (int(image_width), int(image_height)))
-def main():
+def preload_assets(screen, clock):
+    """
+    Wczytuje obrazy, dźwięki i czcionki w tle, rysując ekran ładowania.
+
+    Args:
+        screen: Powierzchnia ekranu
+        clock: Zegar pygame
+
+    Returns:
+        AssetPreloader po zakończeniu wczytywania lub None, jeśli gracz zamknął grę
+    """
+    loading_screen = LoadingScreen()
+    preloader = AssetPreloader(progress_callback=loading_screen.on_progress)
+    preloader.add_directory(os.path.join('assets', 'gfx'))
+    preloader.add_directory(os.path.join('assets', 'sfx'))
+    for size in UI_FONT_SIZES:
+        preloader.add_font(None, size)
+    preloader.start()
+
+    while not preloader.poll():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return None
+        loading_screen.draw(screen, preloader.get_progress())
+        pygame.display.update()
+        clock.tick(FPS)
+
+    return preloader
+
+def main(display_mode=None, resolution=None, broadphase=None):
+    """
+    Uruchamia grę.
+
+    Args:
+        display_mode: Tryb wyświetlania (fullscreen, windowed, headless) lub None dla domyślnego
+        resolution: Krotka (szerokość, wysokość) lub None dla domyślnej
+        broadphase: Nazwa backendu broadphase lub None dla settings.BROADPHASE
+    """
+    startup_start = time.perf_counter()
+    SCREEN = settings.init_display(display_mode, resolution)
     clock = pygame.time.Clock()
     run = True
+
+    # Jeśli istnieje zbudowany plik pack, czytaj zasoby z niego zamiast z luźnych plików
+    if os.path.exists(DEFAULT_PACK_PATH):
+        asset_cache.mount_pack(AssetPack(DEFAULT_PACK_PATH))
+
+    # Wczytaj zasoby w tle przed utworzeniem obiektów gry
+    if preload_assets(SCREEN, clock) is None:
+        pygame.quit()
+        return
+
+    # Spakuj sprite'y w jeden atlas - byty dostają regiony atlasu zamiast osobnych powierzchni
+    texture_atlas = TextureAtlas()
+    texture_atlas.build_from_directory(os.path.join('assets', 'gfx'))
+    asset_cache.add_atlas(texture_atlas)
+
+    # Zbuduj zarejestrowane warianty kolorów pocisków przed rozgrywką
+    tint_cache.prebuild()
+
+    # Świat z kamerą - kawałki daleko od gracza śpią (bez aktualizacji i kolizji)
+    world = World(
+        settings.WORLD_WIDTH, settings.WORLD_HEIGHT,
+        settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT,
+        chunk_size=settings.CHUNK_SIZE, wake_margin=settings.CHUNK_WAKE_MARGIN
+    )
+
     player = Player()
-    enemy_manager = EnemyManager(spawn_distance=150, max_enemies=30)  # Zmniejszono z 50 na 30
-    xp_manager = XPManager()
+    player.rect.center = world.get_center()
+    world.update_camera(player.rect)
+
+    # Broadphase (domyślnie spatial grid) jest trwały - EnemyManager dodaje, przenosi i usuwa wrogów na bieżąco
+    # Obejmuje cały świat, ale zawiera tylko wrogów z aktywnych kawałków
+    # Siatka sama dobiera rozmiar komórki do rozmiaru sprite'ów, gęstości wrogów i rozdzielczości
+    broadphase = broadphase or settings.BROADPHASE
+    broadphase_options = {}
+    if broadphase == 'grid':
+        broadphase_options = {
+            'auto_tune': True,
+            'max_cell_size': min(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT) // 2,
+            # Skupisko hordy w jednej komórce zagęszcza siatkę, nawet gdy średnia jest w normie
+            'max_cell_occupancy': 16
+        }
+    # Typy wrogów z pliku danych (bez pliku - tylko domyślny wróg)
+    archetypes = load_archetypes() if os.path.exists(DEFAULT_ARCHETYPES_PATH) else ArchetypeTable()
+    # Komórka siatki nie mniejsza niż największy typ wroga, żeby sąsiedztwo 3x3 obejmowało nachodzących wrogów
+    spatial_grid = create_broadphase(
+        broadphase, settings.WORLD_WIDTH, settings.WORLD_HEIGHT,
+        entity_size=archetypes.get_max_size(), **broadphase_options
+    )
+    # Rozpychanie wrogów od sąsiadów - horda nie zlewa się w jedną kupę w kilku komórkach siatki
+    # Kierunek pościgu wrogowie odczytują ze wspólnego pola przepływu (omija przeszkody)
+    enemy_manager = EnemyManager(
+        spawn_distance=150, max_enemies=30,  # Zmniejszono z 50 na 30
+        spatial_grid=spatial_grid, world=world,
+        separation_strength=300, separation_radius=40,
+        flow_field=FlowField(cell_size=64, update_interval=4),
+        # Wrogowie dalej niż 500 px od gracza są aktualizowani co 2. klatkę, dalej niż 1000 px - co 4.
+        lod_bands=[(500, 1), (1000, 2), (None, 4)],
+        # Spawny z fal i wysypów z osi czasu rozłożone na klatki: najwyżej 3 na klatkę i 1 ms pracy
+        wave_director=WaveDirector(
+            max_enemies=30, max_spawns_per_frame=3, max_spawn_ms=1.0,
+            timeline=load_timeline(DEFAULT_TIMELINE_PATH) if os.path.exists(DEFAULT_TIMELINE_PATH) else None
+        ),
+        archetypes=archetypes,
+        # Spawn w najmniej zatłoczonym z 8 miejsc na pierścieniu, co najmniej 100 px od gracza,
+        # z pominięciem miejsc z 4 i więcej wrogami w komórkach siatki
+        spawn_candidates=8, spawn_ring_width=200, spawn_safety_radius=100, spawn_cell_capacity=4,
+        # Co piąty spawn z krzywej fal zaczyna 5-osobowy oddział - pościg liczy tylko przywódca
+        squad_chance=0.2, squad_size=5
+    )
+    xp_manager = XPManager(world=world)
     upgrade_pool = UpgradePool()
 
     # Inicjalizuj parallax manager zamiast scaled_background
@@ -57,12 +174,17 @@ def main():
     demo_timer = DemoTimer(duration_seconds=600)  # 10 minut
     player_hud = PlayerHUD()
     enemy_health_bar_manager = EnemyHealthBarManager()
-    spatial_grid = SpatialGrid(SCREEN_WIDTH, SCREEN_HEIGHT, cell_size=100)
     performance_monitor = PerformanceMonitor(show_debug=True)  # Wyświetlaj FPS i debug info
 
     # Przekaż sound_manager do gracza
     player.set_sound_manager(sound_manager)
 
+    # Bronie celujące szukają najbliższego wroga w siatce zamiast przeglądać listę wrogów
+    player.set_target_finder(spatial_grid)
+
+    # Czas od uruchomienia do pierwszej klatki gry
+    performance_monitor.set_startup_time(time.perf_counter() - startup_start)
+
     # Stan gry
     game_paused = False
     level_up_screen = None
@@ -70,6 +192,9 @@ def main():
     demo_ended = False
     enemies_killed = 0
 
+    # Bufor wielokrotnego użytku na wyniki zapytań kolizji - bez nowych list w każdej klatce
+    nearby_buffer = []
+
     while run:
         dt = clock.tick(FPS) / 1000
         keys = pygame.key.get_pressed()
@@ -119,6 +244,10 @@ def main():
             player.input(keys, dt)
             player.update(dt)
 
+            # Kamera podąża za graczem i wyznacza aktywne kawałki świata
+            world.update_camera(player.rect)
+            camera_x, camera_y = world.get_camera_offset()
+
             # Aktualizuj parallax na podstawie ruchu gracza
             parallax_manager.update(player.velocity_x, player.velocity_y, dt)
 
@@ -126,102 +255,86 @@ def main():
             if player.is_invincible_now():
                 # Miganie: pokaż gracza co 0.1 sekundy
                 if (player.invincibility_timer * 10) % 2 < 1:
-                    player.draw(SCREEN)
+                    player.draw(SCREEN, camera_x, camera_y)
             else:
-                player.draw(SCREEN)
+                player.draw(SCREEN, camera_x, camera_y)
 
             # Aktualizuj wrogów
             enemy_manager.update(dt, player)
+            spatial_grid.maybe_retune()
 
-            # Rysuj wrogów
-            for enemy in enemy_manager.get_enemies():
-                enemy.draw(SCREEN)
+            # Rysuj wrogów (jedno wywołanie blits dla całej grupy)
+            blit_group(SCREEN, enemy_manager.get_enemies(), camera_x, camera_y)
 
             # Aktualizuj paski zdrowia (obsługuje zanikanie po śmierci)
             enemy_health_bar_manager.update(dt, enemy_manager.get_enemies())
 
             # Rysuj paski zdrowia wrogów
-            enemy_health_bar_manager.draw_all(SCREEN, enemy_manager.get_enemies())
-
-            # Optymalizacja: Przebuduj spatial grid z aktualną listą wrogów
-            # Czyść siatkę i dodaj wszystkich żywych wrogów
-            spatial_grid.clear()
-            for enemy in enemy_manager.get_enemies():
-                spatial_grid.add_object(enemy)
+            enemy_health_bar_manager.draw_all(SCREEN, enemy_manager.get_enemies(), camera_x, camera_y)
 
             # Sprawdzaj kolizje gracza z wrogami - używaj spatial grid dla wydajności
             # Zamiast iterować po wszystkich wrogach, sprawdzaj tylko pobliskich
-            nearby_enemies = spatial_grid.get_nearby_objects(player, radius=1)
-            for enemy in nearby_enemies:
-                if player.rect.colliderect(enemy.rect):
-                    # Gracz otrzymuje obrażenia od wroga
-                    if player.take_damage(1):  # 1 obrażenie na klatkę
-                        # Gracz umarł
-                        sound_manager.play_enemy_death_sound()
-                        game_over_screen = GameOverScreen(
-                            player_level=player.get_level(),
-                            total_xp=player.level_manager.total_xp,
-                            enemies_killed=enemies_killed,
-                            time_survived=demo_timer.elapsed_time
-                        )
-                        game_paused = True
+            spatial_grid.query_nearby(player, nearby_buffer, radius=1, predicate=rects_overlap)
+            for enemy in nearby_buffer:
+                # Gracz otrzymuje obrażenia od wroga
+                if player.take_damage(1):  # 1 obrażenie na klatkę
+                    # Gracz umarł
+                    sound_manager.play_enemy_death_sound()
+                    game_over_screen = GameOverScreen(
+                        player_level=player.get_level(),
+                        total_xp=player.level_manager.total_xp,
+                        enemies_killed=enemies_killed,
+                        time_survived=demo_timer.elapsed_time
+                    )
+                    game_paused = True
 
             # Rysuj pociski z broni gracza i sprawdzaj kolizje z wrogami
-            for projectile in player.get_bullets().copy():
-                projectile.draw(SCREEN)
-
+            projectiles = player.get_bullets()
+            blit_group(SCREEN, projectiles, camera_x, camera_y)
+            for projectile in projectiles:
                 # Sprawdzaj kolizje z wrogami (używając spatial grid)
-                nearby_enemies = spatial_grid.get_nearby_objects(projectile, radius=1)
-                projectile_removed = False  # Flaga do śledzenia, czy pocisk został usunięty
-
-                for enemy in nearby_enemies:
-                    if projectile.rect.colliderect(enemy.rect):
-                        # Zadaj obrażenia wrogowi
-                        sound_manager.play_hit_sound()
-                        effect_manager.add_hit_flash(id(enemy), enemy.rect, duration=0.1)
-
-                        # Zastosuj efekt odrzutu wroga (Game Feel)
-                        enemy.apply_knockback(projectile.rect.centerx, projectile.rect.centery, knockback_force=200)
-
-                        if enemy.take_damage(projectile.damage):
-                            # Wróg umarł - spawniaj XP klejnoty
-                            sound_manager.play_enemy_death_sound()
-                            xp_manager.spawn_gems_from_enemy(
-                                enemy.rect.centerx,
-                                enemy.rect.centery,
-                                num_gems=2,
-                                xp_per_gem=10
-                            )
-                            enemy_manager.remove_enemy(enemy)
-                            enemies_killed += 1
-
-                        # Obsługuj piercing - licznik przebić
-                        # piercing=True: nieskończone przebicia (np. tarcza)
-                        # piercing=False: brak przebić (zwykłe kule)
-                        # piercing=liczba: liczba przebić (np. laser z piercing=2)
-                        should_remove = False
-                        if isinstance(projectile.piercing, bool):
-                            # Jeśli piercing to boolean
-                            if not projectile.piercing:
-                                should_remove = True
-                        else:
-                            # Jeśli piercing to liczba
-                            projectile.piercing_count += 1
-                            if projectile.piercing_count >= projectile.piercing:
-                                should_remove = True
-
-                        if should_remove and projectile.weapon_source is not None:
-                            projectile.weapon_source.remove_projectile(projectile)
-                            projectile_removed = True
-
-                        # Przerwij pętlę po kolizji - pocisk już nie będzie kolidować z innymi wrogami w tej klatce
-                        break
-
-                # Usuń pocisk, jeśli wyszedł poza ekran - ale tylko jeśli nie został już usunięty
-                if not projectile_removed and projectile.is_off_screen(SCREEN_WIDTH, SCREEN_HEIGHT):
-                    if projectile.weapon_source is not None:
+                # Pocisk trafia najwyżej jednego wroga na klatkę, więc zapytanie kończy się na pierwszym trafieniu
+                enemy = None
+
+                if projectile.needs_swept_test():
+                    # Szybki pocisk (lub długa klatka) - sprawdź całą drogę, żeby nie przeskoczył przez wroga
+                    swept_hits = spatial_grid.query_swept(
+                        projectile.get_step_start_rect(),
+                        projectile.last_dx,
+                        projectile.last_dy
+                    )
+                    if swept_hits:
+                        enemy = swept_hits[0]
+                elif spatial_grid.query_nearby(projectile, nearby_buffer, radius=1, predicate=rects_overlap, first_hit=True):
+                    enemy = nearby_buffer[0]
+
+                if enemy is not None:
+                    # Zadaj obrażenia wrogowi
+                    sound_manager.play_hit_sound()
+                    effect_manager.add_hit_flash(id(enemy), enemy.rect, duration=0.1)
+
+                    # Zastosuj efekt odrzutu wroga (Game Feel)
+                    enemy.apply_knockback(projectile.rect.centerx, projectile.rect.centery, knockback_force=200)
+
+                    if enemy.take_damage(projectile.damage):
+                        # Wróg umarł - spawniaj XP klejnoty
+                        sound_manager.play_enemy_death_sound()
+                        xp_manager.spawn_gems_from_enemy(
+                            enemy.rect.centerx,
+                            enemy.rect.centery,
+                            num_gems=enemy.xp_gems,
+                            xp_per_gem=enemy.xp_per_gem
+                        )
+                        enemy_manager.remove_enemy(enemy)
+                        enemies_killed += 1
+
+                    # Pocisk znika po trafieniu zgodnie z atrybutem piercing
+                    if projectile.register_hit() and projectile.weapon_source is not None:
                         projectile.weapon_source.remove_projectile(projectile)
 
+            # Usuń pociski, które wyszły poza widok kamery, i trafione powyżej (jedna operacja na tablicach)
+            player.cull_projectiles(world.get_view_rect())
+
             # Aktualizuj klejnoty XP i zbieraj je
             collected_xp, collected_gems = xp_manager.update(dt, player)
             if collected_xp > 0:
@@ -242,25 +355,14 @@ def main():
             # Rysuj klejnoty XP z subtelnym efektem parallax
             # Klejnoty dryfują z innym depth niż tło (0.1 zamiast 0.3)
             gem_parallax_offset = parallax_manager.get_parallax_offset(depth=0.1)
-            for gem in xp_manager.get_gems():
-                # Tymczasowo przesuń klejnot o offset parallax
-                original_x = gem.rect.centerx
-                original_y = gem.rect.centery
-                gem.rect.centerx -= gem_parallax_offset[0]
-                gem.rect.centery -= gem_parallax_offset[1]
-                gem.draw(SCREEN)
-                # Przywróć oryginalną pozycję
-                gem.rect.centerx = original_x
-                gem.rect.centery = original_y
+            blit_group(SCREEN, xp_manager.get_gems(), camera_x + gem_parallax_offset[0], camera_y + gem_parallax_offset[1])
         else:
             # Gra jest wznowiona - rysuj ostatnią klatkę
-            player.draw(SCREEN)
-            for enemy in enemy_manager.get_enemies():
-                enemy.draw(SCREEN)
-            for projectile in player.get_bullets():
-                projectile.draw(SCREEN)
-            for gem in xp_manager.get_gems():
-                gem.draw(SCREEN)
+            camera_x, camera_y = world.get_camera_offset()
+            player.draw(SCREEN, camera_x, camera_y)
+            blit_group(SCREEN, enemy_manager.get_enemies(), camera_x, camera_y)
+            blit_group(SCREEN, player.get_bullets(), camera_x, camera_y)
+            blit_group(SCREEN, xp_manager.get_gems(), camera_x, camera_y)
 
         # Rysuj HUD gracza (jeśli gra nie jest wznowiona)
         if not game_paused or level_up_screen is None:
@@ -275,7 +377,11 @@ def main():
             SCREEN,
             enemy_count=len(enemy_manager.get_enemies()),
             projectile_count=len(player.get_bullets()),
-            gem_count=len(xp_manager.get_gems())
+            gem_count=len(xp_manager.get_gems()),
+            asset_stats=asset_cache.get_stats(),
+            broadphase_stats=spatial_grid.get_stats(),
+            world_stats=world.get_stats(),
+            pool_stats=enemy_manager.get_pool_stats()
         )
 
         # Rysuj ekran awansu, jeśli jest aktywny
@@ -300,5 +406,17 @@ def main():
         pygame.display.update()
     pygame.quit()
 
+def parse_args():
+    """Parsuje argumenty wiersza poleceń (tryb wyświetlania i rozdzielczość)."""
+    parser = argparse.ArgumentParser(description="Void Bloom")
+    parser.add_argument('--display', choices=settings.DISPLAY_MODES, default=None,
+                        help="Tryb wyświetlania (domyślnie VOID_BLOOM_DISPLAY lub fullscreen)")
+    parser.add_argument('--resolution', type=settings.parse_resolution, default=None,
+                        help="Rozdzielczość w formacie SZEROKOŚĆxWYSOKOŚĆ, np. 1280x720")
+    parser.add_argument('--broadphase', choices=sorted(BROADPHASE_BACKENDS), default=None,
+                        help="Backend broadphase kolizji (domyślnie VOID_BLOOM_BROADPHASE lub grid)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    main(args.display, args.resolution, args.broadphase)
\ No newline at end of file
@@ -1,6 +1,8 @@
 import math
 import os
 from src.projectile import Projectile
+from src.projectile_store import ProjectileStore
+from src.asset_cache import register_tint
 
 
 class LaserProjectile(Projectile):
@@ -8,6 +10,9 @@ class LaserProjectile(Projectile):
     Pocisk lasera - szybki i silny, porusza się w kierunku ruchu gracza.
     """
 
+    IMAGE_PATH = os.path.join('assets', 'gfx', 'bullet.png')
+    COLOR = (0, 255, 100)  # Zielony kolor dla laserów
+
     def __init__(self, x, y, direction_x=1, direction_y=0, speed=500, damage=15, weapon_source=None):
         """
         Inicjalizuje LaserProjectile.
@@ -21,11 +26,10 @@ class LaserProjectile(Projectile):
             damage: Obrażenia (domyślnie 15)
             weapon_source: Referencja do broni, która wystrzelił ten pocisk
         """
-        image_path = os.path.join('assets', 'gfx', 'bullet.png')
         super().__init__(
             x=x,
             y=y - 32,
-            image_path=image_path,
+            image_path=self.IMAGE_PATH,
             speed=speed,
             damage=damage,
             lifetime=None,
@@ -33,7 +37,7 @@ class LaserProjectile(Projectile):
             direction_y=direction_y,
             weapon_source=weapon_source,
             piercing=2,  # Lasery przebijają 2 wrogów
-            color=(0, 255, 100)  # Zielony kolor dla laserów
+            color=self.COLOR
         )
 
 
@@ -42,6 +46,9 @@ class ShieldProjectile(Projectile):
     Pocisk tarczy - krąży wokół gracza w orbicie.
     """
 
+    IMAGE_PATH = os.path.join('assets', 'gfx', 'bullet.png')
+    COLOR = (100, 150, 255)  # Niebieski kolor dla pocisków tarczy
+
     def __init__(self, x, y, player_x, player_y, angle=0, speed=200, damage=8, orbit_radius=80, weapon_source=None):
         """
         Inicjalizuje ShieldProjectile.
@@ -57,11 +64,10 @@ class ShieldProjectile(Projectile):
             orbit_radius: Promień orbity (domyślnie 80)
             weapon_source: Referencja do broni, która wystrzelił ten pocisk
         """
-        image_path = os.path.join('assets', 'gfx', 'bullet.png')
         super().__init__(
             x=x,
             y=y,
-            image_path=image_path,
+            image_path=self.IMAGE_PATH,
             speed=speed,
             damage=damage,
             lifetime=None,
@@ -69,67 +75,36 @@ class ShieldProjectile(Projectile):
             direction_y=0,
             weapon_source=weapon_source,
             piercing=True,  # Pociski tarczy przechodzą przez wrogów
-            color=(100, 150, 255)  # Niebieski kolor dla pocisków tarczy
+            color=self.COLOR
         )
-        self.player_x = player_x
-        self.player_y = player_y
         self.angle = angle
         self.orbit_radius = orbit_radius
         self.angular_velocity = speed / orbit_radius  # Prędkość kątowa
+        # Startuj od razu na orbicie - dalszy ruch po orbicie liczy ProjectileStore.step
+        self.rect.center = (
+            player_x + math.cos(angle) * orbit_radius,
+            player_y + math.sin(angle) * orbit_radius
+        )
 
-    def move(self, dt):
-        """
-        Przesuwa pocisk w orbicie wokół gracza.
-
-        Args:
-            dt: Delta czasu od ostatniej klatki
-        """
-        # Aktualizuj kąt
-        self.angle += self.angular_velocity * dt
-
-        # Oblicz nową pozycję na orbicie
-        new_x = self.player_x + math.cos(self.angle) * self.orbit_radius
-        new_y = self.player_y + math.sin(self.angle) * self.orbit_radius
-
-        # Ustaw nową pozycję
-        self.rect.centerx = new_x
-        self.rect.centery = new_y
-
-    def update(self, dt, player_x=None, player_y=None):
-        """
-        Aktualizuje stan pocisku (orbita wokół gracza).
-
-        Args:
-            dt: Delta czasu od ostatniej klatki
-            player_x: Aktualna pozycja X gracza
-            player_y: Aktualna pozycja Y gracza
-
-        Returns:
-            True jeśli pocisk powinien być usunięty, False w przeciwnym razie
-        """
-        # Aktualizuj pozycję gracza, jeśli podana
-        if player_x is not None and player_y is not None:
-            self.player_x = player_x
-            self.player_y = player_y
-
-        self.move(dt)
+    def detach_store(self):
+        """Kopiuje też kąt orbity z tablic magazynu."""
+        if self.store is not None:
+            self.angle = float(self.store.angle[self.store_index])
+        super().detach_store()
 
-        # Aktualizuj czas życia
-        if self.lifetime is not None:
-            self.elapsed_time += dt
-            if self.elapsed_time >= self.lifetime:
-                return True
 
-        return False
+# Zarejestruj kolory z wyprzedzeniem, aby nie kolorować w trakcie rozgrywki
+register_tint(LaserProjectile.IMAGE_PATH, LaserProjectile.COLOR)
+register_tint(ShieldProjectile.IMAGE_PATH, ShieldProjectile.COLOR)
 
 
 class LaserWeapon:
     """
-    Broń laserowa - strzela w kierunku ruchu gracza.
+    Broń laserowa - strzela w najbliższego wroga w zasięgu, a bez celu w kierunku ruchu gracza.
     Szybsze pociski, wyższe obrażenia.
     """
 
-    def __init__(self, player_x, player_y, fire_rate=1.5, damage=15):
+    def __init__(self, player_x, player_y, fire_rate=1.5, damage=15, projectile_store=None):
         """
         Inicjalizuje LaserWeapon.
 
@@ -138,12 +113,17 @@ class LaserWeapon:
             player_y: Pozycja Y gracza
             fire_rate: Liczba strzałów na sekundę (domyślnie 1.5)
             damage: Obrażenia (domyślnie 15)
+            projectile_store: Wspólny ProjectileStore aktualizowany przez właściciela
+                (domyślnie własny magazyn aktualizowany w update())
         """
         self.name = "⚡ Laser"
         self.fire_rate = fire_rate
         self.cooldown_duration = 1.0 / fire_rate
         self.cooldown_timer = 0.0
-        self.projectiles = []
+        # Pociski są w magazynie - broń trzyma tylko uchwyty do swoich pocisków
+        self.owns_store = projectile_store is None
+        self.projectile_store = ProjectileStore() if projectile_store is None else projectile_store
+        self.projectiles = set()
         self.player_x = player_x
         self.player_y = player_y
         self.damage = damage
@@ -151,6 +131,10 @@ class LaserWeapon:
         self.last_direction_y = 0
         self.sound_manager = None
 
+        # Namierzanie: obiekt z get_nearest() (np. SpatialGrid z wrogami), ustawiany później
+        self.target_finder = None
+        self.aim_range = 700  # Maksymalna odległość celu w pikselach
+
     def set_sound_manager(self, sound_manager):
         """
         Ustawia sound_manager dla broni.
@@ -160,6 +144,15 @@ class LaserWeapon:
         """
         self.sound_manager = sound_manager
 
+    def set_target_finder(self, target_finder):
+        """
+        Ustawia źródło celów dla namierzania.
+
+        Args:
+            target_finder: Obiekt z metodą get_nearest(x, y, max_distance) (np. SpatialGrid) lub None
+        """
+        self.target_finder = target_finder
+
     def set_direction(self, direction_x, direction_y):
         """
         Ustawia kierunek strzału.
@@ -188,7 +181,7 @@ class LaserWeapon:
         self.player_x = player_x
         self.player_y = player_y
 
-        # Ustaw kierunek strzału na podstawie prędkości gracza
+        # Bez celu strzelaj w kierunku ruchu gracza (cel jest szukany dopiero w shoot())
         # Jeśli gracz się nie porusza, użyj ostatniego kierunku
         if velocity_x != 0 or velocity_y != 0:
             self.set_direction(velocity_x, velocity_y)
@@ -198,10 +191,9 @@ class LaserWeapon:
         else:
             self.shoot()
 
-        for projectile in self.projectiles[:]:
-            should_remove = projectile.update(dt)
-            if should_remove:
-                self.projectiles.remove(projectile)
+        # Aktualizuj pociski (wspólny magazyn aktualizuje jego właściciel)
+        if self.owns_store:
+            self.projectile_store.update(dt, player_x, player_y)
 
     def shoot(self):
         """Tworzy nowy pocisk lasera."""
@@ -209,6 +201,12 @@ class LaserWeapon:
         if self.sound_manager is not None:
             self.sound_manager.play_shoot_sound()
 
+        # Celuj w najbliższego wroga w zasięgu - zapytanie tylko w klatce strzału
+        if self.target_finder is not None:
+            target = self.target_finder.get_nearest(self.player_x, self.player_y, max_distance=self.aim_range)
+            if target is not None:
+                self.set_direction(target.rect.centerx - self.player_x, target.rect.centery - self.player_y)
+
         projectile = LaserProjectile(
             self.player_x,
             self.player_y,
@@ -218,17 +216,18 @@ class LaserWeapon:
             damage=self.damage,
             weapon_source=self
         )
-        self.projectiles.append(projectile)
+        self.projectile_store.add(projectile)
+        self.projectiles.add(projectile)
         self.cooldown_timer = self.cooldown_duration
 
     def get_projectiles(self):
-        """Zwraca listę pocisków."""
+        """Zwraca uchwyty pocisków tej broni (zbiór)."""
         return self.projectiles
 
     def remove_projectile(self, projectile):
-        """Usuwa pocisk z listy."""
+        """Oznacza pocisk do usunięcia z magazynu (uchwyt znika przy ProjectileStore.compact())."""
         if projectile in self.projectiles:
-            self.projectiles.remove(projectile)
+            self.projectile_store.mark_removed(projectile)
 
     def set_damage(self, damage):
         """Ustawia obrażenia dla nowych pocisków."""
@@ -241,7 +240,7 @@ class ShieldWeapon:
     Niższe obrażenia, ale zawsze aktywna obrona.
     """
 
-    def __init__(self, player_x, player_y, fire_rate=2.0, damage=8, num_projectiles=3):
+    def __init__(self, player_x, player_y, fire_rate=2.0, damage=8, num_projectiles=3, projectile_store=None):
         """
         Inicjalizuje ShieldWeapon.
 
@@ -251,12 +250,17 @@ class ShieldWeapon:
             fire_rate: Liczba nowych pocisków na sekundę (domyślnie 2.0)
             damage: Obrażenia (domyślnie 8)
             num_projectiles: Liczba pocisków w orbicie (domyślnie 3)
+            projectile_store: Wspólny ProjectileStore aktualizowany przez właściciela
+                (domyślnie własny magazyn aktualizowany w update())
         """
         self.name = "🛡️ Tarcza"
         self.fire_rate = fire_rate
         self.cooldown_duration = 1.0 / fire_rate
         self.cooldown_timer = 0.0
-        self.projectiles = []
+        # Pociski są w magazynie - broń trzyma tylko uchwyty do swoich pocisków
+        self.owns_store = projectile_store is None
+        self.projectile_store = ProjectileStore() if projectile_store is None else projectile_store
+        self.projectiles = set()
         self.player_x = player_x
         self.player_y = player_y
         self.damage = damage
@@ -291,7 +295,8 @@ class ShieldWeapon:
                 orbit_radius=self.orbit_radius,
                 weapon_source=self
             )
-            self.projectiles.append(projectile)
+            self.projectile_store.add(projectile)
+            self.projectiles.add(projectile)
 
     def update(self, dt, player_x, player_y, velocity_x=0, velocity_y=0):
         """
@@ -312,10 +317,9 @@ class ShieldWeapon:
         else:
             self.shoot()
 
-        for projectile in self.projectiles[:]:
-            should_remove = projectile.update(dt, player_x, player_y)
-            if should_remove:
-                self.projectiles.remove(projectile)
+        # Aktualizuj pociski (wspólny magazyn aktualizuje jego właściciel)
+        if self.owns_store:
+            self.projectile_store.update(dt, player_x, player_y)
 
     def shoot(self):
         """Tworzy nowy pocisk w orbicie."""
@@ -335,17 +339,18 @@ class ShieldWeapon:
             orbit_radius=self.orbit_radius,
             weapon_source=self
         )
-        self.projectiles.append(projectile)
+        self.projectile_store.add(projectile)
+        self.projectiles.add(projectile)
         self.cooldown_timer = self.cooldown_duration
 
     def get_projectiles(self):
-        """Zwraca listę pocisków."""
+        """Zwraca uchwyty pocisków tej broni (zbiór)."""
         return self.projectiles
 
     def remove_projectile(self, projectile):
-        """Usuwa pocisk z listy."""
+        """Oznacza pocisk do usunięcia z magazynu (uchwyt znika przy ProjectileStore.compact())."""
         if projectile in self.projectiles:
-            self.projectiles.remove(projectile)
+            self.projectile_store.mark_removed(projectile)
 
     def set_damage(self, damage):
         """Ustawia obrażenia dla nowych pocisków."""
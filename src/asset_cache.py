@@ -0,0 +1,458 @@
+"""
+Asset Cache - współdzielona pamięć podręczna zasobów graficznych.
+Każdy plik jest ładowany z dysku tylko raz, a wszystkie byty dostają tę samą powierzchnię.
+Przechowuje także dźwięki i czcionki oraz pokolorowane warianty sprite'ów.
+"""
+import os
+import pygame
+
+
+class AssetCache:
+    """
+    Pamięć podręczna obrazów, dźwięków i czcionek współdzielona przez cały proces.
+    Zwracane powierzchnie są współdzielone - należy traktować je jako tylko do odczytu
+    (jeśli obraz ma być modyfikowany, trzeba najpierw wykonać copy()).
+    """
+
+    def __init__(self):
+        """Inicjalizuje AssetCache."""
+        # Słownik: znormalizowana ścieżka -> pygame.Surface
+        self.images = {}
+        # Ścieżki obrazów, które zostały już przekonwertowane do formatu ekranu
+        self.converted = set()
+        # Atlasy tekstur, których regiony są wydawane zamiast osobnych plików
+        self.atlases = []
+        # Słownik: znormalizowana ścieżka -> pygame.mixer.Sound
+        self.sounds = {}
+        # Słownik: znormalizowana ścieżka -> rozmiar próbek dźwięku w bajtach
+        self.sound_bytes = {}
+        # Słownik: (nazwa czcionki, rozmiar) -> pygame.font.Font
+        self.fonts = {}
+        # Zamontowany plik pack (AssetPack) - pliki z packu mają pierwszeństwo przed luźnymi plikami
+        self.pack = None
+
+        # Statystyki
+        self.hits = 0
+        self.misses = 0
+
+    def _get_key(self, path):
+        """
+        Zwraca klucz słownika dla ścieżki pliku.
+
+        Args:
+            path: Ścieżka do pliku
+
+        Returns:
+            Znormalizowana ścieżka
+        """
+        return os.path.normpath(path)
+
+    def mount_pack(self, pack):
+        """
+        Montuje plik pack jako źródło zasobów.
+
+        Args:
+            pack: Otwarty AssetPack (lub None, aby odmontować)
+        """
+        self.pack = pack
+
+    def exists(self, path):
+        """Sprawdza, czy zasób istnieje w packu lub jako luźny plik."""
+        return (self.pack is not None and self.pack.contains(path)) or os.path.exists(path)
+
+    def list_directory(self, directory):
+        """
+        Zwraca nazwy plików w katalogu zasobów (z packu i z dysku).
+
+        Args:
+            directory: Katalog zasobów
+
+        Returns:
+            Posortowana lista nazw plików
+        """
+        filenames = set()
+        if self.pack is not None:
+            filenames.update(self.pack.list_directory(directory))
+        if os.path.isdir(directory):
+            filenames.update(os.listdir(directory))
+        return sorted(filenames)
+
+    def decode_image(self, path):
+        """
+        Dekoduje obraz z packu lub z dysku, bez zapisywania w pamięci podręcznej.
+        Bezpieczne do wywołania z wątku roboczego.
+
+        Args:
+            path: Ścieżka do pliku obrazu
+
+        Returns:
+            Zdekodowana powierzchnia pygame
+        """
+        if self.pack is not None and self.pack.contains(path):
+            return self.pack.load_image(path)
+        return pygame.image.load(path)
+
+    def decode_sound(self, path):
+        """
+        Dekoduje dźwięk z packu lub z dysku, bez zapisywania w pamięci podręcznej.
+        Bezpieczne do wywołania z wątku roboczego.
+
+        Args:
+            path: Ścieżka do pliku dźwięku
+
+        Returns:
+            Obiekt pygame.mixer.Sound
+        """
+        if self.pack is not None and self.pack.contains(path):
+            return self.pack.load_sound(path)
+        return pygame.mixer.Sound(path)
+
+    def get_image(self, path):
+        """
+        Zwraca obraz z pamięci podręcznej, ładując go z dysku przy pierwszym użyciu.
+
+        Args:
+            path: Ścieżka do pliku obrazu
+
+        Returns:
+            Współdzielona powierzchnia pygame (tylko do odczytu)
+        """
+        key = self._get_key(path)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        return self.put_image(path, self.decode_image(path))
+
+    def put_image(self, path, image):
+        """
+        Umieszcza zdekodowany obraz w pamięci podręcznej (np. z wątku preloadera).
+        Musi być wywołane w głównym wątku, bo konwertuje obraz do formatu ekranu.
+
+        Args:
+            path: Ścieżka do pliku obrazu
+            image: Zdekodowana powierzchnia pygame
+
+        Returns:
+            Powierzchnia zapisana w pamięci podręcznej
+        """
+        key = self._get_key(path)
+
+        # convert_alpha() wymaga zainicjalizowanego ekranu
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+            self.converted.add(key)
+
+        self.images[key] = image
+        return image
+
+    def get_sound(self, path):
+        """
+        Zwraca dźwięk z pamięci podręcznej, ładując go z dysku przy pierwszym użyciu.
+
+        Args:
+            path: Ścieżka do pliku dźwięku
+
+        Returns:
+            Współdzielony obiekt pygame.mixer.Sound
+        """
+        key = self._get_key(path)
+        sound = self.sounds.get(key)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        return self.put_sound(path, self.decode_sound(path))
+
+    def put_sound(self, path, sound):
+        """
+        Umieszcza zdekodowany dźwięk w pamięci podręcznej.
+
+        Args:
+            path: Ścieżka do pliku dźwięku
+            sound: Obiekt pygame.mixer.Sound
+
+        Returns:
+            Dźwięk zapisany w pamięci podręcznej
+        """
+        key = self._get_key(path)
+        self.sounds[key] = sound
+        self.sound_bytes[key] = len(sound.get_raw())
+        return sound
+
+    def get_font(self, name, size):
+        """
+        Zwraca czcionkę z pamięci podręcznej, tworząc ją przy pierwszym użyciu.
+
+        Args:
+            name: Ścieżka do pliku czcionki lub None dla domyślnej czcionki pygame
+            size: Rozmiar czcionki
+
+        Returns:
+            Współdzielony obiekt pygame.font.Font
+        """
+        font = self.fonts.get((name, size))
+        if font is not None:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        return self.put_font(name, size, pygame.font.Font(name, size))
+
+    def put_font(self, name, size, font):
+        """
+        Umieszcza utworzoną czcionkę w pamięci podręcznej.
+
+        Args:
+            name: Ścieżka do pliku czcionki lub None dla domyślnej czcionki pygame
+            size: Rozmiar czcionki
+            font: Obiekt pygame.font.Font
+
+        Returns:
+            Czcionka zapisana w pamięci podręcznej
+        """
+        self.fonts[(name, size)] = font
+        return font
+
+    def add_atlas(self, atlas):
+        """
+        Rejestruje atlas tekstur - jego regiony zastępują osobno ładowane obrazy.
+        Nazwy regionów muszą być ścieżkami plików (jak w TextureAtlas.build_from_directory).
+
+        Args:
+            atlas: Zbudowany TextureAtlas
+        """
+        self.atlases.append(atlas)
+        for name, region in atlas.regions.items():
+            key = self._get_key(name)
+            self.images[key] = region
+            self.converted.add(key)
+        # Warianty zbudowane z osobnych obrazów są już nieaktualne
+        tint_cache.clear()
+
+    def convert_loaded(self):
+        """
+        Konwertuje obrazy załadowane przed inicjalizacją ekranu do formatu ekranu.
+        Wywołaj po pygame.display.set_mode(), jeśli obrazy były ładowane wcześniej.
+        """
+        if pygame.display.get_surface() is None:
+            return
+
+        for key, image in self.images.items():
+            if key not in self.converted:
+                self.images[key] = image.convert_alpha()
+                self.converted.add(key)
+                # Warianty zbudowane ze starej powierzchni są już nieaktualne
+                tint_cache.clear()
+
+    def get_resident_bytes(self):
+        """
+        Zwraca szacowaną ilość pamięci zajmowanej przez obrazy w cache.
+
+        Returns:
+            Liczba bajtów
+        """
+        # Regiony atlasu współdzielą pamięć atlasu, więc liczymy tylko sam atlas
+        total = sum(atlas.get_resident_bytes() for atlas in self.atlases)
+        for image in self.images.values():
+            if image.get_parent() is None:
+                total += image.get_pitch() * image.get_height()
+        total += sum(self.sound_bytes.values())
+        return total
+
+    def get_stats(self):
+        """
+        Zwraca statystyki pamięci podręcznej.
+
+        Returns:
+            Słownik z kluczami: hits, misses, entries, resident_bytes
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.images) + len(self.sounds) + len(self.fonts),
+            'resident_bytes': self.get_resident_bytes(),
+        }
+
+    def clear(self):
+        """Czyści pamięć podręczną i statystyki."""
+        self.images.clear()
+        self.converted.clear()
+        self.atlases.clear()
+        self.sounds.clear()
+        self.sound_bytes.clear()
+        self.fonts.clear()
+        tint_cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class TintCache:
+    """
+    Pamięć podręczna pokolorowanych wariantów obrazów.
+    Każda kombinacja (obraz źródłowy, kolor, tryb mieszania) jest budowana tylko raz.
+    Kolory można zarejestrować z wyprzedzeniem, aby w trakcie rozgrywki nie kolorować niczego.
+    """
+
+    def __init__(self):
+        """Inicjalizuje TintCache."""
+        # Słownik: (powierzchnia źródłowa, kolor, tryb mieszania) -> pygame.Surface
+        self.tinted = {}
+        # Lista zarejestrowanych wariantów: (ścieżka obrazu, kolor, tryb mieszania)
+        self.registered = []
+
+        # Statystyki
+        self.hits = 0
+        self.misses = 0
+
+    def _build_tinted(self, image, color, blend_flags):
+        """
+        Tworzy pokolorowaną kopię obrazu.
+        Białe piksele będą pokolorowane na podany kolor.
+
+        Args:
+            image: Obraz źródłowy
+            color: Kolor RGB (tuple)
+            blend_flags: Tryb mieszania pygame (np. pygame.BLEND_MULT)
+
+        Returns:
+            Pokolorowany obraz
+        """
+        # Utwórz kopię obrazu
+        tinted = image.copy()
+
+        # Utwórz powierzchnię z kolorem
+        color_surface = pygame.Surface(tinted.get_size())
+        color_surface.fill(color)
+
+        # Nałóż kolor na obraz (używając alpha channel)
+        tinted.blit(color_surface, (0, 0), special_flags=blend_flags)
+
+        return tinted
+
+    def get_tinted(self, image, color, blend_flags=pygame.BLEND_MULT):
+        """
+        Zwraca pokolorowany wariant obrazu, budując go przy pierwszym użyciu.
+
+        Args:
+            image: Obraz źródłowy (najlepiej z AssetCache)
+            color: Kolor RGB (tuple)
+            blend_flags: Tryb mieszania pygame (domyślnie BLEND_MULT)
+
+        Returns:
+            Współdzielona pokolorowana powierzchnia (tylko do odczytu)
+        """
+        key = (image, tuple(color), blend_flags)
+        tinted = self.tinted.get(key)
+        if tinted is not None:
+            self.hits += 1
+            return tinted
+
+        self.misses += 1
+        tinted = self._build_tinted(image, color, blend_flags)
+        self.tinted[key] = tinted
+        return tinted
+
+    def register(self, image_path, color, blend_flags=pygame.BLEND_MULT):
+        """
+        Rejestruje wariant koloru do zbudowania przed rozgrywką.
+
+        Args:
+            image_path: Ścieżka do obrazu źródłowego
+            color: Kolor RGB (tuple)
+            blend_flags: Tryb mieszania pygame (domyślnie BLEND_MULT)
+        """
+        entry = (image_path, tuple(color), blend_flags)
+        if entry not in self.registered:
+            self.registered.append(entry)
+
+    def prebuild(self, cache=None):
+        """
+        Buduje wszystkie zarejestrowane warianty.
+        Wywołaj po inicjalizacji ekranu, aby warianty korzystały z przekonwertowanych obrazów.
+
+        Args:
+            cache: AssetCache, z którego pobierane są obrazy (domyślnie globalny)
+        """
+        cache = cache or asset_cache
+        for image_path, color, blend_flags in self.registered:
+            self.get_tinted(cache.get_image(image_path), color, blend_flags)
+
+    def get_stats(self):
+        """
+        Zwraca statystyki pamięci podręcznej wariantów.
+
+        Returns:
+            Słownik z kluczami: hits, misses, entries
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.tinted),
+        }
+
+    def clear(self):
+        """Czyści zbudowane warianty (zarejestrowane kolory pozostają)."""
+        self.tinted.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Globalne instancje współdzielone przez wszystkie moduły
+asset_cache = AssetCache()
+tint_cache = TintCache()
+
+
+def load_image(path):
+    """
+    Ładuje obraz przez globalną pamięć podręczną.
+
+    Args:
+        path: Ścieżka do pliku obrazu
+
+    Returns:
+        Współdzielona powierzchnia pygame (tylko do odczytu)
+    """
+    return asset_cache.get_image(path)
+
+
+def load_sound(path):
+    """
+    Ładuje dźwięk przez globalną pamięć podręczną.
+
+    Args:
+        path: Ścieżka do pliku dźwięku
+
+    Returns:
+        Współdzielony obiekt pygame.mixer.Sound
+    """
+    return asset_cache.get_sound(path)
+
+
+def get_font(name, size):
+    """
+    Zwraca czcionkę z globalnej pamięci podręcznej.
+
+    Args:
+        name: Ścieżka do pliku czcionki lub None dla domyślnej czcionki pygame
+        size: Rozmiar czcionki
+
+    Returns:
+        Współdzielony obiekt pygame.font.Font
+    """
+    return asset_cache.get_font(name, size)
+
+
+def register_tint(image_path, color, blend_flags=pygame.BLEND_MULT):
+    """
+    Rejestruje wariant koloru w globalnym TintCache.
+
+    Args:
+        image_path: Ścieżka do obrazu źródłowego
+        color: Kolor RGB (tuple)
+        blend_flags: Tryb mieszania pygame (domyślnie BLEND_MULT)
+    """
+    tint_cache.register(image_path, color, blend_flags)
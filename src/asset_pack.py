@@ -0,0 +1,197 @@
+"""
+Asset Pack - pojedynczy plik z zasobami gry.
+Krok budowania łączy pliki z assets/ w jeden indeksowany plik, a w trakcie gry
+plik jest mapowany do pamięci (mmap) i zasoby są dekodowane z bufora w pamięci.
+
+Format pliku:
+    nagłówek: magic b'VBPK', wersja (uint32), rozmiar indeksu (uint32) - little endian
+    indeks:   JSON {ścieżka: [przesunięcie, rozmiar]} (przesunięcia względem początku danych)
+    dane:     zawartość plików jeden po drugim
+
+Użycie:
+    python -m src.asset_pack [katalog_zasobów] [--output assets.pack]
+"""
+import io
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+import pygame
+
+PACK_MAGIC = b'VBPK'
+PACK_VERSION = 1
+HEADER_FORMAT = '<4sII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Domyślna ścieżka pliku pack
+DEFAULT_PACK_PATH = 'assets.pack'
+
+
+def normalize_pack_path(path):
+    """
+    Zamienia ścieżkę pliku na klucz indeksu (separator '/').
+
+    Args:
+        path: Ścieżka do pliku
+
+    Returns:
+        Znormalizowany klucz
+    """
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def build_pack(asset_dir='assets', output_path=DEFAULT_PACK_PATH):
+    """
+    Buduje plik pack ze wszystkich plików w katalogu zasobów.
+
+    Args:
+        asset_dir: Katalog z zasobami (domyślnie assets)
+        output_path: Ścieżka pliku wynikowego (domyślnie assets.pack)
+
+    Returns:
+        Liczba spakowanych plików
+    """
+    paths = []
+    for root, _, filenames in os.walk(asset_dir):
+        for filename in sorted(filenames):
+            paths.append(os.path.join(root, filename))
+    paths.sort()
+
+    index = {}
+    offset = 0
+    for path in paths:
+        size = os.path.getsize(path)
+        index[normalize_pack_path(path)] = [offset, size]
+        offset += size
+
+    index_data = json.dumps(index).encode('utf-8')
+    with open(output_path, 'wb') as pack_file:
+        pack_file.write(struct.pack(HEADER_FORMAT, PACK_MAGIC, PACK_VERSION, len(index_data)))
+        pack_file.write(index_data)
+        for path in paths:
+            with open(path, 'rb') as asset_file:
+                pack_file.write(asset_file.read())
+
+    return len(paths)
+
+
+class AssetPack:
+    """
+    Plik pack zmapowany do pamięci.
+    Zasoby są czytane bez otwierania osobnych plików - jeden open() i jeden mmap na cały pack.
+    """
+
+    def __init__(self, path=DEFAULT_PACK_PATH):
+        """
+        Otwiera plik pack i wczytuje indeks.
+
+        Args:
+            path: Ścieżka do pliku pack
+        """
+        self.path = path
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_size = struct.unpack_from(HEADER_FORMAT, self.data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"Nieprawidłowy plik pack: {path}")
+
+        index_data = self.data[HEADER_SIZE:HEADER_SIZE + index_size]
+        self.index = json.loads(index_data.decode('utf-8'))
+        self.data_start = HEADER_SIZE + index_size
+
+    def contains(self, path):
+        """Sprawdza, czy plik jest w packu."""
+        return normalize_pack_path(path) in self.index
+
+    def list_directory(self, directory):
+        """
+        Zwraca nazwy plików bezpośrednio w danym katalogu packu.
+
+        Args:
+            directory: Katalog (np. os.path.join('assets', 'gfx'))
+
+        Returns:
+            Posortowana lista nazw plików
+        """
+        prefix = normalize_pack_path(directory) + '/'
+        return sorted(
+            key[len(prefix):] for key in self.index
+            if key.startswith(prefix) and '/' not in key[len(prefix):]
+        )
+
+    def get_buffer(self, path):
+        """
+        Zwraca zawartość pliku jako widok na zmapowaną pamięć (bez kopiowania).
+
+        Args:
+            path: Ścieżka do pliku
+
+        Returns:
+            memoryview z zawartością pliku
+        """
+        offset, size = self.index[normalize_pack_path(path)]
+        start = self.data_start + offset
+        return memoryview(self.data)[start:start + size]
+
+    def open(self, path):
+        """
+        Zwraca obiekt plikopodobny z zawartością pliku.
+
+        Args:
+            path: Ścieżka do pliku
+
+        Returns:
+            io.BytesIO z zawartością pliku
+        """
+        return io.BytesIO(self.get_buffer(path))
+
+    def load_image(self, path):
+        """
+        Dekoduje obraz z packu.
+
+        Args:
+            path: Ścieżka do pliku obrazu
+
+        Returns:
+            Zdekodowana powierzchnia pygame
+        """
+        return pygame.image.load(self.open(path), os.path.basename(path))
+
+    def load_sound(self, path):
+        """
+        Dekoduje dźwięk z packu.
+        Plik WAV jest przekazywany jako obiekt plikopodobny - argument buffer=
+        pygame.mixer.Sound oczekuje surowych próbek PCM, a nie pliku z nagłówkiem.
+
+        Args:
+            path: Ścieżka do pliku dźwięku
+
+        Returns:
+            Obiekt pygame.mixer.Sound
+        """
+        return pygame.mixer.Sound(file=self.open(path))
+
+    def close(self):
+        """Zamyka mapowanie i plik."""
+        self.data.close()
+        self.file.close()
+
+
+def main():
+    """Buduje plik pack z wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Buduje plik pack z zasobami gry")
+    parser.add_argument('asset_dir', nargs='?', default='assets', help="Katalog z zasobami")
+    parser.add_argument('--output', default=DEFAULT_PACK_PATH, help="Ścieżka pliku wynikowego")
+    args = parser.parse_args()
+
+    count = build_pack(args.asset_dir, args.output)
+    print(f"Spakowano {count} plików do {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Asset Preloader - wczytywanie zasobów w tle przed startem gry.
+Dekoduje obrazy, dźwięki i czcionki w puli wątków, a wyniki umieszcza w AssetCache.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from src.asset_cache import asset_cache
+
+# Rodzaje zasobów
+ASSET_IMAGE = 'image'
+ASSET_SOUND = 'sound'
+ASSET_FONT = 'font'
+
+
+def _decode_asset(kind, path, size):
+    """
+    Dekoduje pojedynczy zasób (wywoływane w wątku roboczym).
+
+    Args:
+        kind: Rodzaj zasobu (ASSET_IMAGE, ASSET_SOUND lub ASSET_FONT)
+        path: Ścieżka do pliku (None dla domyślnej czcionki)
+        size: Rozmiar czcionki (tylko dla ASSET_FONT)
+
+    Returns:
+        Krotka (zdekodowany zasób, czas dekodowania w sekundach)
+    """
+    start = time.perf_counter()
+    if kind == ASSET_IMAGE:
+        asset = asset_cache.decode_image(path)
+    elif kind == ASSET_SOUND:
+        asset = asset_cache.decode_sound(path)
+    else:
+        asset = pygame.font.Font(path, size)
+    return asset, time.perf_counter() - start
+
+
+class AssetPreloader:
+    """
+    Wczytuje zasoby w puli wątków, podczas gdy główny wątek rysuje ekran ładowania.
+    Dekodowanie odbywa się w wątkach, a konwersja do formatu ekranu i zapis
+    do AssetCache - w głównym wątku (w poll()).
+    """
+
+    def __init__(self, max_workers=4, progress_callback=None):
+        """
+        Inicjalizuje AssetPreloader.
+
+        Args:
+            max_workers: Liczba wątków roboczych (domyślnie 4)
+            progress_callback: Funkcja wywoływana po każdym zasobie z argumentami
+                (załadowane, wszystkie, nazwa zasobu, czas dekodowania w sekundach)
+        """
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+
+        # Lista zadań: (rodzaj, ścieżka, rozmiar)
+        self.tasks = []
+        # Słownik: future -> zadanie
+        self.pending = {}
+        self.executor = None
+
+        # Statystyki
+        self.loaded_count = 0
+        self.failed = []
+        self.timings = {}  # Słownik: nazwa zasobu -> czas dekodowania w sekundach
+        self.start_time = None
+        self.total_time = 0.0
+
+    def add_image(self, path):
+        """Dodaje obraz do wczytania."""
+        self.tasks.append((ASSET_IMAGE, path, None))
+
+    def add_sound(self, path):
+        """Dodaje dźwięk do wczytania."""
+        self.tasks.append((ASSET_SOUND, path, None))
+
+    def add_font(self, name, size):
+        """Dodaje czcionkę do utworzenia (name=None dla domyślnej czcionki pygame)."""
+        self.tasks.append((ASSET_FONT, name, size))
+
+    def add_directory(self, directory):
+        """
+        Dodaje wszystkie obrazy PNG i dźwięki WAV/OGG z katalogu (z packu lub z dysku).
+
+        Args:
+            directory: Katalog z zasobami
+        """
+        for filename in asset_cache.list_directory(directory):
+            path = os.path.join(directory, filename)
+            extension = os.path.splitext(filename)[1].lower()
+            if extension == '.png':
+                self.add_image(path)
+            elif extension in ('.wav', '.ogg'):
+                self.add_sound(path)
+
+    def _get_task_name(self, task):
+        """Zwraca czytelną nazwę zadania."""
+        kind, path, size = task
+        if kind == ASSET_FONT:
+            return f"font:{path or 'default'}:{size}"
+        return path
+
+    def start(self):
+        """Uruchamia wczytywanie wszystkich dodanych zasobów w tle."""
+        self.start_time = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        for task in self.tasks:
+            kind = task[0]
+            # Dźwięki wymagają zainicjalizowanego miksera
+            if kind == ASSET_SOUND and not pygame.mixer.get_init():
+                self.failed.append(self._get_task_name(task))
+                self.loaded_count += 1
+                continue
+            future = self.executor.submit(_decode_asset, *task)
+            self.pending[future] = task
+
+        if not self.pending:
+            self._finish()
+
+    def poll(self):
+        """
+        Przetwarza zasoby, które zostały już zdekodowane.
+        Wywołuj w każdej klatce ekranu ładowania (w głównym wątku).
+
+        Returns:
+            True jeśli wszystkie zasoby są gotowe, False w przeciwnym razie
+        """
+        for future in [future for future in self.pending if future.done()]:
+            task = self.pending.pop(future)
+            kind, path, size = task
+            name = self._get_task_name(task)
+            try:
+                asset, seconds = future.result()
+            except Exception as e:
+                print(f"Nie można załadować zasobu {name}: {e}")
+                self.failed.append(name)
+                seconds = 0.0
+            else:
+                if kind == ASSET_IMAGE:
+                    asset_cache.put_image(path, asset)
+                elif kind == ASSET_SOUND:
+                    asset_cache.put_sound(path, asset)
+                else:
+                    asset_cache.put_font(path, size, asset)
+                self.timings[name] = seconds
+
+            self.loaded_count += 1
+            if self.progress_callback is not None:
+                self.progress_callback(self.loaded_count, len(self.tasks), name, seconds)
+
+        if not self.pending and self.executor is not None:
+            self._finish()
+
+        return self.is_done()
+
+    def _finish(self):
+        """Zamyka pulę wątków i zapisuje całkowity czas wczytywania."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        self.total_time = time.perf_counter() - self.start_time
+
+    def is_done(self):
+        """Sprawdza, czy wszystkie zasoby zostały wczytane."""
+        return self.start_time is not None and not self.pending
+
+    def get_progress(self):
+        """
+        Zwraca postęp wczytywania (0.0 - 1.0).
+
+        Returns:
+            Ułamek wczytanych zasobów
+        """
+        if not self.tasks:
+            return 1.0
+        return self.loaded_count / len(self.tasks)
+
+    def get_timings(self):
+        """
+        Zwraca czasy dekodowania zasobów, od najwolniejszego.
+
+        Returns:
+            Lista krotek (nazwa zasobu, czas w sekundach)
+        """
+        return sorted(self.timings.items(), key=lambda item: item[1], reverse=True)
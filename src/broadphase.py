@@ -0,0 +1,370 @@
+"""
+Broadphase - wymienne algorytmy wstępnego wykrywania kolizji.
+Każdy backend ma to samo API co SpatialGrid (add_object, update_object, remove_object,
+get_nearby_objects, query_rect), więc EnemyManager i main.py mogą używać dowolnego z nich.
+"""
+import bisect
+import heapq
+from abc import ABC, abstractmethod
+import pygame
+from src.spatial_grid import SpatialGrid
+from src.utils import get_swept_bounds, get_swept_hits
+from src.numpy_spatial_hash import NumpySpatialHash
+
+
+class Broadphase(ABC):
+    """
+    Bazowa klasa dla backendów, które przebudowują strukturę w całości.
+    Zmiany obiektów tylko oznaczają strukturę jako nieaktualną - przebudowa
+    następuje przy pierwszym zapytaniu w danej klatce.
+    """
+
+    def __init__(self, screen_width, screen_height):
+        """
+        Inicjalizuje Broadphase.
+
+        Args:
+            screen_width: Szerokość ekranu
+            screen_height: Wysokość ekranu
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.clear()
+
+    def clear(self):
+        """Usuwa wszystkie obiekty."""
+        # Słownik: id(obj) -> obj (zachowuje kolejność dodawania)
+        self.objects = {}
+        self.dirty = True
+
+    def add_object(self, obj):
+        """Dodaje obiekt."""
+        self.objects[id(obj)] = obj
+        self.dirty = True
+
+    def update_object(self, obj):
+        """Oznacza strukturę do przebudowy po ruchu obiektu."""
+        if id(obj) not in self.objects:
+            self.objects[id(obj)] = obj
+        self.dirty = True
+
+    def remove_object(self, obj):
+        """Usuwa obiekt."""
+        if self.objects.pop(id(obj), None) is not None:
+            self.dirty = True
+
+    def rebuild(self, objects):
+        """
+        Zastępuje wszystkie obiekty nową listą.
+
+        Args:
+            objects: Lista wszystkich obiektów
+        """
+        self.clear()
+        for obj in objects:
+            self.objects[id(obj)] = obj
+
+    def get_object_count(self):
+        """Zwraca liczbę obiektów."""
+        return len(self.objects)
+
+    def get_stats(self):
+        """Zwraca statystyki do diagnostyki (dla zgodności z SpatialGrid)."""
+        return {'objects': len(self.objects)}
+
+    def maybe_retune(self):
+        """Backendy dokładne nie mają rozmiaru komórki do strojenia - dla zgodności z SpatialGrid."""
+        return False
+
+    def _ensure_built(self):
+        """Przebudowuje strukturę, jeśli obiekty zmieniły się od ostatniej przebudowy."""
+        if self.dirty:
+            self._build()
+            self.dirty = False
+
+    @abstractmethod
+    def _build(self):
+        """Przebudowuje strukturę z aktualnych pozycji obiektów."""
+        pass
+
+    @abstractmethod
+    def _query(self, rect):
+        """
+        Zwraca obiekty, których prostokąty nachodzą na rect.
+
+        Args:
+            rect: pygame.Rect obszaru zapytania
+
+        Returns:
+            Lista obiektów
+        """
+        pass
+
+    def query_rect(self, rect, margin=0):
+        """
+        Zwraca obiekty, których prostokąty nachodzą na rect.
+
+        Args:
+            rect: pygame.Rect obszaru zapytania
+            margin: Dodatkowy margines wokół prostokąta w pikselach (domyślnie 0)
+
+        Returns:
+            Lista obiektów
+        """
+        self._ensure_built()
+        if margin:
+            rect = rect.inflate(2 * margin, 2 * margin)
+        return self._query(rect)
+
+    def query_swept(self, rect, dx, dy, predicate=None):
+        """
+        Zwraca obiekty, z którymi zetknie się prostokąt przesuwany o (dx, dy), w kolejności kontaktu
+        (zgodne z SpatialGrid.query_swept).
+
+        Args:
+            rect: pygame.Rect w pozycji początkowej
+            dx: Przesunięcie na osi X
+            dy: Przesunięcie na osi Y
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista obiektów posortowana rosnąco po chwili kontaktu
+        """
+        candidates = self.query_rect(get_swept_bounds(rect, dx, dy))
+        return get_swept_hits(candidates, rect, dx, dy, predicate)
+
+    def get_nearby_objects(self, obj, radius=1):
+        """
+        Zwraca obiekty nachodzące na prostokąt obiektu.
+        Backendy dokładne nie potrzebują promienia w komórkach - parametr jest dla zgodności z SpatialGrid.
+
+        Args:
+            obj: Obiekt referencyjny
+            radius: Ignorowany
+
+        Returns:
+            Lista obiektów
+        """
+        return self.query_rect(obj.rect)
+
+    def query_nearby(self, obj, out, radius=1, predicate=None, first_hit=False):
+        """
+        Wypełnia listę podaną przez wywołującego obiektami nachodzącymi na obiekt
+        (dla zgodności z SpatialGrid.query_nearby).
+
+        Args:
+            obj: Obiekt referencyjny
+            out: Lista do wypełnienia (jest najpierw czyszczona)
+            radius: Ignorowany
+            predicate: Funkcja predicate(obj, kandydat) -> bool lub None
+            first_hit: Czy zakończyć po pierwszym pasującym obiekcie
+
+        Returns:
+            Liczba obiektów w out
+        """
+        out.clear()
+        for other in self.query_rect(obj.rect):
+            if predicate is None or predicate(obj, other):
+                out.append(other)
+                if first_hit:
+                    break
+        return len(out)
+
+    def _get_distance_sq(self, obj, x, y):
+        """Zwraca kwadrat odległości środka obiektu od punktu."""
+        dx = obj.rect.centerx - x
+        dy = obj.rect.centery - y
+        return dx * dx + dy * dy
+
+    def get_k_nearest(self, x, y, k, max_distance=None, predicate=None):
+        """
+        Zwraca k obiektów najbliższych punktowi (według środków), od najbliższego
+        (zgodne z SpatialGrid.get_k_nearest). Bez komórek do przeszukiwania pierścieniami
+        backendy dokładne przeglądają wszystkie obiekty.
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            k: Liczba szukanych obiektów
+            max_distance: Maksymalna odległość w pikselach (None = bez limitu)
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista co najwyżej k obiektów posortowana rosnąco po odległości
+        """
+        candidates = self.objects.values()
+        if max_distance is not None:
+            radius_sq = max_distance * max_distance
+            candidates = [obj for obj in candidates if self._get_distance_sq(obj, x, y) <= radius_sq]
+        if predicate is not None:
+            candidates = [obj for obj in candidates if predicate(obj)]
+        return heapq.nsmallest(k, candidates, key=lambda obj: self._get_distance_sq(obj, x, y))
+
+    def get_nearest(self, x, y, max_distance=None, predicate=None):
+        """Zwraca obiekt najbliższy punktowi lub None (zgodne z SpatialGrid.get_nearest)."""
+        nearest = self.get_k_nearest(x, y, 1, max_distance=max_distance, predicate=predicate)
+        return nearest[0] if nearest else None
+
+    def get_within_radius(self, x, y, radius, predicate=None):
+        """
+        Zwraca obiekty, których środki leżą w promieniu od punktu, od najbliższego
+        (zgodne z SpatialGrid.get_within_radius).
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            radius: Promień w pikselach
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista obiektów posortowana rosnąco po odległości
+        """
+        # Środek w promieniu oznacza, że prostokąt nachodzi na kwadrat opisany na okręgu
+        area = (x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)
+        radius_sq = radius * radius
+        found = [
+            obj for obj in self.query_rect(pygame.Rect(area))
+            if self._get_distance_sq(obj, x, y) <= radius_sq and (predicate is None or predicate(obj))
+        ]
+        found.sort(key=lambda obj: self._get_distance_sq(obj, x, y))
+        return found
+
+
+class BruteForceBroadphase(Broadphase):
+    """
+    Punkt odniesienia: sprawdza każdy obiekt przez Rect.collidelistall.
+    """
+
+    def _build(self):
+        """Zapamiętuje listę obiektów i ich prostokątów."""
+        self.object_list = list(self.objects.values())
+        self.rects = [obj.rect for obj in self.object_list]
+
+    def _query(self, rect):
+        """Zwraca obiekty nachodzące na rect (pełne przeszukanie w C)."""
+        object_list = self.object_list
+        return [object_list[index] for index in rect.collidelistall(self.rects)]
+
+
+class SweepAndPruneBroadphase(Broadphase):
+    """
+    Sweep-and-prune na osi X: obiekty posortowane po lewej krawędzi,
+    zapytanie przegląda tylko przedział, który może nachodzić na rect w osi X.
+    """
+
+    def _build(self):
+        """Sortuje obiekty po lewej krawędzi."""
+        self.object_list = sorted(self.objects.values(), key=lambda obj: obj.rect.left)
+        self.lefts = [obj.rect.left for obj in self.object_list]
+        self.max_width = max((obj.rect.width for obj in self.object_list), default=0)
+
+    def _query(self, rect):
+        """Zwraca obiekty nachodzące na rect, przeglądając tylko pasmo X."""
+        # Obiekt może nachodzić na rect tylko jeśli left > rect.left - max_width i left < rect.right
+        start = bisect.bisect_right(self.lefts, rect.left - self.max_width)
+        end = bisect.bisect_left(self.lefts, rect.right)
+        return [obj for obj in self.object_list[start:end] if rect.colliderect(obj.rect)]
+
+
+class LooseQuadtreeBroadphase(Broadphase):
+    """
+    Luźne drzewo czwórkowe (loose quadtree) zapisane jako zestaw siatek o malejącym rozmiarze.
+    Obiekt trafia na najgłębszy poziom, którego węzeł jest nie mniejszy niż obiekt,
+    do węzła zawierającego jego środek. Granice węzła są rozszerzone o połowę jego rozmiaru,
+    więc obiekt zawsze mieści się w luźnych granicach swojego węzła.
+    """
+
+    def __init__(self, screen_width, screen_height, max_depth=6):
+        """
+        Inicjalizuje LooseQuadtreeBroadphase.
+
+        Args:
+            screen_width: Szerokość ekranu
+            screen_height: Wysokość ekranu
+            max_depth: Maksymalna głębokość drzewa (domyślnie 6)
+        """
+        self.max_depth = max_depth
+        self.root_size = max(screen_width, screen_height)
+        super().__init__(screen_width, screen_height)
+
+    def _get_depth(self, rect):
+        """Zwraca najgłębszy poziom, którego węzły są nie mniejsze niż obiekt."""
+        size = max(rect.width, rect.height, 1)
+        depth = 0
+        node_size = self.root_size
+        while depth < self.max_depth and node_size / 2 >= size:
+            node_size /= 2
+            depth += 1
+        return depth
+
+    def _build(self):
+        """Rozmieszcza obiekty w węzłach drzewa."""
+        # Lista poziomów: słownik (node_x, node_y) -> lista obiektów
+        self.levels = [{} for _ in range(self.max_depth + 1)]
+        for obj in self.objects.values():
+            rect = obj.rect
+            depth = self._get_depth(rect)
+            node_size = self.root_size / (2 ** depth)
+            key = (int(rect.centerx // node_size), int(rect.centery // node_size))
+            self.levels[depth].setdefault(key, []).append(obj)
+
+    def _query(self, rect):
+        """Zwraca obiekty nachodzące na rect, odwiedzając węzły z nachodzącymi luźnymi granicami."""
+        result = []
+        for depth, nodes in enumerate(self.levels):
+            if not nodes:
+                continue
+            node_size = self.root_size / (2 ** depth)
+            # Luźne granice = węzeł rozszerzony o połowę rozmiaru z każdej strony
+            loose = node_size / 2
+            min_x = int((rect.left - loose) // node_size)
+            max_x = int((rect.right + loose) // node_size)
+            min_y = int((rect.top - loose) // node_size)
+            max_y = int((rect.bottom + loose) // node_size)
+            for node_x in range(min_x, max_x + 1):
+                for node_y in range(min_y, max_y + 1):
+                    node = nodes.get((node_x, node_y))
+                    if node:
+                        result.extend(obj for obj in node if rect.colliderect(obj.rect))
+        return result
+
+
+# Siatki mają własną, przyrostową implementację API - rejestrujemy je jako wirtualne podklasy,
+# żeby isinstance(backend, Broadphase) było prawdziwe dla każdego backendu
+Broadphase.register(SpatialGrid)
+Broadphase.register(NumpySpatialHash)
+
+# Rejestr backendów: nazwa -> klasa
+BROADPHASE_BACKENDS = {
+    'grid': SpatialGrid,
+    'numpy_hash': NumpySpatialHash,
+    'sweep_and_prune': SweepAndPruneBroadphase,
+    'quadtree': LooseQuadtreeBroadphase,
+    'brute_force': BruteForceBroadphase,
+}
+
+
+# Backendy z rozmiarem komórki - sąsiedztwo 3x3 obejmuje tylko obiekty nie większe niż komórka
+CELL_SIZE_BACKENDS = ('grid', 'numpy_hash')
+
+
+def create_broadphase(name, screen_width, screen_height, entity_size=None, **kwargs):
+    """
+    Tworzy backend broadphase o podanej nazwie.
+
+    Args:
+        name: Nazwa backendu (klucz BROADPHASE_BACKENDS)
+        screen_width: Szerokość ekranu
+        screen_height: Wysokość ekranu
+        entity_size: Najdłuższy bok największego obiektu w pikselach (domyślnie None);
+            dla siatek staje się rozmiarem komórki, jeśli cell_size nie podano
+        **kwargs: Dodatkowe argumenty backendu (np. cell_size dla siatki)
+
+    Returns:
+        Obiekt backendu
+    """
+    if name not in BROADPHASE_BACKENDS:
+        raise ValueError(f"Nieznany backend broadphase: {name}")
+    if entity_size and name in CELL_SIZE_BACKENDS:
+        kwargs.setdefault('cell_size', int(entity_size))
+    return BROADPHASE_BACKENDS[name](screen_width, screen_height, **kwargs)
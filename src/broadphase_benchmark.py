@@ -0,0 +1,269 @@
+"""
+Broadphase Benchmark - porównanie backendów broadphase na nagranych rozkładach bytów.
+
+Scenariusze:
+    clustered  - rój wrogów skupiony w kilku gromadach zbiegających się do gracza
+    uniform    - wrogowie rozłożeni równomiernie po całym ekranie
+    orbiting   - wrogowie wokół gracza i pociski tarczy krążące po orbicie
+
+Użycie:
+    python -m src.broadphase_benchmark [--scenario clustered] [--enemies 1000] [--projectiles 200]
+    python -m src.broadphase_benchmark --record nagranie.json   # zapisz wygenerowane klatki
+    python -m src.broadphase_benchmark --replay nagranie.json   # odtwórz nagrane klatki
+
+Każdy backend musi dać tyle samo trafień co brute_force - inaczej benchmark kończy się kodem 1.
+"""
+import sys
+import math
+import json
+import time
+import random
+import argparse
+import numpy as np
+import pygame
+from src.broadphase import BROADPHASE_BACKENDS, create_broadphase
+
+# Rozmiar areny i bytów w benchmarku (jak w grze: typy wrogów z assets/data/enemies.json
+# mają boki 128-320 px, pociski to bullet.png 64 px)
+ARENA_WIDTH = 1920
+ARENA_HEIGHT = 1080
+ENEMY_SIZES = (256, 192, 128, 320)
+PROJECTILE_SIZE = 64
+
+# Backend odniesienia dla liczby trafień
+REFERENCE_BACKEND = 'brute_force'
+
+
+class _BenchEntity:
+    """Minimalny byt benchmarku - tylko rect, jak wymagają backendy."""
+
+    def __init__(self, x, y, size):
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (x, y)
+
+
+def _generate_clustered(rng, frames, enemies, projectiles):
+    """Generuje klatki scenariusza 'clustered' - gromady zbiegające się do gracza."""
+    center_x, center_y = ARENA_WIDTH / 2, ARENA_HEIGHT / 2
+    clusters = [(rng.uniform(0, ARENA_WIDTH), rng.uniform(0, ARENA_HEIGHT)) for _ in range(4)]
+    offsets = [(rng.gauss(0, 60), rng.gauss(0, 60), rng.randrange(len(clusters))) for _ in range(enemies)]
+    shots = [(rng.uniform(0, ARENA_WIDTH), rng.uniform(0, ARENA_HEIGHT)) for _ in range(projectiles)]
+
+    recorded = []
+    for frame in range(frames):
+        # Gromady zbliżają się do środka z każdą klatką
+        progress = frame / max(1, frames - 1) * 0.8
+        enemy_positions = []
+        for dx, dy, cluster in offsets:
+            cluster_x, cluster_y = clusters[cluster]
+            enemy_positions.append((
+                cluster_x + (center_x - cluster_x) * progress + dx,
+                cluster_y + (center_y - cluster_y) * progress + dy
+            ))
+        projectile_positions = [((x + frame * 8) % ARENA_WIDTH, y) for x, y in shots]
+        recorded.append((enemy_positions, projectile_positions))
+    return recorded
+
+
+def _generate_uniform(rng, frames, enemies, projectiles):
+    """Generuje klatki scenariusza 'uniform' - równomierny rozkład z losowym dryfem."""
+    enemy_state = [
+        [rng.uniform(0, ARENA_WIDTH), rng.uniform(0, ARENA_HEIGHT), rng.uniform(-2, 2), rng.uniform(-2, 2)]
+        for _ in range(enemies)
+    ]
+    shots = [(rng.uniform(0, ARENA_WIDTH), rng.uniform(0, ARENA_HEIGHT)) for _ in range(projectiles)]
+
+    recorded = []
+    for frame in range(frames):
+        for state in enemy_state:
+            state[0] = (state[0] + state[2]) % ARENA_WIDTH
+            state[1] = (state[1] + state[3]) % ARENA_HEIGHT
+        enemy_positions = [(state[0], state[1]) for state in enemy_state]
+        projectile_positions = [((x + frame * 8) % ARENA_WIDTH, y) for x, y in shots]
+        recorded.append((enemy_positions, projectile_positions))
+    return recorded
+
+
+def _generate_orbiting(rng, frames, enemies, projectiles):
+    """Generuje klatki scenariusza 'orbiting' - wrogowie wokół gracza, pociski tarczy na orbicie."""
+    center_x, center_y = ARENA_WIDTH / 2, ARENA_HEIGHT / 2
+    enemy_polar = [(rng.uniform(0, 2 * math.pi), rng.uniform(60, 400)) for _ in range(enemies)]
+
+    recorded = []
+    for frame in range(frames):
+        enemy_positions = [
+            (center_x + math.cos(angle + frame * 0.01) * radius, center_y + math.sin(angle + frame * 0.01) * radius)
+            for angle, radius in enemy_polar
+        ]
+        projectile_positions = []
+        for index in range(projectiles):
+            angle = 2 * math.pi * index / max(1, projectiles) + frame * 0.05
+            orbit_radius = 80 + (index % 4) * 40
+            projectile_positions.append((center_x + math.cos(angle) * orbit_radius, center_y + math.sin(angle) * orbit_radius))
+        recorded.append((enemy_positions, projectile_positions))
+    return recorded
+
+
+SCENARIOS = {
+    'clustered': _generate_clustered,
+    'uniform': _generate_uniform,
+    'orbiting': _generate_orbiting,
+}
+
+
+def generate_recording(scenario, frames=120, enemies=1000, projectiles=200, seed=1):
+    """
+    Generuje nagranie klatek scenariusza.
+
+    Args:
+        scenario: Nazwa scenariusza (klucz SCENARIOS)
+        frames: Liczba klatek
+        enemies: Liczba wrogów
+        projectiles: Liczba pocisków
+        seed: Ziarno losowania (dla powtarzalności)
+
+    Returns:
+        Lista klatek: (pozycje wrogów, pozycje pocisków)
+    """
+    rng = random.Random(seed)
+    return SCENARIOS[scenario](rng, frames, enemies, projectiles)
+
+
+def _count_overlaps(a, b):
+    """
+    Zlicza pary prostokątów (x, y, szerokość, wysokość), które się nakładają (jak Rect.colliderect).
+
+    Args:
+        a: Tablica (N, 4) pierwszych prostokątów par
+        b: Tablica (N, 4) drugich prostokątów par
+
+    Returns:
+        Liczba nakładających się par
+    """
+    overlap = (
+        (a[:, 0] < b[:, 0] + b[:, 2]) & (b[:, 0] < a[:, 0] + a[:, 2])
+        & (a[:, 1] < b[:, 1] + b[:, 3]) & (b[:, 1] < a[:, 1] + a[:, 3])
+    )
+    return int(np.count_nonzero(overlap))
+
+
+def run_backend(name, recording):
+    """
+    Odtwarza nagranie na jednym backendzie i mierzy czas.
+
+    Args:
+        name: Nazwa backendu (klucz BROADPHASE_BACKENDS)
+        recording: Lista klatek z generate_recording()
+
+    Returns:
+        Słownik z wynikami: mean_ms, p95_ms, candidates, hits
+    """
+    # Rozmiar komórki siatek dobrany jak w grze - do największego wroga
+    broadphase = create_broadphase(name, ARENA_WIDTH, ARENA_HEIGHT, entity_size=max(ENEMY_SIZES))
+    first_enemies, first_projectiles = recording[0]
+    # Mieszanka rozmiarów wrogów - rozmiar wynika z indeksu, więc jest taki sam przy odtwarzaniu nagrania
+    enemies = [
+        _BenchEntity(x, y, ENEMY_SIZES[index % len(ENEMY_SIZES)])
+        for index, (x, y) in enumerate(first_enemies)
+    ]
+    projectiles = [_BenchEntity(x, y, PROJECTILE_SIZE) for x, y in first_projectiles]
+    for enemy in enemies:
+        broadphase.add_object(enemy)
+    # Backendy z zapytaniami wsadowymi są mierzone tak, jak mają być używane - wsadowo
+    batch = hasattr(broadphase, 'query_batch')
+
+    frame_times = []
+    candidates = 0
+    hits = 0
+    for enemy_positions, projectile_positions in recording:
+        for enemy, position in zip(enemies, enemy_positions):
+            enemy.rect.center = position
+        for projectile, position in zip(projectiles, projectile_positions):
+            projectile.rect.center = position
+
+        if batch:
+            # W grze tablice prostokątów trzymają EnemyStore i ProjectileStore - poza pomiarem
+            enemy_rects = np.array([enemy.rect[:] for enemy in enemies], dtype=np.float64).reshape(-1, 4)
+            projectile_rects = np.array([projectile.rect[:] for projectile in projectiles],
+                                        dtype=np.float64).reshape(-1, 4)
+
+        start = time.perf_counter()
+        if batch:
+            # Hash NumPy: przebudowa z tablic i kandydaci dla wszystkich pocisków jednym wywołaniem
+            broadphase.rebuild_from_rects(enemies, enemy_rects)
+            pair_queries, pair_objects = broadphase.query_batch(projectile_rects)
+            candidates += len(pair_objects)
+            hits += _count_overlaps(projectile_rects.take(pair_queries, axis=0),
+                                   broadphase.rects.take(pair_objects, axis=0))
+        else:
+            for enemy in enemies:
+                broadphase.update_object(enemy)
+            for projectile in projectiles:
+                nearby = broadphase.get_nearby_objects(projectile, radius=1)
+                candidates += len(nearby)
+                for enemy in nearby:
+                    if projectile.rect.colliderect(enemy.rect):
+                        hits += 1
+        frame_times.append((time.perf_counter() - start) * 1000)
+
+    frame_times.sort()
+    return {
+        'mean_ms': sum(frame_times) / len(frame_times),
+        'p95_ms': frame_times[int(len(frame_times) * 0.95) - 1] if len(frame_times) > 1 else frame_times[0],
+        'candidates': candidates / max(1, len(recording) * len(projectiles)),
+        'hits': hits,
+    }
+
+
+def main():
+    """Uruchamia benchmark z wiersza poleceń."""
+    parser = argparse.ArgumentParser(description="Porównanie backendów broadphase")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default=None,
+                        help="Scenariusz (domyślnie wszystkie)")
+    parser.add_argument('--backend', choices=sorted(BROADPHASE_BACKENDS), action='append',
+                        help="Backend do przetestowania (można podać wiele razy, domyślnie wszystkie)")
+    parser.add_argument('--frames', type=int, default=120, help="Liczba klatek")
+    parser.add_argument('--enemies', type=int, default=1000, help="Liczba wrogów")
+    parser.add_argument('--projectiles', type=int, default=200, help="Liczba pocisków")
+    parser.add_argument('--seed', type=int, default=1, help="Ziarno losowania")
+    parser.add_argument('--record', help="Zapisz wygenerowane nagranie do pliku JSON")
+    parser.add_argument('--replay', help="Odtwórz nagranie z pliku JSON zamiast generować")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay) as recording_file:
+            recordings = json.load(recording_file)
+    else:
+        scenarios = [args.scenario] if args.scenario else sorted(SCENARIOS)
+        recordings = {
+            scenario: generate_recording(scenario, args.frames, args.enemies, args.projectiles, args.seed)
+            for scenario in scenarios
+        }
+        if args.record:
+            with open(args.record, 'w') as recording_file:
+                json.dump(recordings, recording_file)
+
+    backends = args.backend or list(BROADPHASE_BACKENDS)
+    mismatches = []
+    for scenario, recording in recordings.items():
+        print(f"\n== {scenario}: {len(recording[0][0])} wrogów, {len(recording[0][1])} pocisków, {len(recording)} klatek ==")
+        print(f"{'backend':<16}{'śr. ms':>10}{'p95 ms':>10}{'kandydaci':>12}{'trafienia':>12}")
+        # Odniesienie liczone zawsze, także gdy brute_force nie został wybrany
+        results = {}
+        for name in [REFERENCE_BACKEND] + [name for name in backends if name != REFERENCE_BACKEND]:
+            results[name] = run_backend(name, recording)
+        expected_hits = results[REFERENCE_BACKEND]['hits']
+        for name in backends:
+            result = results[name]
+            print(f"{name:<16}{result['mean_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+                  f"{result['candidates']:>12.1f}{result['hits']:>12}")
+            if result['hits'] != expected_hits:
+                mismatches.append((scenario, name, result['hits'], expected_hits))
+
+    for scenario, name, hits, expected_hits in mismatches:
+        print(f"BŁĄD: {scenario}/{name}: {hits} trafień zamiast {expected_hits} ({REFERENCE_BACKEND})", file=sys.stderr)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 import pygame
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK
+from src import settings
+from src.settings import WHITE, BLACK
+from src.asset_cache import get_font
 
 
 class DemoTimer:
@@ -18,8 +20,8 @@ class DemoTimer:
         self.total_duration = duration_seconds
         self.elapsed_time = 0.0
         self.is_active = True
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_large = get_font(None, 48)
+        self.font_small = get_font(None, 32)
 
     def update(self, dt):
         """
@@ -76,7 +78,7 @@ class DemoTimer:
         # Rysuj tło dla timera
         timer_text = self.font_large.render(time_string, True, WHITE)
         timer_rect = timer_text.get_rect()
-        timer_rect.topright = (SCREEN_WIDTH - 20, 20)
+        timer_rect.topright = (settings.SCREEN_WIDTH - 20, 20)
 
         # Rysuj tło
         bg_rect = timer_rect.inflate(20, 10)
@@ -91,7 +93,7 @@ class DemoTimer:
         if remaining < 60:
             warning_text = self.font_small.render("KONIEC DEMO!", True, (255, 0, 0))
             warning_rect = warning_text.get_rect()
-            warning_rect.topright = (SCREEN_WIDTH - 20, 80)
+            warning_rect.topright = (settings.SCREEN_WIDTH - 20, 80)
             screen.blit(warning_text, warning_rect)
 
     def get_progress(self):
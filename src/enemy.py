@@ -1,16 +1,34 @@
 import os
 import math
 from src.entity import Entity
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src import settings
 
 
 class Enemy(Entity):
     """
     Klasa reprezentująca wroga w grze.
     Dziedziczy z Entity i dodaje logikę specyficzną dla wrogów.
+    Wróg dodany do EnemyStore jest cienkim widokiem: zdrowie i prędkość są czytane
+    z tablic magazynu, a rect jest aktualizowany przez EnemyStore.sync_rects().
     """
 
-    def __init__(self, x, y, image_path=None, health=20, max_velocity_x=80, max_velocity_y=80, acceleration=30):
+    # Magazyn, w którym jest wróg (None = wróg samodzielny) i jego indeks w tablicach
+    store = None
+    store_index = -1
+
+    # Typ wroga (id w ArchetypeTable) i XP wypadające po śmierci
+    archetype_id = 0
+    xp_gems = 2
+    xp_per_gem = 10
+
+    # Oddział (-1 = brak), czy wróg jest przywódcą i jego miejsce w szyku względem przywódcy
+    squad_id = -1
+    squad_leader = False
+    formation_x = 0.0
+    formation_y = 0.0
+
+    def __init__(self, x, y, image_path=None, health=20, max_velocity_x=80, max_velocity_y=80, acceleration=30,
+                 image=None):
         """
         Inicjalizuje Enemy.
 
@@ -22,8 +40,9 @@ class Enemy(Entity):
             max_velocity_x: Maksymalna prędkość na osi X
             max_velocity_y: Maksymalna prędkość na osi Y
             acceleration: Przyspieszenie
+            image: Gotowy obraz zamiast wczytywania z image_path (opcjonalnie)
         """
-        if image_path is None:
+        if image_path is None and image is None:
             image_path = os.path.join('assets', 'gfx', 'enemy.png')
 
         super().__init__(
@@ -32,29 +51,161 @@ class Enemy(Entity):
             image_path=image_path,
             max_velocity_x=max_velocity_x,
             max_velocity_y=max_velocity_y,
-            acceleration=acceleration
+            acceleration=acceleration,
+            image=image
         )
 
         # Statystyki wroga
         self.health = health
         self.max_health = health
 
+    @classmethod
+    def from_archetype(cls, archetypes, archetype_id, x, y):
+        """
+        Tworzy wroga z typu zapisanego w ArchetypeTable (statystyki to indeksowanie tablic).
+
+        Args:
+            archetypes: ArchetypeTable
+            archetype_id: Id typu
+            x: Początkowa pozycja X
+            y: Początkowa pozycja Y
+
+        Returns:
+            Nowy obiekt Enemy
+        """
+        speed = float(archetypes.speed[archetype_id])
+        # Grafika już przeskalowana do rozmiaru kolizji typu - nieprzeskalowany sprite nie jest wczytywany
+        enemy = cls(
+            x, y,
+            image=archetypes.get_image(archetype_id),
+            health=float(archetypes.health[archetype_id]),
+            max_velocity_x=speed,
+            max_velocity_y=speed,
+            acceleration=float(archetypes.acceleration[archetype_id])
+        )
+        enemy.archetype_id = archetype_id
+        enemy.xp_gems = int(archetypes.xp_gems[archetype_id])
+        enemy.xp_per_gem = int(archetypes.xp_per_gem[archetype_id])
+        return enemy
+
+    def reset(self, x, y):
+        """
+        Przywraca wroga do stanu po utworzeniu na nowej pozycji (dla EnemyPool).
+        Obraz i statystyki ruchu zostają - nie trzeba ich wczytywać ponownie.
+
+        Args:
+            x: Pozycja X (lewy górny róg)
+            y: Pozycja Y (lewy górny róg)
+        """
+        self.rect.topleft = (x, y)
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.health = self.max_health
+        self.leave_squad()
+
+    def join_squad(self, squad_id, leader=False, formation_x=0.0, formation_y=0.0):
+        """
+        Przypisuje wroga do oddziału. Wywołuj przed dodaniem do EnemyStore (magazyn kopiuje te pola w add()).
+
+        Args:
+            squad_id: Id oddziału (nieujemne)
+            leader: Czy wróg jest przywódcą oddziału
+            formation_x: Przesunięcie X miejsca w szyku względem środka przywódcy
+            formation_y: Przesunięcie Y miejsca w szyku względem środka przywódcy
+        """
+        self.squad_id = squad_id
+        self.squad_leader = leader
+        self.formation_x = formation_x
+        self.formation_y = formation_y
+
+    def leave_squad(self):
+        """Odłącza wroga od oddziału."""
+        self.squad_id = -1
+        self.squad_leader = False
+        self.formation_x = 0.0
+        self.formation_y = 0.0
+
+    def attach_store(self, store, index):
+        """
+        Podłącza wroga do tablic EnemyStore (wywoływane przez EnemyStore.add).
+
+        Args:
+            store: EnemyStore
+            index: Indeks wroga w tablicach
+        """
+        self.store = store
+        self.store_index = index
+
+    def detach_store(self):
+        """Kopiuje zdrowie i prędkość z tablic z powrotem do wroga i odłącza go od magazynu."""
+        store = self.store
+        if store is None:
+            return
+        index = self.store_index
+        self._health = float(store.health[index])
+        self._velocity_x = float(store.velocity_x[index])
+        self._velocity_y = float(store.velocity_y[index])
+        self.store = None
+        self.store_index = -1
+
+    @property
+    def health(self):
+        """Punkty zdrowia wroga."""
+        if self.store is None:
+            return self._health
+        return float(self.store.health[self.store_index])
+
+    @health.setter
+    def health(self, value):
+        if self.store is None:
+            self._health = value
+        else:
+            self.store.health[self.store_index] = value
+
+    @property
+    def velocity_x(self):
+        """Prędkość wroga na osi X."""
+        if self.store is None:
+            return self._velocity_x
+        return float(self.store.velocity_x[self.store_index])
+
+    @velocity_x.setter
+    def velocity_x(self, value):
+        if self.store is None:
+            self._velocity_x = value
+        else:
+            self.store.velocity_x[self.store_index] = value
+
+    @property
+    def velocity_y(self):
+        """Prędkość wroga na osi Y."""
+        if self.store is None:
+            return self._velocity_y
+        return float(self.store.velocity_y[self.store_index])
+
+    @velocity_y.setter
+    def velocity_y(self, value):
+        if self.store is None:
+            self._velocity_y = value
+        else:
+            self.store.velocity_y[self.store_index] = value
+
     def physics(self):
-        """Implementuje fizykę specyficzną dla wroga (ograniczenia granic ekranu)."""
+        """Implementuje fizykę specyficzną dla wroga (ograniczenia granic świata)."""
         # Ograniczenia poziome
         if self.rect.left < 0:
             self.rect.left = 0
             self.velocity_x = 0
-        elif self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
+        elif self.rect.right > settings.WORLD_WIDTH:
+            self.rect.right = settings.WORLD_WIDTH
             self.velocity_x = 0
 
         # Ograniczenia pionowe
         if self.rect.top < 0:
             self.rect.top = 0
             self.velocity_y = 0
-        elif self.rect.bottom > SCREEN_HEIGHT:
-            self.rect.bottom = SCREEN_HEIGHT
+        elif self.rect.bottom > settings.WORLD_HEIGHT:
+            self.rect.bottom = settings.WORLD_HEIGHT
             self.velocity_y = 0
 
         # Zastosuj ograniczenia prędkości z klasy bazowej
@@ -0,0 +1,152 @@
+"""
+Enemy Archetypes - rejestr typów wrogów wczytywany z pliku danych.
+Typy (zdrowie, prędkość, przyspieszenie, grafika, rozmiar kolizji, XP) są przy starcie
+kompilowane do płaskich tablic indeksowanych id typu, więc statystyki przy spawnie
+to jedno indeksowanie, a nowy wariant wroga to wpis w pliku zamiast podklasy Enemy.
+"""
+import json
+import os
+import random
+import numpy as np
+import pygame
+from src.asset_cache import load_image
+
+DEFAULT_ARCHETYPES_PATH = os.path.join('assets', 'data', 'enemies.json')
+
+# Typ używany bez pliku danych - dotychczasowe domyślne statystyki Enemy
+DEFAULT_ARCHETYPES = [
+    {
+        'name': 'grunt',
+        'health': 20,
+        'speed': 80,
+        'acceleration': 30,
+        'sprite': 'enemy.png',
+        'size': None,
+        'xp_gems': 2,
+        'xp_per_gem': 10,
+    },
+]
+
+
+def load_archetypes(path=DEFAULT_ARCHETYPES_PATH):
+    """
+    Wczytuje typy wrogów z pliku JSON i kompiluje je do tablic.
+
+    Format: {"archetypes": [{"name": "fast", "health": 12, "speed": 140, "acceleration": 60,
+    "sprite": "enemy.png", "size": [160, 160], "xp_gems": 1, "xp_per_gem": 10,
+    "spawn_weight": 3, "min_wave": 1}, ...]}
+    Brakujące pola są brane z pierwszego typu z DEFAULT_ARCHETYPES.
+
+    Args:
+        path: Ścieżka do pliku JSON (domyślnie assets/data/enemies.json)
+
+    Returns:
+        ArchetypeTable
+    """
+    with open(path, 'r', encoding='utf-8') as archetypes_file:
+        data = json.load(archetypes_file)
+    return ArchetypeTable(data.get('archetypes', []))
+
+
+class ArchetypeTable:
+    """
+    Skompilowane typy wrogów: jedna tablica na statystykę, indeks = id typu.
+    """
+
+    def __init__(self, archetypes=None):
+        """
+        Inicjalizuje ArchetypeTable.
+
+        Args:
+            archetypes: Lista słowników typów (domyślnie DEFAULT_ARCHETYPES)
+        """
+        archetypes = archetypes or DEFAULT_ARCHETYPES
+        defaults = DEFAULT_ARCHETYPES[0]
+        rows = []
+        for archetype in archetypes:
+            if 'name' not in archetype:
+                raise ValueError(f"Typ wroga bez pola name: {archetype}")
+            rows.append({**defaults, 'spawn_weight': 1, 'min_wave': 0, **archetype})
+
+        self.names = [row['name'] for row in rows]
+        self.ids = {name: archetype_id for archetype_id, name in enumerate(self.names)}
+        if len(self.ids) != len(self.names):
+            raise ValueError("Powtórzona nazwa typu wroga")
+
+        self.health = np.array([row['health'] for row in rows], dtype=np.float64)
+        self.speed = np.array([row['speed'] for row in rows], dtype=np.float64)
+        self.acceleration = np.array([row['acceleration'] for row in rows], dtype=np.float64)
+        self.xp_gems = np.array([row['xp_gems'] for row in rows], dtype=np.int64)
+        self.xp_per_gem = np.array([row['xp_per_gem'] for row in rows], dtype=np.int64)
+        self.spawn_weight = np.array([row['spawn_weight'] for row in rows], dtype=np.float64)
+        self.min_wave = np.array([row['min_wave'] for row in rows], dtype=np.int64)
+        self.sprites = [os.path.join('assets', 'gfx', row['sprite']) for row in rows]
+        # Rozmiar kolizji (None = rozmiar grafiki)
+        self.sizes = [tuple(row['size']) if row['size'] else None for row in rows]
+
+        # Grafiki przeskalowane do rozmiaru kolizji, wczytywane przy pierwszym użyciu
+        self.images = [None] * len(rows)
+
+    def __len__(self):
+        """Zwraca liczbę typów."""
+        return len(self.names)
+
+    def get_id(self, name):
+        """
+        Zwraca id typu o podanej nazwie.
+
+        Args:
+            name: Nazwa typu (np. 'tank')
+
+        Returns:
+            Id typu (indeks w tablicach)
+        """
+        if name not in self.ids:
+            raise ValueError(f"Nieznany typ wroga: {name}")
+        return self.ids[name]
+
+    def get_image(self, archetype_id):
+        """
+        Zwraca grafikę typu przeskalowaną do jego rozmiaru kolizji (współdzieloną przez wrogów tego typu).
+
+        Args:
+            archetype_id: Id typu
+
+        Returns:
+            Powierzchnia pygame (tylko do odczytu)
+        """
+        image = self.images[archetype_id]
+        if image is None:
+            image = load_image(self.sprites[archetype_id])
+            size = self.sizes[archetype_id]
+            if size is not None and size != image.get_size():
+                image = pygame.transform.smoothscale(image, size)
+            self.images[archetype_id] = image
+        return image
+
+    def get_max_size(self):
+        """
+        Zwraca najdłuższy bok rozmiaru kolizji spośród wszystkich typów (np. do doboru komórki broadphase).
+
+        Returns:
+            Rozmiar w pikselach
+        """
+        return max(max(self.get_image(archetype_id).get_size()) for archetype_id in range(len(self)))
+
+    def pick(self, wave):
+        """
+        Losuje typ do spawnu z krzywej fal według spawn_weight spośród typów z min_wave <= wave.
+
+        Args:
+            wave: Numer aktualnej fali
+
+        Returns:
+            Id typu
+        """
+        eligible = np.flatnonzero((self.min_wave <= wave) & (self.spawn_weight > 0))
+        if len(eligible) == 0:
+            return 0
+        cumulative = np.cumsum(self.spawn_weight[eligible])
+        # random() < 1, ale iloczyn może się zaokrąglić do sumy wag - wtedy bierzemy ostatni uprawniony typ
+        index = int(np.searchsorted(cumulative, random.random() * cumulative[-1], side='right'))
+        return int(eligible[min(index, len(eligible) - 1)])
@@ -26,7 +26,7 @@ class EnemyHealthBar:
         self.fade_out_duration = fade_out_duration
         self.fade_out_timer = 0.0  # Timer dla każdego wroga (będzie przechowywany w słowniku)
 
-    def draw(self, screen, enemy, fade_out_timer=None):
+    def draw(self, screen, enemy, fade_out_timer=None, offset_x=0, offset_y=0):
         """
         Rysuje pasek zdrowia wroga.
         Jeśli wróg jest martwy, pasek zanika przez fade_out_duration sekund.
@@ -35,6 +35,8 @@ class EnemyHealthBar:
             screen: Powierzchnia pygame do rysowania
             enemy: Obiekt wroga
             fade_out_timer: Timer zanikania dla martwego wroga (None jeśli żywy)
+            offset_x: Przesunięcie X odejmowane od pozycji (np. kamera)
+            offset_y: Przesunięcie Y odejmowane od pozycji (np. kamera)
         """
         # Jeśli wróg jest żywy, rysuj normalnie
         if enemy.health > 0:
@@ -45,8 +47,8 @@ class EnemyHealthBar:
             return
 
         # Oblicz pozycję paska (nad wrogiem)
-        bar_x = enemy.rect.centerx - self.bar_width // 2
-        bar_y = enemy.rect.top + self.offset_y
+        bar_x = enemy.rect.centerx - self.bar_width // 2 - offset_x
+        bar_y = enemy.rect.top + self.offset_y - offset_y
 
         # Oblicz przezroczystość dla zanikającego paska
         alpha = 255
@@ -139,7 +141,7 @@ class EnemyHealthBarManager:
             if enemy.health <= 0 and enemy_id not in self.fade_out_timers:
                 self.fade_out_timers[enemy_id] = self.health_bar.fade_out_duration
 
-    def draw_all(self, screen, enemies):
+    def draw_all(self, screen, enemies, offset_x=0, offset_y=0):
         """
         Rysuje paski zdrowia dla wszystkich wrogów.
         Paski martwych wrogów zanikają przez krótki czas.
@@ -147,9 +149,11 @@ class EnemyHealthBarManager:
         Args:
             screen: Powierzchnia pygame do rysowania
             enemies: Lista wrogów
+            offset_x: Przesunięcie X odejmowane od pozycji (np. kamera)
+            offset_y: Przesunięcie Y odejmowane od pozycji (np. kamera)
         """
         for enemy in enemies:
             enemy_id = id(enemy)
             fade_out_timer = self.fade_out_timers.get(enemy_id, None)
-            self.health_bar.draw(screen, enemy, fade_out_timer)
+            self.health_bar.draw(screen, enemy, fade_out_timer, offset_x, offset_y)
 
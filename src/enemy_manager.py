@@ -1,7 +1,13 @@
 import random
 import math
-from src.enemy import Enemy
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+import numpy as np
+import pygame
+from src.enemy_store import EnemyStore
+from src.numpy_spatial_hash import NumpySpatialHash
+from src.enemy_pool import EnemyPool
+from src.wave_director import WaveDirector
+from src.enemy_archetypes import ArchetypeTable
+from src import settings
 
 
 class EnemyManager:
@@ -10,25 +16,82 @@ class EnemyManager:
     Implementuje system fal wrogów, które rosną w trudności wraz z czasem.
     """
 
-    def __init__(self, spawn_distance=100, max_enemies=30):
+    def __init__(self, spawn_distance=100, max_enemies=30, spatial_grid=None, world=None,
+                 separation_strength=0.0, separation_radius=40, cohesion_strength=0.0, flow_field=None,
+                 lod_bands=None, wave_director=None, archetypes=None, spawn_candidates=1, spawn_ring_width=0,
+                 spawn_safety_radius=None, spawn_cell_capacity=None, squad_chance=0.0, squad_size=5,
+                 formation_radius=64, max_sleeping=None):
         """
         Inicjalizuje EnemyManager.
 
         Args:
             spawn_distance: Dystans od gracza, w którym spawniają się wrogowie (poza ekranem)
             max_enemies: Początkowa maksymalna liczba wrogów na ekranie (domyślnie 30)
+            spatial_grid: SpatialGrid utrzymywany na bieżąco przy spawnie, ruchu i śmierci wrogów (opcjonalnie)
+            world: World, w którego uśpionych kawałkach czekają wrogowie spoza kamery (opcjonalnie)
+            separation_strength: Przyspieszenie rozpychania wrogów w pikselach/s^2 (domyślnie 0 - wyłączone)
+            separation_radius: Odległość środków, poniżej której wrogowie się rozpychają (domyślnie 40)
+            cohesion_strength: Przyspieszenie w kierunku sąsiadów w pikselach/s^2 (domyślnie 0 - wyłączone)
+            flow_field: FlowField wspólny dla wszystkich wrogów (opcjonalnie; bez niego każdy goni gracza prosto)
+            lod_bands: Pasma odległości od gracza [(maksymalna odległość, okres w klatkach), ...]
+                rosnąco, ostatnie z odległością None (domyślnie None - wszyscy co klatkę)
+            wave_director: WaveDirector kolejkujący spawny (domyślnie nowy WaveDirector(max_enemies))
+            archetypes: ArchetypeTable z typami wrogów (domyślnie tylko domyślny typ)
+            spawn_candidates: Liczba losowanych pozycji na pierścieniu, z których wybierana jest
+                najmniej zatłoczona (domyślnie 1 - losowa pozycja jak dawniej)
+            spawn_ring_width: Szerokość pierścienia spawnu za spawn_distance w pikselach (domyślnie 0)
+            spawn_safety_radius: Najmniejszy odstęp prostokąta nowego wroga od gracza w pikselach
+                (domyślnie None - bez strefy bezpieczeństwa)
+            spawn_cell_capacity: Liczba wrogów w komórkach siatki pod pozycją, od której pozycja jest
+                odrzucana (domyślnie None - bez limitu)
+            squad_chance: Prawdopodobieństwo, że spawn z krzywej fal zaczyna oddział (domyślnie 0 - wyłączone)
+            squad_size: Liczba wrogów w oddziale razem z przywódcą (domyślnie 5)
+            formation_radius: Odległość od miejsca w szyku, przy której podwładny kieruje się
+                już bardziej do miejsca niż za przywódcą (domyślnie 64)
+            max_sleeping: Najwięcej wrogów uśpionych w kawałkach świata - nadmiar z najdalszych
+                kawałków wraca do puli (domyślnie None - tyle, ile aktualny limit wrogów)
         """
-        self.enemies = []
+        # Aktywni wrogowie w tablicach NumPy - uśpieni są w kawałkach świata i nie są aktualizowani ani w siatce
+        self.store = EnemyStore()
+        # Typy wrogów skompilowane do tablic - spawn to id typu i pozycja
+        self.archetypes = archetypes if archetypes is not None else ArchetypeTable()
+        # Martwi wrogowie wracają do puli i są używani ponownie przy spawnie
+        self.pool = EnemyPool(self.archetypes)
+        self.spatial_grid = spatial_grid
+        self.world = world
+        # Uśpieni nie liczą się do limitu fal, więc ich liczba też ma swój limit (inaczej pula rośnie bez końca)
+        self.max_sleeping = max_sleeping
         self.spawn_distance = spawn_distance
-        self.base_max_enemies = max_enemies  # Bazowa liczba wrogów
-        self.max_enemies = max_enemies  # Dynamicznie skalowana maksymalna liczba wrogów
-        self.wave = 0
-        self.time_elapsed = 0.0
-        self.spawn_timer = 0.0
-        self.spawn_interval = 1.5  # Początkowy interwał spawnu (sekundy)
-        self.enemies_per_wave = 2  # Liczba wrogów na falę
+        # Rozmieszczanie spawnów według zajętości siatki
+        self.spawn_candidates = spawn_candidates
+        self.spawn_ring_width = spawn_ring_width
+        self.spawn_safety_radius = spawn_safety_radius
+        self.spawn_cell_capacity = spawn_cell_capacity
+        # Krzywa fal i oś czasu tylko kolejkują spawny - wykonywane są w budżecie na klatkę
+        self.wave_director = wave_director if wave_director is not None else WaveDirector(max_enemies)
         self.enemies_spawned = 0
 
+        # Sterowanie stadem - rozpychanie nie pozwala hordzie zlać się w jedną kupę
+        self.separation_strength = separation_strength
+        self.separation_radius = separation_radius
+        self.cohesion_strength = cohesion_strength
+
+        # Oddziały - pościg liczy tylko przywódca, podwładni trzymają szyk
+        # Kolejne spawny z kolejki dołączają do tworzonego oddziału, więc budżet spawnów na klatkę obowiązuje
+        self.squad_chance = squad_chance
+        self.squad_size = squad_size
+        self.formation_radius = formation_radius
+        self.next_squad_id = 0
+        self.forming_leader = None
+        self.forming_slots = []
+
+        # Wspólne pole kierunków do gracza, liczone raz na kilka klatek
+        self.flow_field = flow_field
+
+        # Poziom szczegółowości - dalecy wrogowie są aktualizowani rzadziej, z dłuższym dt
+        self.lod_bands = lod_bands
+        self.frame = 0
+
     def update(self, dt, player):
         """
         Aktualizuje wszystkich wrogów i zarządza spawnowaniem nowych.
@@ -37,59 +100,254 @@ class EnemyManager:
             dt: Delta czasu od ostatniej klatki
             player: Obiekt gracza (do obliczania kierunku wrogów)
         """
-        self.time_elapsed += dt
-        self.spawn_timer += dt
-
-        # Zwiększaj trudność co 30 sekund, ale z bardziej płynną krzywą
-        # Używamy logarytmicznej funkcji zamiast liniowej, aby uniknąć gwałtownych skoków
-        if self.time_elapsed > 30 * (self.wave + 1):
-            self.wave += 1
-            # Logarytmiczna krzywa dla interwału spawnu (zmniejsza się wolniej)
-            # log(wave + 1) zapobiega zbyt szybkiemu zmniejszaniu się interwału
-            self.spawn_interval = max(0.3, 1.0 - math.log(self.wave + 1) * 0.15)
-            # Logarytmiczna krzywa dla liczby wrogów (rośnie wolniej)
-            self.enemies_per_wave = 3 + int(math.log(self.wave + 1) * 2)
-            # Dynamicznie skaluj maksymalną liczbę wrogów wraz z postępem fali
-            # Wzór: base_max_enemies + wave * 5 (np. 30 + 0*5 = 30, 30 + 1*5 = 35, itd.)
-            # Logarytmiczne skalowanie zapobiega zbyt szybkiemu wzrostowi
-            self.max_enemies = self.base_max_enemies + int(math.log(self.wave + 1) * 8)
-
-        # Spawnuj nowych wrogów (jeśli nie osiągnęliśmy limitu)
-        if self.spawn_timer >= self.spawn_interval and len(self.enemies) < self.max_enemies:
-            self._spawn_enemies(player)
-            self.spawn_timer = 0.0
-
-        # Aktualizuj wszystkich wrogów
-        for enemy in self.enemies:
-            enemy.move_towards_player(player.rect.centerx, player.rect.centery, dt)
-            enemy.update(dt)
+        # Uśpij wrogów z oddalonych kawałków i obudź tych, do których zbliżyła się kamera
+        if self.world is not None:
+            self._stream_chunks()
+
+        # Dopisz spawny z krzywej fal i osi czasu, potem wykonaj tyle, ile pozwala budżet klatki
+        self.wave_director.update(dt, len(self.enemies))
+        self.wave_director.spawn(self._spawn_enemy, player)
+
+        # Wybierz wrogów do aktualizacji w tej klatce (bez LOD - wszystkich, ze wspólnym dt)
+        # Rozpychanie i krok liczą tylko wybranych, każdego z jego własnym zgromadzonym dt
+        self.frame += 1
+        if self.lod_bands is not None:
+            step_dt, updated = self.store.schedule_lod(
+                dt, player.rect.centerx, player.rect.centery, self.lod_bands, self.frame
+            )
+        else:
+            step_dt, updated = dt, None
+
+        # Rozpychanie (i spójność) od sąsiadów, zanim step() ograniczy prędkość
+        if self.separation_strength or self.cohesion_strength:
+            self.store.apply_separation(
+                step_dt, self.separation_radius, self.separation_strength, cohesion=self.cohesion_strength,
+                indices=updated
+            )
+
+        # Pole przepływu pokrywa aktywne kawałki świata (bez świata - cały świat)
+        if self.flow_field is not None:
+            if self.world is not None:
+                area = self.world.get_active_rect()
+            else:
+                area = pygame.Rect(0, 0, settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
+            self.flow_field.update(player.rect.centerx, player.rect.centery, area)
+
+        # Aktualizuj wybranych wrogów naraz (pościg, granice świata, limit prędkości, ruch)
+        # Pominięci w tej klatce nie są liczeni wcale i stoją w miejscu
+        self.store.step(
+            step_dt, player.rect.centerx, player.rect.centery, settings.WORLD_WIDTH, settings.WORLD_HEIGHT,
+            flow_field=self.flow_field, formation_radius=self.formation_radius, indices=updated
+        )
+        self.store.sync_rects(updated)
+        # Hash NumPy przebudowuje się w całości z tablic magazynu (bez czytania rect po kolei),
+        # siatka przenosi wroga tylko wtedy, gdy zmienił komórkę
+        if isinstance(self.spatial_grid, NumpySpatialHash):
+            self.spatial_grid.rebuild_from_rects(self.enemies, self.store.get_rects())
+        elif self.spatial_grid is not None:
+            enemies = self.enemies
+            if updated is None:
+                for enemy in enemies:
+                    self.spatial_grid.update_object(enemy)
+            else:
+                for index in updated.tolist():
+                    self.spatial_grid.update_object(enemies[index])
 
         # Usuń martwych wrogów
-        self.enemies = [enemy for enemy in self.enemies if enemy.is_alive()]
+        self._remove_dead()
+
+    @property
+    def enemies(self):
+        """Lista aktywnych wrogów (widoki Enemy w kolejności tablic magazynu)."""
+        return self.store.enemies
+
+    def _remove_dead(self):
+        """Usuwa z magazynu martwych i oznaczonych wrogów, a martwych także z siatki i oddaje do puli."""
+        for enemy in self.store.compact():
+            if self.spatial_grid is not None:
+                self.spatial_grid.remove_object(enemy)
+            self.pool.release(enemy)
+
+    def _stream_chunks(self):
+        """Przenosi wrogów między listą aktywnych a kawałkami świata po zmianie aktywnych kawałków."""
+        # Uśpieni są tylko oznaczani, a budzeni dopisywani na koniec magazynu - po kompaktowaniu
+        # lista magazynu jest taka sama jak lista zwrócona przez stream()
+        self.world.stream('enemies', self.enemies, on_sleep=self._sleep_enemy, on_wake=self._wake_enemy)
+        self._remove_dead()
 
-    def _spawn_enemies(self, player):
+        # Nadmiar uśpionych (z kawałków najdalszych od kamery) wraca do puli - są już poza magazynem i siatką
+        max_sleeping = self.max_sleeping if self.max_sleeping is not None else self.wave_director.max_enemies
+        excess = self.world.get_sleeping_count('enemies') - max_sleeping
+        for enemy in self.world.evict_sleeping('enemies', excess):
+            self.pool.release(enemy)
+
+    def _sleep_enemy(self, enemy):
+        """Odłącza usypianego wroga od magazynu i siatki."""
+        self.store.mark_removed(enemy)
+        if self.spatial_grid is not None:
+            self.spatial_grid.remove_object(enemy)
+
+    def _wake_enemy(self, enemy):
+        """Dodaje budzonego wroga do magazynu i siatki."""
+        self.store.add(enemy)
+        if self.spatial_grid is not None:
+            self.spatial_grid.add_object(enemy)
+
+    def _spawn_enemy(self, archetype, player):
         """
-        Spawnia nowych wrogów wokół gracza.
+        Spawnia jednego wroga wokół gracza.
 
         Args:
+            archetype: Nazwa typu wroga lub None (typ losowany według aktualnej fali)
             player: Obiekt gracza (do obliczania pozycji spawnu)
         """
-        for _ in range(self.enemies_per_wave):
-            # Losuj kąt spawnu (0-360 stopni)
+        # Spawn z krzywej fal dołącza do tworzonego oddziału, jeśli jego przywódca wciąż jest aktywny
+        leader = self.forming_leader
+        if leader is not None and (leader.store is not self.store or not leader.squad_leader or not self.forming_slots):
+            leader = self.forming_leader = None
+        if archetype is None and leader is not None:
+            self._spawn_follower(leader)
+            return
+
+        if archetype is None:
+            archetype_id = self.archetypes.pick(self.wave_director.wave)
+        else:
+            archetype_id = self.archetypes.get_id(archetype)
+
+        size = self.archetypes.get_image(archetype_id).get_size()
+        spawn_x, spawn_y = self._choose_spawn_position(player, size)
+
+        # Utwórz nowego wroga
+        enemy = self.pool.acquire(archetype_id, spawn_x, spawn_y)
+        if archetype is None and self.squad_size > 1 and random.random() < self.squad_chance:
+            self._start_squad(enemy, size)
+        self.store.add(enemy)
+        self.enemies_spawned += 1
+        if self.spatial_grid is not None:
+            self.spatial_grid.add_object(enemy)
+
+    def _start_squad(self, leader, size):
+        """
+        Czyni wroga przywódcą nowego oddziału i rozkłada miejsca podwładnych na okręgu wokół niego.
+
+        Args:
+            leader: Nowo utworzony wróg (jeszcze nie w magazynie)
+            size: Rozmiar (szerokość, wysokość) wrogów oddziału
+        """
+        squad_id = self.next_squad_id
+        self.next_squad_id += 1
+        leader.join_squad(squad_id, leader=True)
+        followers = self.squad_size - 1
+        # Promień okręgu tak, by sąsiednie miejsca były oddalone o rozmiar wroga
+        spacing = max(size)
+        radius = max(spacing, spacing / (2 * math.sin(math.pi / followers))) if followers > 1 else spacing
+        self.forming_slots = [
+            (math.cos(2 * math.pi * slot / followers) * radius, math.sin(2 * math.pi * slot / followers) * radius)
+            for slot in range(followers)
+        ]
+        self.forming_leader = leader
+
+    def _spawn_follower(self, leader):
+        """
+        Spawnia kolejnego podwładnego tworzonego oddziału na jego miejscu w szyku.
+
+        Args:
+            leader: Przywódca oddziału (aktywny w magazynie)
+        """
+        formation_x, formation_y = self.forming_slots.pop()
+        if not self.forming_slots:
+            self.forming_leader = None
+        width, height = leader.rect.size
+        spawn_x = max(0, min(leader.rect.centerx + formation_x - width // 2, settings.WORLD_WIDTH - width))
+        spawn_y = max(0, min(leader.rect.centery + formation_y - height // 2, settings.WORLD_HEIGHT - height))
+
+        enemy = self.pool.acquire(leader.archetype_id, spawn_x, spawn_y)
+        enemy.join_squad(leader.squad_id, formation_x=formation_x, formation_y=formation_y)
+        self.store.add(enemy)
+        self.enemies_spawned += 1
+        if self.spatial_grid is not None:
+            self.spatial_grid.add_object(enemy)
+
+    def _choose_spawn_position(self, player, size):
+        """
+        Wybiera pozycję spawnu na pierścieniu wokół gracza: z spawn_candidates losowych pozycji
+        odrzuca te spoza świata, zbyt bliskie gracza i w pełnych komórkach siatki,
+        a z pozostałych bierze najmniej zatłoczoną.
+
+        Args:
+            player: Obiekt gracza
+            size: Rozmiar (szerokość, wysokość) nowego wroga
+
+        Returns:
+            Krotka (x, y) lewego górnego rogu wroga
+        """
+        width, height = size
+        center_x = player.rect.centerx
+        center_y = player.rect.centery
+        distance = self.spawn_distance
+        safe_rect = None
+        if self.spawn_safety_radius is not None:
+            safe_rect = player.rect.inflate(2 * self.spawn_safety_radius, 2 * self.spawn_safety_radius)
+            # Pierścień musi zaczynać się tam, gdzie żaden obrót prostokąta wroga nie sięga strefy
+            half_diagonals = (math.hypot(*player.rect.size) + math.hypot(width, height)) / 2
+            distance = max(distance, self.spawn_safety_radius + half_diagonals)
+
+        best = None
+        best_count = None
+        fallback = None
+        for _ in range(self.spawn_candidates):
+            # Losuj kąt spawnu (0-360 stopni) i odległość w pierścieniu
             angle = random.uniform(0, 2 * math.pi)
+            radius = distance + random.uniform(0, self.spawn_ring_width)
+            rect = pygame.Rect(0, 0, width, height)
+            rect.center = (center_x + math.cos(angle) * radius, center_y + math.sin(angle) * radius)
+            if self.spawn_candidates == 1:
+                return rect.topleft
+            if fallback is None:
+                fallback = rect.topleft
 
-            # Oblicz pozycję spawnu poza ekranem
-            spawn_x = player.rect.centerx + math.cos(angle) * self.spawn_distance
-            spawn_y = player.rect.centery + math.sin(angle) * self.spawn_distance
+            # Pozycja przy krawędzi zostałaby dociśnięta do granicy świata - bliżej gracza
+            if (rect.left < 0 or rect.top < 0 or
+                    rect.right > settings.WORLD_WIDTH or rect.bottom > settings.WORLD_HEIGHT):
+                continue
+            if safe_rect is not None and safe_rect.colliderect(rect):
+                continue
+            count = self._get_spawn_occupancy(rect)
+            if self.spawn_cell_capacity is not None and count >= self.spawn_cell_capacity:
+                continue
+            if best_count is None or count < best_count:
+                best = rect.topleft
+                best_count = count
+                if count == 0:
+                    break
 
-            # Utwórz nowego wroga
-            enemy = Enemy(spawn_x, spawn_y)
-            self.enemies.append(enemy)
-            self.enemies_spawned += 1
+        # Wszystkie pozycje odrzucone (np. gracz w rogu świata) - pierwsza wylosowana
+        return best if best is not None else fallback
+
+    def _get_spawn_occupancy(self, rect):
+        """
+        Zwraca liczbę wrogów w komórkach siatki pokrywanych przez prostokąt
+        (bez siatki - liczbę środków wrogów w prostokącie).
+
+        Args:
+            rect: pygame.Rect kandydata na pozycję spawnu
+
+        Returns:
+            Liczba wrogów
+        """
+        if self.spatial_grid is not None:
+            return len(self.spatial_grid.query_rect(rect))
+        store = self.store
+        n = store.count
+        centers_x = store.x[:n] + store.width[:n] * 0.5
+        centers_y = store.y[:n] + store.height[:n] * 0.5
+        inside = ((centers_x >= rect.left) & (centers_x < rect.right) &
+                  (centers_y >= rect.top) & (centers_y < rect.bottom))
+        return int(np.count_nonzero(inside))
 
     def get_enemies(self):
         """
-        Zwraca listę wszystkich wrogów.
+        Zwraca listę aktywnych wrogów (bez uśpionych w kawałkach świata).
 
         Returns:
             Lista wrogów
@@ -98,17 +356,24 @@ class EnemyManager:
 
     def remove_enemy(self, enemy):
         """
-        Usuwa wroga z listy.
+        Usuwa wroga w O(1) i oddaje go do puli.
+        Obiekt może zostać użyty ponownie przy najbliższym spawnie, więc nie trzymaj do niego referencji.
 
         Args:
             enemy: Wróg do usunięcia
         """
-        if enemy in self.enemies:
-            self.enemies.remove(enemy)
+        if self.store.remove(enemy):
+            if self.spatial_grid is not None:
+                self.spatial_grid.remove_object(enemy)
+            self.pool.release(enemy)
+
+    def get_pool_stats(self):
+        """Zwraca statystyki puli wrogów (live, free, high_water, created)."""
+        return self.pool.get_stats()
 
     def get_wave(self):
         """Zwraca numer aktualnej fali."""
-        return self.wave
+        return self.wave_director.wave
 
     def get_enemies_count(self):
         """Zwraca liczbę aktualnie żywych wrogów."""
@@ -116,9 +381,9 @@ class EnemyManager:
 
     def get_spawn_interval(self):
         """Zwraca aktualny interwał spawnu."""
-        return self.spawn_interval
+        return self.wave_director.spawn_interval
 
     def get_max_enemies(self):
         """Zwraca aktualny maksymalny limit wrogów."""
-        return self.max_enemies
+        return self.wave_director.max_enemies
 
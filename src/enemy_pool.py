@@ -0,0 +1,75 @@
+"""
+Enemy Pool - pula obiektów wrogów.
+Zamiast tworzyć nowego Enemy przy każdym spawnie (i porzucać go po śmierci),
+martwi wrogowie wracają na listę wolnych i są ponownie używani po reset().
+Wolne obiekty są trzymane osobno dla każdego typu wroga (grafika i statystyki zostają).
+"""
+from src.enemy import Enemy
+from src.enemy_archetypes import ArchetypeTable
+
+
+class EnemyPool:
+    """
+    Pula wrogów z listą wolnych obiektów.
+    """
+
+    def __init__(self, archetypes=None):
+        """
+        Inicjalizuje EnemyPool.
+
+        Args:
+            archetypes: ArchetypeTable z typami wrogów (domyślnie tylko domyślny typ)
+        """
+        self.archetypes = archetypes if archetypes is not None else ArchetypeTable()
+        # Listy wolnych (martwych) wrogów gotowych do ponownego użycia - po jednej na typ
+        self.free = [[] for _ in range(len(self.archetypes))]
+        self.live_count = 0
+        self.high_water = 0  # Największa liczba jednocześnie żywych wrogów z puli
+        self.created_count = 0
+
+    def acquire(self, archetype_id, x, y):
+        """
+        Zwraca wroga danego typu na podanej pozycji - z listy wolnych lub nowo utworzonego.
+
+        Args:
+            archetype_id: Id typu w ArchetypeTable
+            x: Pozycja X (lewy górny róg)
+            y: Pozycja Y (lewy górny róg)
+
+        Returns:
+            Obiekt Enemy z pełnym zdrowiem i zerową prędkością
+        """
+        free = self.free[archetype_id]
+        if free:
+            enemy = free.pop()
+            enemy.reset(x, y)
+        else:
+            enemy = Enemy.from_archetype(self.archetypes, archetype_id, x, y)
+            self.created_count += 1
+        self.live_count += 1
+        self.high_water = max(self.high_water, self.live_count)
+        return enemy
+
+    def release(self, enemy):
+        """
+        Oddaje wroga do puli. Wróg nie może być już w magazynie ani w siatce.
+
+        Args:
+            enemy: Obiekt Enemy uzyskany z acquire()
+        """
+        self.free[enemy.archetype_id].append(enemy)
+        self.live_count -= 1
+
+    def get_stats(self):
+        """
+        Zwraca statystyki puli (do diagnostyki).
+
+        Returns:
+            Słownik: live, free, high_water, created
+        """
+        return {
+            'live': self.live_count,
+            'free': sum(len(free) for free in self.free),
+            'high_water': self.high_water,
+            'created': self.created_count,
+        }
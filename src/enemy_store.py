@@ -0,0 +1,482 @@
+"""
+Enemy Store - symulacja wrogów w układzie struktury tablic (structure of arrays).
+Pozycje, prędkości, zdrowie, przyspieszenie i limity prędkości wszystkich aktywnych wrogów
+są trzymane w tablicach NumPy, a pościg, ograniczenia, całkowanie i usuwanie martwych
+są wykonywane jako operacje na całych tablicach.
+Obiekty Enemy pozostają cienkimi widokami (rect do rysowania i kolizji, właściwości
+health i velocity czytające z tablic), więc istniejące wywołania działają bez zmian.
+"""
+import numpy as np
+
+
+# Tablice float64 z danymi wrogów (indeks = pozycja w EnemyStore.enemies)
+# pending_dt to czas, który upłynął od ostatniej aktualizacji wroga (dla LOD)
+# squad to id oddziału (-1 = brak), squad_leader to 1 dla przywódcy, formation_x/y to miejsce w szyku względem przywódcy
+FIELDS = ('x', 'y', 'width', 'height', 'velocity_x', 'velocity_y',
+          'health', 'acceleration', 'max_velocity_x', 'max_velocity_y', 'pending_dt',
+          'squad', 'squad_leader', 'formation_x', 'formation_y')
+
+
+class EnemyStore:
+    """
+    Magazyn aktywnych wrogów. Indeks wroga w tablicach odpowiada jego pozycji w self.enemies.
+    Tablice rosną dwukrotnie, gdy zabraknie miejsca.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Inicjalizuje EnemyStore.
+
+        Args:
+            capacity: Początkowa pojemność tablic (domyślnie 256)
+        """
+        self.count = 0
+        # Widoki Enemy w kolejności indeksów tablic
+        self.enemies = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Tworzy (lub powiększa) tablice, zachowując dane aktywnych wrogów."""
+        n = self.count
+        old = getattr(self, 'x', None)
+        for name in FIELDS:
+            array = np.zeros(capacity, dtype=np.float64)
+            if old is not None:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        # Wrogowie oznaczeni do usunięcia przy najbliższym compact()
+        removed = np.zeros(capacity, dtype=bool)
+        if old is not None:
+            removed[:n] = self.removed[:n]
+        self.removed = removed
+        self.capacity = capacity
+
+    def add(self, enemy):
+        """
+        Dodaje wroga do magazynu. Od tej chwili jego zdrowie i prędkość są w tablicach.
+
+        Args:
+            enemy: Obiekt Enemy (nie może być w innym magazynie)
+
+        Returns:
+            Indeks wroga w tablicach
+        """
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.count
+        rect = enemy.rect
+        self.x[index] = rect.x
+        self.y[index] = rect.y
+        self.width[index] = rect.width
+        self.height[index] = rect.height
+        self.velocity_x[index] = enemy.velocity_x
+        self.velocity_y[index] = enemy.velocity_y
+        self.health[index] = enemy.health
+        self.acceleration[index] = enemy.acc
+        self.max_velocity_x[index] = enemy.max_velocity_x
+        self.max_velocity_y[index] = enemy.max_velocity_y
+        self.pending_dt[index] = 0.0
+        self.squad[index] = enemy.squad_id
+        self.squad_leader[index] = enemy.squad_leader
+        self.formation_x[index] = enemy.formation_x
+        self.formation_y[index] = enemy.formation_y
+        self.removed[index] = False
+
+        self.enemies.append(enemy)
+        self.count += 1
+        enemy.attach_store(self, index)
+        return index
+
+    def mark_removed(self, enemy):
+        """
+        Oznacza wroga do usunięcia przy najbliższym compact() i odłącza go od tablic.
+        Nie zmienia indeksów innych wrogów, więc można wywoływać w trakcie iteracji po self.enemies.
+
+        Args:
+            enemy: Obiekt Enemy z tego magazynu
+        """
+        if enemy.store is not self:
+            return
+        self.removed[enemy.store_index] = True
+        enemy.detach_store()
+
+    def remove(self, enemy):
+        """
+        Usuwa wroga od razu w O(1): na jego miejsce trafia ostatni wróg (swap-remove).
+        Zmienia indeks przeniesionego wroga, więc nie wywołuj w trakcie iteracji po self.enemies.
+
+        Args:
+            enemy: Obiekt Enemy z tego magazynu
+
+        Returns:
+            True jeśli wróg był w magazynie, False w przeciwnym razie
+        """
+        if enemy.store is not self:
+            return False
+        index = enemy.store_index
+        enemy.detach_store()
+        last = self.count - 1
+        if index != last:
+            for name in FIELDS + ('removed',):
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved = self.enemies[last]
+            self.enemies[index] = moved
+            moved.store_index = index
+        self.enemies.pop()
+        self.count = last
+        return True
+
+    def compact(self):
+        """
+        Usuwa martwych (zdrowie <= 0) i oznaczonych wrogów jedną operacją na tablicach.
+
+        Returns:
+            Lista usuniętych martwych wrogów (oznaczeni przez mark_removed już są odłączeni)
+        """
+        n = self.count
+        keep = ~self.removed[:n] & (self.health[:n] > 0)
+        if keep.all():
+            return []
+
+        dead_indices = np.flatnonzero(~keep & ~self.removed[:n]).tolist()
+        dead = [self.enemies[index] for index in dead_indices]
+        for enemy in dead:
+            enemy.detach_store()
+
+        kept = int(keep.sum())
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.removed[:n] = False
+
+        self.enemies = [enemy for enemy, flag in zip(self.enemies, keep.tolist()) if flag]
+        self.count = kept
+        for index, enemy in enumerate(self.enemies):
+            enemy.store_index = index
+        return dead
+
+    def schedule_lod(self, dt, target_x, target_y, bands, frame):
+        """
+        Przydziela wrogów do pasm odległości od celu i wybiera tych, których aktualizować w tej klatce.
+        Wróg z pasma o okresie p jest aktualizowany co p-tą klatkę z dt równym czasowi
+        od swojej poprzedniej aktualizacji; przesunięcie o indeks rozkłada pracę po klatkach.
+
+        Args:
+            dt: Delta czasu od ostatniej klatki
+            target_x: Pozycja X celu (środek gracza)
+            target_y: Pozycja Y celu (środek gracza)
+            bands: Lista (maksymalna odległość, okres w klatkach) rosnąco po odległości;
+                ostatnie pasmo może mieć odległość None (wszystko dalej)
+            frame: Numer bieżącej klatki
+
+        Returns:
+            Krotka (tablica dt aktualizowanych wrogów, ich indeksy) - do przekazania jako dt
+            i indices do apply_separation() i step()
+        """
+        n = self.count
+        pending = self.pending_dt[:n]
+        pending += dt
+        dx = self.x[:n] + self.width[:n] * 0.5 - target_x
+        dy = self.y[:n] + self.height[:n] * 0.5 - target_y
+        distance_sq = dx * dx + dy * dy
+
+        period = np.full(n, bands[-1][1], dtype=np.int64)
+        # Od najdalszego pasma do najbliższego - bliższe pasma nadpisują dalsze
+        for max_distance, band_period in reversed(bands):
+            if max_distance is not None:
+                period[distance_sq <= max_distance * max_distance] = band_period
+
+        updated = np.flatnonzero((frame + np.arange(n)) % period == 0)
+        step_dt = pending[updated]
+        pending[updated] = 0.0
+        return step_dt, updated
+
+    def _get_rows(self, indices):
+        """Zwraca wybór wierszy tablic: wycinek wszystkich aktywnych wrogów lub tablicę indeksów."""
+        return slice(0, self.count) if indices is None else indices
+
+    def _get_followers(self, rows):
+        """
+        Znajduje członków oddziałów wśród wybranych wierszy, których przywódca jest w magazynie.
+
+        Args:
+            rows: Wycinek lub tablica indeksów wrogów
+
+        Returns:
+            Krotka tablic (pozycje podwładnych w rows, indeksy ich przywódców w magazynie)
+        """
+        n = self.count
+        squad = self.squad[rows]
+        members = np.flatnonzero((squad >= 0) & (self.squad_leader[rows] == 0))
+        if len(members) == 0:
+            return members, members
+        leaders = np.flatnonzero(self.squad_leader[:n] > 0)
+        if len(leaders) == 0:
+            return leaders, leaders
+        # Przywódca oddziału podwładnego (brak, jeśli zginął lub śpi)
+        order = np.argsort(self.squad[leaders], kind='stable')
+        leader_squads = self.squad[leaders][order]
+        wanted = squad[members]
+        positions = np.minimum(np.searchsorted(leader_squads, wanted), len(leader_squads) - 1)
+        found = leader_squads[positions] == wanted
+        return members[found], leaders[order[positions[found]]]
+
+    def get_followers(self):
+        """
+        Znajduje członków oddziałów, których przywódca jest w magazynie.
+
+        Returns:
+            Krotka tablic (indeksy podwładnych, indeksy ich przywódców)
+        """
+        return self._get_followers(slice(0, self.count))
+
+    def step(self, dt, target_x, target_y, world_width, world_height, flow_field=None, formation_radius=64,
+             indices=None):
+        """
+        Wykonuje krok symulacji wrogów naraz: przyspieszenie w kierunku celu,
+        ograniczenie do granic świata, limit prędkości i ruch
+        (ta sama kolejność co Enemy.move_towards_player + Enemy.update).
+        Z indices liczeni są tylko wybrani wrogowie (np. z schedule_lod), więc koszt
+        zależy od liczby aktualizowanych, a nie wszystkich wrogów.
+
+        Args:
+            dt: Delta czasu od ostatniej klatki lub tablica dt dla każdego liczonego wroga (np. z schedule_lod)
+            target_x: Pozycja X celu (środek gracza)
+            target_y: Pozycja Y celu (środek gracza)
+            world_width: Szerokość świata
+            world_height: Wysokość świata
+            flow_field: FlowField, z którego wrogowie odczytują kierunek pościgu (opcjonalnie);
+                wrogowie bez poprawnego kierunku w polu gonią cel prosto
+            formation_radius: Odległość od miejsca w szyku, przy której podwładny oddziału
+                kieruje się już bardziej do swojego miejsca niż za przywódcą (domyślnie 64)
+            indices: Tablica indeksów wrogów do policzenia (domyślnie None - wszyscy)
+        """
+        rows = self._get_rows(indices)
+        x = self.x[rows]
+        m = len(x)
+        if m == 0:
+            return
+        y = self.y[rows]
+        width = self.width[rows]
+        height = self.height[rows]
+        velocity_x = self.velocity_x[rows]
+        velocity_y = self.velocity_y[rows]
+
+        centers_x = x + width // 2
+        centers_y = y + height // 2
+        followers, leaders = self._get_followers(rows)
+
+        # Pościg: przyspieszenie wzdłuż znormalizowanego wektora do celu
+        # Podwładni oddziałów nie liczą pościgu - biorą kierunek przywódcy, który jest liczony
+        # razem z pościgiem, także gdy sam przywódca nie jest aktualizowany w tej klatce
+        if len(followers):
+            pursuers = np.ones(m, dtype=bool)
+            pursuers[followers] = False
+            pursuers = np.flatnonzero(pursuers)
+            pursuer_x = np.concatenate((centers_x[pursuers], self.x[leaders] + self.width[leaders] // 2))
+            pursuer_y = np.concatenate((centers_y[pursuers], self.y[leaders] + self.height[leaders] // 2))
+        else:
+            pursuers = slice(None)
+            pursuer_x = centers_x
+            pursuer_y = centers_y
+        dx = target_x - pursuer_x
+        dy = target_y - pursuer_y
+        distance = np.hypot(dx, dy)
+        scale = np.divide(1.0, distance, out=np.zeros(len(distance)), where=distance > 0)
+        pursuit_x = dx * scale
+        pursuit_y = dy * scale
+        if flow_field is not None:
+            # Kierunek z komórki pola tam, gdzie pole go zna
+            field_x, field_y, valid = flow_field.sample(pursuer_x, pursuer_y)
+            pursuit_x = np.where(valid, field_x, pursuit_x)
+            pursuit_y = np.where(valid, field_y, pursuit_y)
+        direction_x = np.zeros(m)
+        direction_y = np.zeros(m)
+
+        if len(followers):
+            count = len(pursuers)
+            direction_x[pursuers] = pursuit_x[:count]
+            direction_y[pursuers] = pursuit_y[:count]
+            # Szyk: kierunek przywódcy plus poprawka do miejsca w szyku (pełna w odległości formation_radius)
+            leader_x = pursuer_x[count:]
+            leader_y = pursuer_y[count:]
+            member_ids = followers if indices is None else indices[followers]
+            slot_dx = (leader_x + self.formation_x[member_ids] - centers_x[followers]) / formation_radius
+            slot_dy = (leader_y + self.formation_y[member_ids] - centers_y[followers]) / formation_radius
+            steer_x = pursuit_x[count:] + slot_dx
+            steer_y = pursuit_y[count:] + slot_dy
+            length = np.hypot(steer_x, steer_y)
+            scale = np.divide(1.0, length, out=np.zeros(len(length)), where=length > 0)
+            direction_x[followers] = steer_x * scale
+            direction_y[followers] = steer_y * scale
+        else:
+            direction_x[pursuers] = pursuit_x
+            direction_y[pursuers] = pursuit_y
+        acceleration = self.acceleration[rows] * dt
+        velocity_x += direction_x * acceleration
+        velocity_y += direction_y * acceleration
+
+        # Granice świata - wróg na krawędzi traci prędkość w tej osi
+        for position, size, velocity, limit in ((x, width, velocity_x, world_width),
+                                                (y, height, velocity_y, world_height)):
+            low = position < 0
+            high = position + size > limit
+            position[low] = 0
+            position[high] = (limit - size)[high]
+            velocity[low | high] = 0
+
+        # Limit prędkości
+        max_velocity_x = self.max_velocity_x[rows]
+        max_velocity_y = self.max_velocity_y[rows]
+        np.clip(velocity_x, -max_velocity_x, max_velocity_x, out=velocity_x)
+        np.clip(velocity_y, -max_velocity_y, max_velocity_y, out=velocity_y)
+
+        # Całkowanie
+        x += velocity_x * dt
+        y += velocity_y * dt
+
+        # Z indices tablice powyżej są kopiami - zapisz wynik z powrotem
+        if indices is not None:
+            self.x[rows] = x
+            self.y[rows] = y
+            self.velocity_x[rows] = velocity_x
+            self.velocity_y[rows] = velocity_y
+
+    def get_neighbour_pairs(self, radius, indices=None):
+        """
+        Zwraca pary wrogów z sąsiednich komórek siatki o boku radius (wektorowo).
+        Siatka obejmuje tylko prostokąt otaczający aktywnych wrogów (ograniczony aktywnymi
+        kawałkami świata), a zakresy komórek są budowane przez bincount i stabilne sortowanie kluczy,
+        jak w NumpySpatialHash - bez pętli Pythona po wrogach.
+
+        Args:
+            radius: Rozmiar komórki w pikselach (pary dalsze niż radius mogą się pojawić, bliższe - zawsze)
+            indices: Tablica indeksów wrogów, dla których szukać sąsiadów (domyślnie None - wszyscy)
+
+        Returns:
+            Krotka tablic (pozycje wrogów w indices - bez indices to indeksy wrogów, indeksy sąsiadów),
+            bez par wroga z samym sobą
+        """
+        n = self.count
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        if n < 2 or (indices is not None and len(indices) == 0):
+            return empty
+        cell_x = ((self.x[:n] + self.width[:n] * 0.5) // radius).astype(np.int64)
+        cell_y = ((self.y[:n] + self.height[:n] * 0.5) // radius).astype(np.int64)
+        # Margines jednej komórki z każdej strony - sąsiedzi zawsze mieszczą się w tabeli
+        # i przesunięcia nie przechodzą do innego wiersza
+        cell_x -= cell_x.min() - 1
+        cell_y -= cell_y.min() - 1
+        row = int(cell_x.max()) + 2
+        keys = cell_y * row + cell_x
+        cell_counts = np.bincount(keys, minlength=(int(cell_y.max()) + 2) * row)
+        cell_starts = np.cumsum(cell_counts) - cell_counts
+        order = np.argsort(keys, kind='stable')
+
+        # Zapytania tylko dla wybranych wrogów
+        if indices is None:
+            query_keys = keys
+            selves = np.arange(n)
+        else:
+            query_keys = keys[indices]
+            selves = indices
+        positions = np.arange(len(query_keys))
+        firsts = []
+        seconds = []
+        for offset_y in (-1, 0, 1):
+            for offset_x in (-1, 0, 1):
+                neighbour_keys = query_keys + (offset_y * row + offset_x)
+                counts = cell_counts[neighbour_keys]
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                # Rozwiń zakresy komórek w płaskie listy par (jak w NumpySpatialHash.query_batch)
+                run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                firsts.append(np.repeat(positions, counts))
+                seconds.append(order[np.repeat(cell_starts[neighbour_keys], counts) + run_offsets])
+        if not firsts:
+            return empty
+        firsts = np.concatenate(firsts)
+        seconds = np.concatenate(seconds)
+        distinct = selves[firsts] != seconds
+        return firsts[distinct], seconds[distinct]
+
+    def apply_separation(self, dt, radius, strength, cohesion=0.0, indices=None):
+        """
+        Dodaje do prędkości człon rozpychania (separacja) i opcjonalnie spójności stada
+        na podstawie sąsiadów z siatki. Wywołuj przed step(), który ogranicza prędkość.
+
+        Args:
+            dt: Delta czasu od ostatniej klatki lub tablica dt dla każdego liczonego wroga
+            radius: Odległość środków, poniżej której wrogowie się odpychają
+            strength: Maksymalne przyspieszenie odpychania (piksele/s^2) przy zerowej odległości
+            cohesion: Przyspieszenie w kierunku średniej pozycji sąsiadów (piksele/s^2, 0 = wyłączone)
+            indices: Tablica indeksów wrogów, którym zmienić prędkość (domyślnie None - wszystkim);
+                sąsiadami są wszyscy aktywni wrogowie
+        """
+        firsts, seconds = self.get_neighbour_pairs(radius, indices)
+        if len(firsts) == 0:
+            return
+        rows = self._get_rows(indices)
+        m = self.count if indices is None else len(indices)
+        centers_x = self.x[rows] + self.width[rows] * 0.5
+        centers_y = self.y[rows] + self.height[rows] * 0.5
+        dx = centers_x[firsts] - (self.x[seconds] + self.width[seconds] * 0.5)
+        dy = centers_y[firsts] - (self.y[seconds] + self.height[seconds] * 0.5)
+        distance = np.hypot(dx, dy)
+        close = distance < radius
+        firsts = firsts[close]
+        dx = dx[close]
+        dy = dy[close]
+        distance = distance[close]
+
+        # Odpychanie maleje liniowo do zera na granicy promienia; wrogowie w tym samym punkcie się nie odpychają
+        push = np.divide(1.0 - distance / radius, distance, out=np.zeros(len(distance)), where=distance > 0)
+        velocity_x = self.velocity_x[rows]
+        velocity_y = self.velocity_y[rows]
+        velocity_x += np.bincount(firsts, weights=dx * push, minlength=m) * (strength * dt)
+        velocity_y += np.bincount(firsts, weights=dy * push, minlength=m) * (strength * dt)
+
+        if cohesion:
+            neighbours = np.bincount(firsts, minlength=m)
+            has_neighbours = neighbours > 0
+            # Średnie przesunięcie do sąsiadów (dx wskazuje od sąsiada, więc znak jest odwrócony)
+            offset_x = -np.bincount(firsts, weights=dx, minlength=m)
+            offset_y = -np.bincount(firsts, weights=dy, minlength=m)
+            scale = np.divide(cohesion * dt, neighbours * radius, out=np.zeros(m), where=has_neighbours)
+            velocity_x += offset_x * scale
+            velocity_y += offset_y * scale
+
+        # Z indices tablice powyżej są kopiami - zapisz wynik z powrotem
+        if indices is not None:
+            self.velocity_x[rows] = velocity_x
+            self.velocity_y[rows] = velocity_y
+
+    def sync_rects(self, indices=None):
+        """
+        Przepisuje pozycje z tablic do rect widoków Enemy (dla rysowania i siatki).
+
+        Args:
+            indices: Tablica indeksów wrogów do przepisania (np. aktualizowanych w tej klatce) lub None dla wszystkich
+        """
+        n = self.count
+        if indices is None:
+            xs = self.x[:n].astype(np.int64).tolist()
+            ys = self.y[:n].astype(np.int64).tolist()
+            for enemy, x, y in zip(self.enemies, xs, ys):
+                enemy.rect.topleft = (x, y)
+            return
+        enemies = self.enemies
+        xs = self.x[indices].astype(np.int64).tolist()
+        ys = self.y[indices].astype(np.int64).tolist()
+        for index, x, y in zip(indices.tolist(), xs, ys):
+            enemies[index].rect.topleft = (x, y)
+
+    def get_rects(self):
+        """
+        Zwraca prostokąty aktywnych wrogów jako tablicę (N, 4) z x, y, szerokością, wysokością
+        (np. dla NumpySpatialHash.rebuild_from_rects). Pozycje są obcięte do pikseli jak w sync_rects.
+        """
+        n = self.count
+        return np.column_stack((np.trunc(self.x[:n]), np.trunc(self.y[:n]), self.width[:n], self.height[:n]))
@@ -1,6 +1,7 @@
 import pygame
 import os
 from abc import ABC, abstractmethod
+from src.asset_cache import load_image
 
 
 class Entity(ABC):
@@ -9,7 +10,7 @@ class Entity(ABC):
     Zawiera wspólne właściwości i metody dla zarządzania pozycją, prędkością i rysowaniem.
     """
 
-    def __init__(self, x, y, image_path, max_velocity_x=100, max_velocity_y=100, acceleration=45):
+    def __init__(self, x, y, image_path, max_velocity_x=100, max_velocity_y=100, acceleration=45, image=None):
         """
         Inicjalizuje Entity.
 
@@ -20,8 +21,10 @@ class Entity(ABC):
             max_velocity_x: Maksymalna prędkość na osi X
             max_velocity_y: Maksymalna prędkość na osi Y
             acceleration: Przyspieszenie
+            image: Gotowy obraz (np. przeskalowany) - wtedy image_path nie jest wczytywany (opcjonalnie)
         """
-        self.image = pygame.image.load(image_path)
+        # Obraz współdzielony przez wszystkie byty (tylko do odczytu)
+        self.image = image if image is not None else load_image(image_path)
         self.width = self.image.get_width()
         self.height = self.image.get_height()
         self.rect = self.image.get_rect()
@@ -75,12 +78,14 @@ class Entity(ABC):
         """
         pass
 
-    def draw(self, surface):
+    def draw(self, surface, offset_x=0, offset_y=0):
         """
         Rysuje Entity na powierzchni.
 
         Args:
             surface: Powierzchnia pygame do rysowania
+            offset_x: Przesunięcie X odejmowane od pozycji (np. kamera)
+            offset_y: Przesunięcie Y odejmowane od pozycji (np. kamera)
         """
-        surface.blit(self.image, self.rect.topleft)
+        surface.blit(self.image, (self.rect.x - offset_x, self.rect.y - offset_y))
 
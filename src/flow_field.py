@@ -0,0 +1,201 @@
+"""
+Flow Field - pole kierunków do gracza wspólne dla wszystkich wrogów.
+Pole jest liczone raz na kilka klatek na zgrubnej siatce pokrywającej aktywny obszar świata,
+a wróg tylko odczytuje kierunek ze swojej komórki (jedno indeksowanie tablicy).
+Bez przeszkód pole wskazuje prosto do celu; komórki zablokowane przez przeszkody
+są omijane - odległości są liczone po siatce, a kierunek to spadek odległości.
+"""
+import math
+import numpy as np
+
+
+# Sąsiedzi komórki: (przesunięcie y, przesunięcie x, koszt przejścia w komórkach)
+_NEIGHBOURS = (
+    (-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+    (-1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (1, 1, math.sqrt(2)),
+)
+
+
+def _shift(array, offset_y, offset_x, fill):
+    """
+    Zwraca kopię tablicy 2D, w której element [y, x] pochodzi z [y + offset_y, x + offset_x].
+
+    Args:
+        array: Tablica 2D
+        offset_y: Przesunięcie w wierszach (-1, 0, 1)
+        offset_x: Przesunięcie w kolumnach (-1, 0, 1)
+        fill: Wartość dla elementów spoza tablicy
+
+    Returns:
+        Przesunięta tablica
+    """
+    result = np.full_like(array, fill)
+    height, width = array.shape
+    result[max(0, -offset_y):height - max(0, offset_y), max(0, -offset_x):width - max(0, offset_x)] = \
+        array[max(0, offset_y):height - max(0, -offset_y), max(0, offset_x):width - max(0, -offset_x)]
+    return result
+
+
+class FlowField:
+    """
+    Pole przepływu na siatce komórek o boku cell_size w pikselach świata.
+    """
+
+    def __init__(self, cell_size=64, update_interval=4):
+        """
+        Inicjalizuje FlowField.
+
+        Args:
+            cell_size: Bok komórki pola w pikselach (domyślnie 64)
+            update_interval: Co ile wywołań update() przeliczać pole (domyślnie 4)
+        """
+        self.cell_size = cell_size
+        self.update_interval = update_interval
+        self.frames_since_update = update_interval
+
+        # Zablokowane komórki (przeszkody) - zbiór (cell_x, cell_y) we współrzędnych świata
+        self.blocked_cells = set()
+
+        # Okno pola: komórka lewego górnego rogu i wymiary w komórkach
+        self.origin_x = 0
+        self.origin_y = 0
+        self.width = 0
+        self.height = 0
+        self.area = None
+        # Komórka celu we współrzędnych okna
+        self.goal_x = 0
+        self.goal_y = 0
+
+        # Znormalizowane kierunki [y, x] i maska komórek z poprawnym kierunkiem
+        self.direction_x = np.zeros((0, 0))
+        self.direction_y = np.zeros((0, 0))
+        self.valid = np.zeros((0, 0), dtype=bool)
+
+    def add_obstacle(self, rect):
+        """
+        Blokuje komórki pokrywane przez prostokąt.
+
+        Args:
+            rect: pygame.Rect przeszkody w pikselach świata
+        """
+        cell_size = self.cell_size
+        for cell_x in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+            for cell_y in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                self.blocked_cells.add((cell_x, cell_y))
+        # Przelicz pole przy najbliższym update()
+        self.frames_since_update = self.update_interval
+
+    def clear_obstacles(self):
+        """Usuwa wszystkie przeszkody."""
+        self.blocked_cells.clear()
+        self.frames_since_update = self.update_interval
+
+    def update(self, target_x, target_y, area):
+        """
+        Zlicza klatkę i co update_interval klatek (lub po zmianie obszaru) przelicza pole.
+
+        Args:
+            target_x: Pozycja X celu (środek gracza)
+            target_y: Pozycja Y celu (środek gracza)
+            area: pygame.Rect obszaru pokrywanego przez pole (np. aktywne kawałki świata)
+
+        Returns:
+            True jeśli pole zostało przeliczone
+        """
+        self.frames_since_update += 1
+        if self.frames_since_update < self.update_interval and area == self.area:
+            return False
+        self.frames_since_update = 0
+        self.area = area.copy()
+        self._compute(target_x, target_y, area)
+        return True
+
+    def _compute(self, target_x, target_y, area):
+        """Przelicza kierunki dla wszystkich komórek okna."""
+        cell_size = self.cell_size
+        self.origin_x = area.left // cell_size
+        self.origin_y = area.top // cell_size
+        self.width = max(1, (area.right - 1) // cell_size - self.origin_x + 1)
+        self.height = max(1, (area.bottom - 1) // cell_size - self.origin_y + 1)
+        self.goal_x = max(0, min(int(target_x // cell_size) - self.origin_x, self.width - 1))
+        self.goal_y = max(0, min(int(target_y // cell_size) - self.origin_y, self.height - 1))
+
+        blocked = np.zeros((self.height, self.width), dtype=bool)
+        for cell_x, cell_y in self.blocked_cells:
+            local_x = cell_x - self.origin_x
+            local_y = cell_y - self.origin_y
+            if 0 <= local_x < self.width and 0 <= local_y < self.height:
+                blocked[local_y, local_x] = True
+
+        if not blocked.any():
+            # Bez przeszkód spadek odległości wskazuje prosto do celu
+            centers_x = (np.arange(self.width) + self.origin_x + 0.5) * cell_size
+            centers_y = (np.arange(self.height) + self.origin_y + 0.5) * cell_size
+            gradient_x = np.broadcast_to(target_x - centers_x[None, :], (self.height, self.width))
+            gradient_y = np.broadcast_to(target_y - centers_y[:, None], (self.height, self.width))
+        else:
+            distance = self._get_distances(blocked)
+            # Przeszkody i komórki nieosiągalne dostają wysoki potencjał, więc spadek od nich odpycha
+            reachable = np.isfinite(distance)
+            ceiling = (distance[reachable].max() if reachable.any() else 0.0) + 2.0
+            distance[~reachable] = ceiling
+            if self.height > 1 and self.width > 1:
+                gradient_y, gradient_x = np.gradient(-distance)
+            else:
+                gradient_x = np.zeros_like(distance)
+                gradient_y = np.zeros_like(distance)
+
+        length = np.hypot(gradient_x, gradient_y)
+        self.valid = length > 0
+        if blocked.any():
+            self.valid &= ~blocked
+        self.direction_x = np.divide(gradient_x, length, out=np.zeros(length.shape), where=self.valid)
+        self.direction_y = np.divide(gradient_y, length, out=np.zeros(length.shape), where=self.valid)
+
+    def _get_distances(self, blocked):
+        """
+        Liczy odległości komórek od celu po siatce (8 sąsiadów) wektorowymi relaksacjami.
+
+        Args:
+            blocked: Maska zablokowanych komórek [y, x]
+
+        Returns:
+            Tablica odległości w komórkach (inf dla zablokowanych i nieosiągalnych)
+        """
+        distance = np.full((self.height, self.width), np.inf)
+        distance[self.goal_y, self.goal_x] = 0.0
+        # Każda relaksacja przesuwa front o jedną komórkę - najdłuższa ścieżka ma najwyżej tyle komórek
+        for _ in range(self.width * self.height):
+            relaxed = distance.copy()
+            for offset_y, offset_x, cost in _NEIGHBOURS:
+                np.minimum(relaxed, _shift(distance, offset_y, offset_x, np.inf) + cost, out=relaxed)
+            relaxed[blocked] = np.inf
+            if np.array_equal(relaxed, distance):
+                break
+            distance = relaxed
+        return distance
+
+    def sample(self, xs, ys):
+        """
+        Odczytuje kierunki pola dla tablic pozycji.
+
+        Args:
+            xs: Tablica współrzędnych X (np. środki wrogów)
+            ys: Tablica współrzędnych Y
+
+        Returns:
+            Krotka tablic (kierunek X, kierunek Y, maska poprawnych kierunków).
+            Pozycje poza oknem, w zablokowanych komórkach i w sąsiedztwie celu
+            (gdzie zgrubna komórka jest zbyt niedokładna) mają maskę False.
+        """
+        cell_x = (xs // self.cell_size).astype(np.int64) - self.origin_x
+        cell_y = (ys // self.cell_size).astype(np.int64) - self.origin_y
+        inside = (cell_x >= 0) & (cell_x < self.width) & (cell_y >= 0) & (cell_y < self.height)
+        near_goal = (np.abs(cell_x - self.goal_x) <= 1) & (np.abs(cell_y - self.goal_y) <= 1)
+        cell_x = np.where(inside, cell_x, 0)
+        cell_y = np.where(inside, cell_y, 0)
+        if self.width == 0 or self.height == 0:
+            zeros = np.zeros(len(xs))
+            return zeros, zeros, np.zeros(len(xs), dtype=bool)
+        valid = inside & ~near_goal & self.valid[cell_y, cell_x]
+        return self.direction_x[cell_y, cell_x], self.direction_y[cell_y, cell_x], valid
@@ -1,5 +1,7 @@
 import pygame
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, BLUE
+from src import settings
+from src.settings import WHITE, BLACK, BLUE
+from src.asset_cache import get_font
 
 
 class GameOverScreen:
@@ -25,10 +27,10 @@ class GameOverScreen:
         self.is_active = True
 
         # Czcionki
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 28)
+        self.font_title = get_font(None, 72)
+        self.font_large = get_font(None, 48)
+        self.font_medium = get_font(None, 36)
+        self.font_small = get_font(None, 28)
 
         # Przyciski
         self.buttons = []
@@ -38,12 +40,12 @@ class GameOverScreen:
         """Tworzy przyciski na ekranie."""
         button_width = 300
         button_height = 60
-        button_y = SCREEN_HEIGHT - 150
+        button_y = settings.SCREEN_HEIGHT - 150
 
         # Przycisk "Dodaj do listy życzeń Steam"
         wishlist_button = {
             'rect': pygame.Rect(
-                SCREEN_WIDTH // 2 - button_width // 2,
+                settings.SCREEN_WIDTH // 2 - button_width // 2,
                 button_y,
                 button_width,
                 button_height
@@ -57,7 +59,7 @@ class GameOverScreen:
         # Przycisk "Wyjdź"
         exit_button = {
             'rect': pygame.Rect(
-                SCREEN_WIDTH // 2 - button_width // 2,
+                settings.SCREEN_WIDTH // 2 - button_width // 2,
                 button_y + 80,
                 button_width,
                 button_height
@@ -106,7 +108,7 @@ class GameOverScreen:
         # Tytuł
         title_text = self.font_title.render("DEMO SKOŃCZONE!", True, (255, 215, 0))
         title_rect = title_text.get_rect()
-        title_rect.centerx = SCREEN_WIDTH // 2
+        title_rect.centerx = settings.SCREEN_WIDTH // 2
         title_rect.top = 40
         screen.blit(title_text, title_rect)
 
@@ -122,7 +124,7 @@ class GameOverScreen:
         for stat in stats:
             stat_text = self.font_medium.render(stat, True, WHITE)
             stat_rect = stat_text.get_rect()
-            stat_rect.centerx = SCREEN_WIDTH // 2
+            stat_rect.centerx = settings.SCREEN_WIDTH // 2
             stat_rect.top = stats_y
             screen.blit(stat_text, stat_rect)
             stats_y += 60
@@ -135,7 +137,7 @@ class GameOverScreen:
             (200, 200, 200)
         )
         message_rect = message_text.get_rect()
-        message_rect.centerx = SCREEN_WIDTH // 2
+        message_rect.centerx = settings.SCREEN_WIDTH // 2
         message_rect.top = message_y
         screen.blit(message_text, message_rect)
 
@@ -1,7 +1,9 @@
 import pygame
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, BLUE
+from src import settings
+from src.settings import WHITE, BLACK, BLUE
 from src.upgrade import UpgradeType
 from src.passive_upgrades import PassiveUpgradeType
+from src.asset_cache import get_font
 
 
 class LevelUpScreen:
@@ -24,10 +26,10 @@ class LevelUpScreen:
         self.is_active = True
 
         # Ustawienia UI
-        self.font_title = pygame.font.Font(None, 72)
-        self.font_level = pygame.font.Font(None, 48)
-        self.font_upgrade = pygame.font.Font(None, 36)
-        self.font_description = pygame.font.Font(None, 24)
+        self.font_title = get_font(None, 72)
+        self.font_level = get_font(None, 48)
+        self.font_upgrade = get_font(None, 36)
+        self.font_description = get_font(None, 24)
 
         # Kolory
         self.color_bg = (20, 20, 40)  # Ciemny niebieski
@@ -42,8 +44,8 @@ class LevelUpScreen:
         self.button_height = 150
         self.button_spacing = 50
         self.total_width = 3 * self.button_width + 2 * self.button_spacing
-        self.start_x = (SCREEN_WIDTH - self.total_width) // 2
-        self.start_y = SCREEN_HEIGHT // 2 + 50
+        self.start_x = (settings.SCREEN_WIDTH - self.total_width) // 2
+        self.start_y = settings.SCREEN_HEIGHT // 2 + 50
 
         self.buttons = []
         self._create_buttons()
@@ -96,19 +98,19 @@ class LevelUpScreen:
             surface: Powierzchnia pygame do rysowania
         """
         # Rysuj półprzezroczysty overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        overlay = pygame.Surface((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
         overlay.set_alpha(180)
         overlay.fill(self.color_bg)
         surface.blit(overlay, (0, 0))
 
         # Rysuj tytuł "LEVEL UP"
         title_text = self.font_title.render("LEVEL UP!", True, self.color_highlight)
-        title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
+        title_rect = title_text.get_rect(center=(settings.SCREEN_WIDTH // 2, 100))
         surface.blit(title_text, title_rect)
 
         # Rysuj numer poziomu
         level_text = self.font_level.render(f"Poziom {self.level}", True, self.color_text)
-        level_rect = level_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
+        level_rect = level_text.get_rect(center=(settings.SCREEN_WIDTH // 2, 200))
         surface.blit(level_text, level_rect)
 
         # Rysuj instrukcję
@@ -117,7 +119,7 @@ class LevelUpScreen:
             True,
             self.color_text
         )
-        instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH // 2, 280))
+        instruction_rect = instruction_text.get_rect(center=(settings.SCREEN_WIDTH // 2, 280))
         surface.blit(instruction_text, instruction_rect)
 
         # Rysuj przyciski ulepszeń
@@ -0,0 +1,65 @@
+import pygame
+from src import settings
+from src.settings import WHITE, BLACK
+from src.asset_cache import get_font
+
+
+class LoadingScreen:
+    """
+    Lekki ekran ładowania wyświetlany podczas wczytywania zasobów w tle.
+    Pokazuje pasek postępu i nazwę ostatnio wczytanego zasobu.
+    """
+
+    def __init__(self):
+        """Inicjalizuje LoadingScreen."""
+        self.font = get_font(None, 36)
+        self.font_small = get_font(None, 24)
+        self.bar_width = 400
+        self.bar_height = 20
+        self.color_bar = (100, 150, 255)
+        self.color_bar_bg = (50, 50, 50)
+        self.current_asset = ""
+
+    def on_progress(self, loaded, total, asset_name, seconds):
+        """
+        Callback postępu dla AssetPreloader - zapamiętuje ostatnio wczytany zasób.
+
+        Args:
+            loaded: Liczba wczytanych zasobów
+            total: Liczba wszystkich zasobów
+            asset_name: Nazwa wczytanego zasobu
+            seconds: Czas dekodowania zasobu w sekundach
+        """
+        self.current_asset = asset_name
+
+    def draw(self, screen, progress):
+        """
+        Rysuje ekran ładowania.
+
+        Args:
+            screen: Powierzchnia pygame do rysowania
+            progress: Postęp wczytywania (0.0 - 1.0)
+        """
+        screen.fill(BLACK)
+
+        center_x = settings.SCREEN_WIDTH // 2
+        center_y = settings.SCREEN_HEIGHT // 2
+
+        # Tytuł
+        title_text = self.font.render("Ładowanie...", True, WHITE)
+        title_rect = title_text.get_rect(center=(center_x, center_y - 40))
+        screen.blit(title_text, title_rect)
+
+        # Pasek postępu
+        bg_rect = pygame.Rect(0, 0, self.bar_width, self.bar_height)
+        bg_rect.center = (center_x, center_y)
+        pygame.draw.rect(screen, self.color_bar_bg, bg_rect)
+        bar_rect = pygame.Rect(bg_rect.left, bg_rect.top, int(self.bar_width * min(1.0, progress)), self.bar_height)
+        pygame.draw.rect(screen, self.color_bar, bar_rect)
+        pygame.draw.rect(screen, WHITE, bg_rect, 2)
+
+        # Ostatnio wczytany zasób
+        if self.current_asset:
+            asset_text = self.font_small.render(self.current_asset, True, (200, 200, 200))
+            asset_rect = asset_text.get_rect(center=(center_x, center_y + 40))
+            screen.blit(asset_text, asset_rect)
@@ -0,0 +1,536 @@
+"""
+NumPy Spatial Hash - wariant SpatialGrid dla tysięcy obiektów.
+Klucze komórek są trzymane w tablicach NumPy, zakresy komórek są budowane raz na klatkę
+(bincount + stabilne sortowanie kluczy, bez pętli Pythona po obiektach), a zapytania dla wielu obiektów naraz (np. "kandydaci
+dla wszystkich N pocisków") są wykonywane jednym wektorowym wywołaniem.
+API słownika list (grid, get_nearby_objects, add_object...) działa jako warstwa zgodności.
+"""
+import numpy as np
+from src.utils import get_swept_bounds, get_swept_hits
+
+
+class NumpySpatialHash:
+    """
+    Hash przestrzenny oparty na tablicach NumPy.
+    Obiekty są rejestrowane jak w SpatialGrid, ale indeks jest przebudowywany
+    w całości (build()) przy pierwszym zapytaniu po zmianie pozycji.
+    Usunięcie obiektu nie wymaga przebudowy - zostawia w indeksie dziurę pomijaną przez zapytania.
+    """
+
+    def __init__(self, screen_width, screen_height, cell_size=100):
+        """
+        Inicjalizuje NumpySpatialHash.
+
+        Args:
+            screen_width: Szerokość ekranu
+            screen_height: Wysokość ekranu
+            cell_size: Rozmiar komórki siatki (domyślnie 100)
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.cell_size = cell_size
+
+        # Oblicz wymiary siatki
+        self.grid_width = (screen_width // cell_size) + 1
+        self.grid_height = (screen_height // cell_size) + 1
+        self.cell_count = self.grid_width * self.grid_height
+
+        self.clear()
+
+    def clear(self):
+        """Czyści wszystkie obiekty i indeks."""
+        # Lista obiektów - usunięte od ostatniego build() są zastąpione przez None
+        self.objects = []
+        # Słownik: id(obj) -> indeks w self.objects
+        self.object_indices = {}
+        self.removed_count = 0
+
+        # Tablice indeksu (wypełniane przez build())
+        self.rects = np.zeros((0, 4), dtype=np.float64)  # x, y, szerokość, wysokość
+        self.cell_keys = np.zeros(0, dtype=np.int64)
+        self.sorted_indices = np.zeros(0, dtype=np.int64)
+        self.cell_starts = np.zeros(self.cell_count, dtype=np.int64)
+        self.cell_counts = np.zeros(self.cell_count, dtype=np.int64)
+        # Obiekty indeksu, które nie zostały usunięte po build()
+        self.alive = np.zeros(0, dtype=bool)
+        # Największy bok obiektu w indeksie - obiekty są w komórkach swoich środków,
+        # więc zapytania sięgają tyle komórek dalej, by znaleźć duże obiekty
+        self.max_object_size = 0
+        self.dirty = True
+
+    # ------------------------------------------------------------------
+    # Rejestracja obiektów (zgodna z SpatialGrid)
+    # ------------------------------------------------------------------
+
+    def add_object(self, obj):
+        """
+        Dodaje obiekt do hasha.
+
+        Args:
+            obj: Obiekt z atrybutem rect (pygame.Rect)
+        """
+        obj_id = id(obj)
+        if obj_id in self.object_indices:
+            return
+        self.object_indices[obj_id] = len(self.objects)
+        self.objects.append(obj)
+        self.dirty = True
+
+    def update_object(self, obj):
+        """
+        Oznacza indeks do przebudowy (pozycje są czytane w build()).
+
+        Args:
+            obj: Obiekt z atrybutem rect (pygame.Rect)
+        """
+        if id(obj) not in self.object_indices:
+            self.add_object(obj)
+            return
+        self.dirty = True
+
+    def remove_object(self, obj):
+        """
+        Usuwa obiekt z hasha w O(1) bez przebudowy indeksu (np. wroga zabitego w pętli pocisków).
+        Miejsce obiektu zostaje puste do najbliższego build().
+
+        Args:
+            obj: Obiekt do usunięcia
+        """
+        index = self.object_indices.pop(id(obj), None)
+        if index is None:
+            return
+        self.objects[index] = None
+        self.removed_count += 1
+        if index < len(self.alive):
+            self.alive[index] = False
+
+    def rebuild(self, objects):
+        """
+        Zastępuje wszystkie obiekty nową listą i przebudowuje indeks.
+
+        Args:
+            objects: Lista wszystkich obiektów
+        """
+        self.clear()
+        for obj in objects:
+            self.add_object(obj)
+        self.build()
+
+    def get_object_count(self):
+        """Zwraca liczbę obiektów w hashu."""
+        return len(self.object_indices)
+
+    def get_stats(self):
+        """Zwraca statystyki do diagnostyki (dla zgodności z SpatialGrid)."""
+        return {'cell_size': self.cell_size, 'objects': len(self.object_indices)}
+
+    def maybe_retune(self):
+        """Rozmiar komórki hasha jest stały - dla zgodności z SpatialGrid."""
+        return False
+
+    # ------------------------------------------------------------------
+    # Budowanie indeksu
+    # ------------------------------------------------------------------
+
+    def _get_cell_keys(self, centers_x, centers_y):
+        """
+        Oblicza klucze komórek dla tablic środków (z ograniczeniem do siatki).
+
+        Args:
+            centers_x: Tablica współrzędnych X
+            centers_y: Tablica współrzędnych Y
+
+        Returns:
+            Krotka tablic (cell_x, cell_y, klucz)
+        """
+        cell_x = np.clip((centers_x // self.cell_size).astype(np.int64), 0, self.grid_width - 1)
+        cell_y = np.clip((centers_y // self.cell_size).astype(np.int64), 0, self.grid_height - 1)
+        return cell_x, cell_y, cell_y * self.grid_width + cell_x
+
+    def _compact_objects(self):
+        """Usuwa z listy obiektów miejsca po usuniętych obiektach i przenumerowuje indeksy."""
+        self.objects = [obj for obj in self.objects if obj is not None]
+        self.object_indices = {id(obj): index for index, obj in enumerate(self.objects)}
+        self.removed_count = 0
+
+    def rebuild_from_rects(self, objects, rects):
+        """
+        Zastępuje obiekty listą i przebudowuje indeks z gotowej tablicy prostokątów
+        (np. EnemyStore.enemies i EnemyStore.get_rects()), bez czytania obj.rect po kolei.
+
+        Args:
+            objects: Lista wszystkich obiektów
+            rects: Tablica (N, 4) z x, y, szerokością, wysokością w kolejności objects
+        """
+        self.objects = list(objects)
+        self.object_indices = {id(obj): index for index, obj in enumerate(self.objects)}
+        self.removed_count = 0
+        self.build(rects)
+
+    def build(self, rects=None):
+        """
+        Przebudowuje indeks: klucze komórek i zakresy komórek (wektorowo).
+
+        Args:
+            rects: Opcjonalna tablica (N, 4) z x, y, szerokością, wysokością obiektów
+                (np. ze struktury tablic, w kolejności self.objects); domyślnie czytana z obj.rect
+        """
+        if self.removed_count:
+            self._compact_objects()
+        if rects is None:
+            rects = np.array([obj.rect[:] for obj in self.objects], dtype=np.float64).reshape(-1, 4)
+        self.rects = rects
+
+        centers_x = rects[:, 0] + rects[:, 2] * 0.5
+        centers_y = rects[:, 1] + rects[:, 3] * 0.5
+        _, _, self.cell_keys = self._get_cell_keys(centers_x, centers_y)
+
+        # Liczności komórek -> początki zakresów; stabilne sortowanie kluczy układa obiekty
+        # każdej komórki w jej zakresie (jak w EnemyStore.get_neighbour_pairs)
+        self.cell_counts = np.bincount(self.cell_keys, minlength=self.cell_count)
+        self.cell_starts = np.cumsum(self.cell_counts) - self.cell_counts
+        self.sorted_indices = np.argsort(self.cell_keys, kind='stable')
+
+        self.alive = np.ones(len(rects), dtype=bool)
+        self.max_object_size = int(rects[:, 2:].max()) if len(rects) else 0
+        self.dirty = False
+
+    def _ensure_built(self):
+        """Przebudowuje indeks, jeśli obiekty zmieniły się od ostatniego build()."""
+        if self.dirty:
+            self.build()
+
+    def _get_search_radius(self, radius, query_size):
+        """
+        Zwraca promień wyszukiwania w komórkach, który obejmuje wszystkie obiekty mogące
+        nachodzić na zapytanie - także większe od komórki.
+
+        Args:
+            radius: Promień zamówiony przez wywołującego
+            query_size: Największy bok prostokąta zapytania
+
+        Returns:
+            Promień nie mniejszy niż radius
+        """
+        reach = int((self.max_object_size + query_size) / 2 // self.cell_size) + 1
+        return max(radius, reach)
+
+    # ------------------------------------------------------------------
+    # Zapytania wsadowe
+    # ------------------------------------------------------------------
+
+    def query_batch(self, query_rects, radius=1, exact=False):
+        """
+        Zwraca pary kandydatów dla wielu zapytań jednym wektorowym wywołaniem.
+
+        Args:
+            query_rects: Tablica (N, 4) z x, y, szerokością, wysokością obiektów zapytania
+            radius: Promień wyszukiwania w komórkach wokół komórki środka (domyślnie 1;
+                zwiększany, gdy obiekty lub zapytania są większe od komórki)
+            exact: Czy odfiltrować pary, których prostokąty się nie nakładają
+
+        Returns:
+            Krotka tablic (indeksy zapytań, indeksy obiektów w self.objects)
+        """
+        self._ensure_built()
+        query_rects = np.asarray(query_rects, dtype=np.float64).reshape(-1, 4)
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        if len(query_rects) == 0 or len(self.objects) == 0:
+            return empty
+
+        radius = self._get_search_radius(radius, query_rects[:, 2:].max())
+        centers_x = query_rects[:, 0] + query_rects[:, 2] * 0.5
+        centers_y = query_rects[:, 1] + query_rects[:, 3] * 0.5
+        cell_x = (centers_x // self.cell_size).astype(np.int64)
+        cell_y = (centers_y // self.cell_size).astype(np.int64)
+
+        # Wszystkie (zapytanie, komórka sąsiednia) naraz
+        offsets = np.arange(-radius, radius + 1)
+        offset_x, offset_y = np.meshgrid(offsets, offsets)
+        neighbour_x = (cell_x[:, None] + offset_x.ravel()[None, :]).ravel()
+        neighbour_y = (cell_y[:, None] + offset_y.ravel()[None, :]).ravel()
+        query_ids = np.repeat(np.arange(len(query_rects)), offset_x.size)
+
+        valid = (
+            (neighbour_x >= 0) & (neighbour_x < self.grid_width)
+            & (neighbour_y >= 0) & (neighbour_y < self.grid_height)
+        )
+        keys = neighbour_y[valid] * self.grid_width + neighbour_x[valid]
+        query_ids = query_ids[valid]
+
+        counts = self.cell_counts[keys]
+        total = int(counts.sum())
+        if total == 0:
+            return empty
+
+        # Rozwiń zakresy komórek w płaskie listy par (bez pętli Pythona)
+        pair_queries = np.repeat(query_ids, counts)
+        range_starts = np.repeat(self.cell_starts[keys], counts)
+        run_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_objects = self.sorted_indices[range_starts + run_offsets]
+
+        # Pomiń obiekty usunięte po build()
+        if self.removed_count:
+            alive = self.alive[pair_objects]
+            pair_queries = pair_queries[alive]
+            pair_objects = pair_objects[alive]
+
+        if exact:
+            # take() zbiera wiersze wyraźnie szybciej niż indeksowanie tablicą
+            a = query_rects.take(pair_queries, axis=0)
+            b = self.rects.take(pair_objects, axis=0)
+            overlap = (
+                (a[:, 0] < b[:, 0] + b[:, 2]) & (b[:, 0] < a[:, 0] + a[:, 2])
+                & (a[:, 1] < b[:, 1] + b[:, 3]) & (b[:, 1] < a[:, 1] + a[:, 3])
+            )
+            pair_queries = pair_queries[overlap]
+            pair_objects = pair_objects[overlap]
+
+        return pair_queries, pair_objects
+
+    def query_batch_objects(self, query_objects, radius=1, exact=False):
+        """
+        Zwraca listy kandydatów dla listy obiektów zapytania (np. wszystkich pocisków).
+
+        Args:
+            query_objects: Lista obiektów z atrybutem rect
+            radius: Promień wyszukiwania w komórkach (domyślnie 1)
+            exact: Czy zostawić tylko obiekty, których prostokąty się nakładają
+
+        Returns:
+            Lista list kandydatów, w kolejności query_objects
+        """
+        query_rects = np.array([obj.rect[:] for obj in query_objects], dtype=np.float64).reshape(-1, 4)
+        pair_queries, pair_objects = self.query_batch(query_rects, radius=radius, exact=exact)
+
+        result = [[] for _ in query_objects]
+        objects = self.objects
+        for query_index, object_index in zip(pair_queries.tolist(), pair_objects.tolist()):
+            result[query_index].append(objects[object_index])
+        return result
+
+    # ------------------------------------------------------------------
+    # Zapytania o najbliższych sąsiadów
+    # ------------------------------------------------------------------
+
+    def _get_indices_by_distance(self, x, y, max_distance=None):
+        """
+        Zwraca indeksy obiektów posortowane po odległości środka od punktu (wektorowo).
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            max_distance: Maksymalna odległość w pikselach (None = bez limitu)
+
+        Returns:
+            Lista indeksów w self.objects, od najbliższego
+        """
+        self._ensure_built()
+        rects = self.rects
+        dx = rects[:, 0] + rects[:, 2] * 0.5 - x
+        dy = rects[:, 1] + rects[:, 3] * 0.5 - y
+        distances_sq = dx * dx + dy * dy
+        within = self.alive.copy()
+        if max_distance is not None:
+            within &= distances_sq <= max_distance * max_distance
+        indices = np.flatnonzero(within)
+        return indices[np.argsort(distances_sq[indices], kind='stable')].tolist()
+
+    def get_k_nearest(self, x, y, k, max_distance=None, predicate=None):
+        """
+        Zwraca k obiektów najbliższych punktowi (według środków), od najbliższego
+        (zgodne z SpatialGrid.get_k_nearest).
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            k: Liczba szukanych obiektów
+            max_distance: Maksymalna odległość w pikselach (None = bez limitu)
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista co najwyżej k obiektów posortowana rosnąco po odległości
+        """
+        result = []
+        if k <= 0:
+            return result
+        for index in self._get_indices_by_distance(x, y, max_distance):
+            obj = self.objects[index]
+            if predicate is None or predicate(obj):
+                result.append(obj)
+                if len(result) >= k:
+                    break
+        return result
+
+    def get_nearest(self, x, y, max_distance=None, predicate=None):
+        """Zwraca obiekt najbliższy punktowi lub None (zgodne z SpatialGrid.get_nearest)."""
+        nearest = self.get_k_nearest(x, y, 1, max_distance=max_distance, predicate=predicate)
+        return nearest[0] if nearest else None
+
+    def get_within_radius(self, x, y, radius, predicate=None):
+        """
+        Zwraca obiekty, których środki leżą w promieniu od punktu, od najbliższego
+        (zgodne z SpatialGrid.get_within_radius).
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            radius: Promień w pikselach
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista obiektów posortowana rosnąco po odległości
+        """
+        # Najpierw indeksy - przebudowa w _get_indices_by_distance zmienia self.objects
+        indices = self._get_indices_by_distance(x, y, radius)
+        objects = self.objects
+        return [objects[index] for index in indices if predicate is None or predicate(objects[index])]
+
+    # ------------------------------------------------------------------
+    # Warstwa zgodności z SpatialGrid
+    # ------------------------------------------------------------------
+
+    def _get_cell_objects(self, key):
+        """Zwraca listę obiektów w komórce o danym kluczu."""
+        start = self.cell_starts[key]
+        indices = self.sorted_indices[start:start + self.cell_counts[key]]
+        objects = self.objects
+        return [objects[index] for index in indices.tolist() if objects[index] is not None]
+
+    @property
+    def grid(self):
+        """
+        Słownik (cell_x, cell_y) -> lista obiektów, jak w SpatialGrid.
+        Budowany na żądanie - do diagnostyki i starego kodu, nie do gorącej pętli.
+        """
+        self._ensure_built()
+        return {
+            (key % self.grid_width, key // self.grid_width): self._get_cell_objects(key)
+            for key in np.flatnonzero(self.cell_counts).tolist()
+        }
+
+    def get_nearby_objects(self, obj, radius=1):
+        """
+        Zwraca obiekty w pobliżu danego obiektu.
+
+        Args:
+            obj: Obiekt referencyjny
+            radius: Promień wyszukiwania w komórkach (domyślnie 1)
+
+        Returns:
+            Lista pobliskich obiektów
+        """
+        self._ensure_built()
+        radius = self._get_search_radius(radius, max(obj.rect.size))
+        cell_x = int(obj.rect.centerx // self.cell_size)
+        cell_y = int(obj.rect.centery // self.cell_size)
+
+        nearby = []
+        for check_y in range(max(0, cell_y - radius), min(self.grid_height, cell_y + radius + 1)):
+            for check_x in range(max(0, cell_x - radius), min(self.grid_width, cell_x + radius + 1)):
+                key = check_y * self.grid_width + check_x
+                if self.cell_counts[key]:
+                    nearby.extend(self._get_cell_objects(key))
+        return nearby
+
+    def query_nearby(self, obj, out, radius=1, predicate=None, first_hit=False):
+        """
+        Wypełnia listę podaną przez wywołującego obiektami w pobliżu obiektu
+        (dla zgodności z SpatialGrid.query_nearby).
+
+        Args:
+            obj: Obiekt referencyjny
+            out: Lista do wypełnienia (jest najpierw czyszczona)
+            radius: Promień wyszukiwania w komórkach (domyślnie 1)
+            predicate: Funkcja predicate(obj, kandydat) -> bool lub None
+            first_hit: Czy zakończyć po pierwszym pasującym obiekcie
+
+        Returns:
+            Liczba obiektów w out
+        """
+        self._ensure_built()
+        out.clear()
+        radius = self._get_search_radius(radius, max(obj.rect.size))
+        cell_x = int(obj.rect.centerx // self.cell_size)
+        cell_y = int(obj.rect.centery // self.cell_size)
+        objects = self.objects
+        sorted_indices = self.sorted_indices
+        for check_y in range(max(0, cell_y - radius), min(self.grid_height, cell_y + radius + 1)):
+            for check_x in range(max(0, cell_x - radius), min(self.grid_width, cell_x + radius + 1)):
+                key = check_y * self.grid_width + check_x
+                count = int(self.cell_counts[key])
+                if not count:
+                    continue
+                start = int(self.cell_starts[key])
+                for index in sorted_indices[start:start + count].tolist():
+                    other = objects[index]
+                    if other is None:
+                        continue
+                    if predicate is None or predicate(obj, other):
+                        out.append(other)
+                        if first_hit:
+                            return 1
+        return len(out)
+
+    def query_rect(self, rect, margin=0):
+        """
+        Zwraca obiekty z komórek pokrywanych przez prostokąt.
+
+        Args:
+            rect: pygame.Rect obszaru zapytania
+            margin: Dodatkowy margines wokół prostokąta w pikselach (domyślnie 0)
+
+        Returns:
+            Lista obiektów (kandydatów do kolizji)
+        """
+        self._ensure_built()
+        if margin:
+            rect = rect.inflate(2 * margin, 2 * margin)
+        min_x = max(0, min(int(rect.left // self.cell_size), self.grid_width - 1))
+        min_y = max(0, min(int(rect.top // self.cell_size), self.grid_height - 1))
+        max_x = max(min_x, min(int((rect.right - 1) // self.cell_size), self.grid_width - 1))
+        max_y = max(min_y, min(int((rect.bottom - 1) // self.cell_size), self.grid_height - 1))
+
+        result = []
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                key = cell_y * self.grid_width + cell_x
+                if self.cell_counts[key]:
+                    result.extend(self._get_cell_objects(key))
+        return result
+
+    def query_swept(self, rect, dx, dy, predicate=None):
+        """
+        Zwraca obiekty, z którymi zetknie się prostokąt przesuwany o (dx, dy), w kolejności kontaktu
+        (zgodne z SpatialGrid.query_swept).
+
+        Args:
+            rect: pygame.Rect w pozycji początkowej
+            dx: Przesunięcie na osi X
+            dy: Przesunięcie na osi Y
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista obiektów posortowana rosnąco po chwili kontaktu
+        """
+        self._ensure_built()
+        # Obiekty są w komórkach swoich środków - margines obejmuje połowę największego z nich
+        margin = self.max_object_size // 2 + 1
+        candidates = self.query_rect(get_swept_bounds(rect, dx, dy), margin=margin)
+        return get_swept_hits(candidates, rect, dx, dy, predicate)
+
+    def get_objects_in_cell(self, cell_x, cell_y):
+        """
+        Zwraca obiekty w danej komórce.
+
+        Args:
+            cell_x: Współrzędna X komórki
+            cell_y: Współrzędna Y komórki
+
+        Returns:
+            Lista obiektów w komórce
+        """
+        self._ensure_built()
+        if 0 <= cell_x < self.grid_width and 0 <= cell_y < self.grid_height:
+            return self._get_cell_objects(cell_y * self.grid_width + cell_x)
+        return []
@@ -1,5 +1,6 @@
 import pygame
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src import settings
+from src.asset_cache import load_image
 
 
 class ParallaxManager:
@@ -16,15 +17,15 @@ class ParallaxManager:
         Args:
             background_image_path: Ścieżka do obrazu tła
         """
-        # Załaduj oryginalny obraz
-        original_image = pygame.image.load(background_image_path).convert()
+        # Załaduj oryginalny obraz (zdekodowany wcześniej przez preloader, jeśli był uruchomiony)
+        original_image = load_image(background_image_path).convert()
         original_width = original_image.get_width()
         original_height = original_image.get_height()
 
         # Zeskaluj tło, aby pokryć cały ekran
         # Zachowaj proporcje i upewnij się, że pokrywa cały ekran
-        scale_x = SCREEN_WIDTH / original_width
-        scale_y = SCREEN_HEIGHT / original_height
+        scale_x = settings.SCREEN_WIDTH / original_width
+        scale_y = settings.SCREEN_HEIGHT / original_height
         # Użyj większego współczynnika skalowania, aby upewnić się, że pokrywa cały ekran
         scale = max(scale_x, scale_y)
 
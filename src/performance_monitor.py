@@ -1,5 +1,6 @@
 import pygame
 from src.settings import WHITE, BLACK
+from src.asset_cache import get_font
 
 
 class PerformanceMonitor:
@@ -16,12 +17,13 @@ class PerformanceMonitor:
             show_debug: Czy wyświetlać debug info (domyślnie False)
         """
         self.show_debug = show_debug
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(None, 24)
         self.clock = pygame.time.Clock()
         self.fps = 0
         self.frame_count = 0
         self.frame_time = 0.0
         self.update_interval = 0.5  # Aktualizuj FPS co 0.5 sekundy
+        self.startup_time = None  # Czas do pierwszej klatki gry (sekundy)
 
     def update(self, dt):
         """
@@ -38,7 +40,8 @@ class PerformanceMonitor:
             self.frame_count = 0
             self.frame_time = 0.0
 
-    def draw(self, screen, enemy_count=0, projectile_count=0, gem_count=0):
+    def draw(self, screen, enemy_count=0, projectile_count=0, gem_count=0, asset_stats=None,
+             broadphase_stats=None, world_stats=None, pool_stats=None):
         """
         Rysuje informacje o wydajności na ekranie.
 
@@ -47,6 +50,10 @@ class PerformanceMonitor:
             enemy_count: Liczba wrogów
             projectile_count: Liczba pocisków
             gem_count: Liczba klejnotów XP
+            asset_stats: Statystyki pamięci podręcznej zasobów (opcjonalnie)
+            broadphase_stats: Statystyki broadphase kolizji (opcjonalnie)
+            world_stats: Statystyki kawałków świata (opcjonalnie)
+            pool_stats: Statystyki puli wrogów (opcjonalnie)
         """
         if not self.show_debug:
             return
@@ -74,6 +81,59 @@ class PerformanceMonitor:
         gems_text = self.font.render(f"Klejnoty: {gem_count}", True, WHITE)
         screen.blit(gems_text, (x, y))
 
+        # Statystyki pamięci podręcznej zasobów
+        if asset_stats is not None:
+            y += 30
+            cache_text = self.font.render(
+                f"Cache: {asset_stats['hits']}/{asset_stats['misses']} ({asset_stats['resident_bytes'] // 1024} KB)",
+                True,
+                WHITE
+            )
+            screen.blit(cache_text, (x, y))
+
+        # Rozmiar komórki siatki i średnia liczba kandydatów na zapytanie
+        if broadphase_stats is not None and 'cell_size' in broadphase_stats:
+            y += 30
+            grid_text = f"Siatka: {broadphase_stats['cell_size']} px"
+            if 'mean_candidates' in broadphase_stats:
+                grid_text += f", {broadphase_stats['mean_candidates']:.1f} kand."
+            screen.blit(self.font.render(grid_text, True, WHITE), (x, y))
+
+        # Aktywne kawałki świata i uśpione byty
+        if world_stats is not None:
+            y += 30
+            world_text = self.font.render(
+                f"Kawałki: {world_stats['active_chunks']}/{world_stats['chunks']}, uśpione: {world_stats['sleeping']}",
+                True,
+                WHITE
+            )
+            screen.blit(world_text, (x, y))
+
+        # Pula wrogów: żywi / wolni (szczyt)
+        if pool_stats is not None:
+            y += 30
+            pool_text = self.font.render(
+                f"Pula: {pool_stats['live']}/{pool_stats['free']} (max {pool_stats['high_water']})",
+                True,
+                WHITE
+            )
+            screen.blit(pool_text, (x, y))
+
+        # Czas do pierwszej klatki
+        if self.startup_time is not None:
+            y += 30
+            startup_text = self.font.render(f"Start: {self.startup_time:.2f} s", True, WHITE)
+            screen.blit(startup_text, (x, y))
+
+    def set_startup_time(self, seconds):
+        """
+        Zapisuje czas od uruchomienia gry do pierwszej klatki.
+
+        Args:
+            seconds: Czas w sekundach
+        """
+        self.startup_time = seconds
+
     def toggle_debug(self):
         """Przełącza wyświetlanie debug info."""
         self.show_debug = not self.show_debug
@@ -1,12 +1,13 @@
 import pygame
 import os
 from src.entity import Entity
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src import settings
 from src.weapon import Weapon
 from src.level_manager import LevelManager
 from src.upgrade import UpgradeType
 from src.passive_upgrades import PassiveUpgradeType
 from src.active_weapons import LaserWeapon, ShieldWeapon
+from src.projectile_store import ProjectileStore
 
 
 class Player(Entity):
@@ -14,16 +15,20 @@ class Player(Entity):
         # Inicjalizuj Entity z parametrami gracza
         image_path = os.path.join('assets', 'gfx', 'player.png')
         super().__init__(
-            x=SCREEN_WIDTH // 20,
-            y=SCREEN_HEIGHT // 2 - 32,  # Przybliżona wysokość gracza
+            x=settings.SCREEN_WIDTH // 20,
+            y=settings.SCREEN_HEIGHT // 2 - 32,  # Przybliżona wysokość gracza
             image_path=image_path,
             max_velocity_x=120,
             max_velocity_y=50,
             acceleration=45
         )
 
+        # Wspólny magazyn pocisków wszystkich broni - aktualizowany raz na klatkę w update_weapon()
+        self.projectile_store = ProjectileStore()
+
         # Inicjalizuj broń z fire_rate = 1.0 (1 strzał na sekundę)
-        self.weapon = Weapon(self.rect.centerx, self.rect.centery, fire_rate=1.0)
+        self.weapon = Weapon(self.rect.centerx, self.rect.centery, fire_rate=1.0,
+                             projectile_store=self.projectile_store)
 
         # Inicjalizuj system poziomów i XP
         self.level_manager = LevelManager(xp_per_level=100)
@@ -60,6 +65,9 @@ class Player(Entity):
 
         # Sound manager (będzie ustawiony później w main.py)
         self.sound_manager = None
+
+        # Źródło celów dla broni celujących (będzie ustawione później w main.py)
+        self.target_finder = None
     def set_sound_manager(self, sound_manager):
         """
         Ustawia sound_manager dla gracza i jego broni.
@@ -72,6 +80,18 @@ class Player(Entity):
         for weapon in self.active_weapons:
             weapon.set_sound_manager(sound_manager)
 
+    def set_target_finder(self, target_finder):
+        """
+        Ustawia źródło celów dla broni celujących (Weapon, LaserWeapon).
+
+        Args:
+            target_finder: Obiekt z metodą get_nearest(x, y, max_distance) (np. SpatialGrid z wrogami)
+        """
+        self.target_finder = target_finder
+        for weapon in self.active_weapons:
+            if hasattr(weapon, 'set_target_finder'):
+                weapon.set_target_finder(target_finder)
+
     def input(self, keys, dt):
         """
         Obsługuje wejście gracza z płynnym hamowaniem (damping).
@@ -109,20 +129,20 @@ class Player(Entity):
                 self.velocity_y = 0
 
     def physics(self):
-        """Implementuje fizykę specyficzną dla gracza (ograniczenia granic ekranu)."""
+        """Implementuje fizykę specyficzną dla gracza (ograniczenia granic świata)."""
         # Ograniczenia poziome
         if self.rect.left < 0:
             self.rect.left = 0
             self.velocity_x = 0
-        elif self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
+        elif self.rect.right > settings.WORLD_WIDTH:
+            self.rect.right = settings.WORLD_WIDTH
             self.velocity_x = 0
 
         # Ograniczenia pionowe
         if self.rect.top < 0:
             self.rect.top = 0
-        elif self.rect.bottom > SCREEN_HEIGHT:
-            self.rect.bottom = SCREEN_HEIGHT
+        elif self.rect.bottom > settings.WORLD_HEIGHT:
+            self.rect.bottom = settings.WORLD_HEIGHT
 
         # Zastosuj ograniczenia prędkości z klasy bazowej
         self.apply_velocity_limits()
@@ -149,16 +169,28 @@ class Player(Entity):
             self.health = min(self.health + self.health_regen * dt, self.max_health)
 
     def update_weapon(self, dt):
-        """Aktualizuje wszystkie aktywne bronie gracza."""
+        """Aktualizuje wszystkie aktywne bronie gracza, a potem wszystkie pociski naraz."""
         for weapon in self.active_weapons:
             weapon.update(dt, self.rect.centerx, self.rect.centery, self.velocity_x, self.velocity_y)
+        self.projectile_store.update(dt, self.rect.centerx, self.rect.centery)
 
     def get_bullets(self):
-        """Zwraca listę pocisków ze wszystkich aktywnych broni."""
-        all_bullets = []
-        for weapon in self.active_weapons:
-            all_bullets.extend(weapon.get_projectiles())
-        return all_bullets
+        """
+        Zwraca listę pocisków ze wszystkich broni (lista magazynu - bez kopiowania).
+        Lista jest zastępowana nową przy ProjectileStore.compact(), więc można ją przeglądać,
+        oznaczając pociski do usunięcia.
+        """
+        return self.projectile_store.projectiles
+
+    def cull_projectiles(self, view_rect):
+        """
+        Usuwa pociski, które wyszły poza widok kamery (jedna operacja na tablicach).
+
+        Args:
+            view_rect: pygame.Rect widoku kamery w pikselach świata
+        """
+        self.projectile_store.cull(view_rect)
+        self.projectile_store.compact()
 
     def add_xp(self, xp_amount):
         """
@@ -261,10 +293,12 @@ class Player(Entity):
                     self.rect.centerx,
                     self.rect.centery,
                     fire_rate=1.5,
-                    damage=self.get_damage()
+                    damage=self.get_damage(),
+                    projectile_store=self.projectile_store
                 )
                 if self.sound_manager is not None:
                     laser.set_sound_manager(self.sound_manager)
+                laser.set_target_finder(self.target_finder)
                 self.available_weapons["laser"] = laser
                 self.active_weapons.append(laser)
         elif weapon_type == "shield":
@@ -274,7 +308,8 @@ class Player(Entity):
                     self.rect.centery,
                     fire_rate=2.0,
                     damage=8,
-                    num_projectiles=3
+                    num_projectiles=3,
+                    projectile_store=self.projectile_store
                 )
                 if self.sound_manager is not None:
                     shield.set_sound_manager(self.sound_manager)
@@ -1,5 +1,6 @@
 import pygame
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, RED, GREEN
+from src.settings import WHITE, BLACK, RED, GREEN
+from src.asset_cache import get_font
 
 
 class PlayerHUD:
@@ -10,9 +11,9 @@ class PlayerHUD:
 
     def __init__(self):
         """Inicjalizuje PlayerHUD."""
-        self.font_large = pygame.font.Font(None, 36)
-        self.font_medium = pygame.font.Font(None, 28)
-        self.font_small = pygame.font.Font(None, 24)
+        self.font_large = get_font(None, 36)
+        self.font_medium = get_font(None, 28)
+        self.font_small = get_font(None, 24)
         
         # Kolory
         self.color_text = WHITE
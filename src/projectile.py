@@ -1,14 +1,23 @@
 import pygame
 import os
 from abc import ABC, abstractmethod
+from src.asset_cache import load_image, register_tint, tint_cache
+from src.projectile_store import get_max_hits
 
 
 class Projectile(ABC):
     """
     Bazowa klasa dla wszystkich pocisków w grze.
     Zawiera wspólne właściwości i metody dla zarządzania pociskami.
+    Pocisk dodany do ProjectileStore jest cienkim widokiem: obrażenia, przebicia, czas życia
+    i ostatnie przesunięcie są czytane z tablic magazynu, a rect jest aktualizowany
+    przez ProjectileStore.sync_rects(). Ruch i czas życia liczy wyłącznie ProjectileStore.step().
     """
 
+    # Magazyn, w którym jest pocisk (None = pocisk samodzielny) i jego indeks w tablicach
+    store = None
+    store_index = -1
+
     def __init__(self, x, y, image_path, speed=350, damage=10, lifetime=None, direction_x=1, direction_y=0, weapon_source=None, piercing=False, color=None):
         """
         Inicjalizuje Projectile.
@@ -26,7 +35,8 @@ class Projectile(ABC):
             piercing: Czy pocisk przechodzi przez wrogów (True/False lub liczba przebić)
             color: Kolor do pokolorowania pocisku (RGB tuple, np. (255, 0, 0) dla czerwonego)
         """
-        self.image = pygame.image.load(image_path)
+        # Obraz współdzielony przez wszystkie pociski (tylko do odczytu)
+        self.image = load_image(image_path)
 
         # Zastosuj kolorowanie jeśli podano kolor
         if color is not None:
@@ -55,69 +65,160 @@ class Projectile(ABC):
         self.piercing = piercing
         self.piercing_count = 0  # Licznik przebić (dla liczb > 0)
 
-    def _colorize_image(self, image, color):
+        # Przesunięcie w ostatnim kroku (dla testu kolizji z przemiataniem)
+        self.last_dx = 0
+        self.last_dy = 0
+
+    def attach_store(self, store, index):
         """
-        Pokoloruje obraz na podstawie podanego koloru.
-        Białe piksele będą pokolorowane na podany kolor.
+        Podłącza pocisk do tablic ProjectileStore (wywoływane przez ProjectileStore.add).
 
         Args:
-            image: Obraz pygame
-            color: Kolor RGB (tuple)
+            store: ProjectileStore
+            index: Indeks pocisku w tablicach
+        """
+        self.store = store
+        self.store_index = index
+
+    def detach_store(self):
+        """Kopiuje stan z tablic z powrotem do pocisku i odłącza go od magazynu."""
+        store = self.store
+        if store is None:
+            return
+        index = self.store_index
+        self.rect.topleft = (int(store.x[index]), int(store.y[index]))
+        self._damage = float(store.damage[index])
+        self._elapsed_time = float(store.elapsed[index])
+        self._piercing_count = int(store.hits[index])
+        self._last_dx = float(store.last_dx[index])
+        self._last_dy = float(store.last_dy[index])
+        self.store = None
+        self.store_index = -1
+
+    @property
+    def damage(self):
+        """Obrażenia zadawane przez pocisk."""
+        if self.store is None:
+            return self._damage
+        return float(self.store.damage[self.store_index])
+
+    @damage.setter
+    def damage(self, value):
+        if self.store is None:
+            self._damage = value
+        else:
+            self.store.damage[self.store_index] = value
+
+    @property
+    def elapsed_time(self):
+        """Czas od wystrzelenia pocisku w sekundach."""
+        if self.store is None:
+            return self._elapsed_time
+        return float(self.store.elapsed[self.store_index])
+
+    @elapsed_time.setter
+    def elapsed_time(self, value):
+        if self.store is None:
+            self._elapsed_time = value
+        else:
+            self.store.elapsed[self.store_index] = value
+
+    @property
+    def piercing_count(self):
+        """Liczba wrogów trafionych przez pocisk."""
+        if self.store is None:
+            return self._piercing_count
+        return int(self.store.hits[self.store_index])
+
+    @piercing_count.setter
+    def piercing_count(self, value):
+        if self.store is None:
+            self._piercing_count = value
+        else:
+            self.store.hits[self.store_index] = value
+
+    @property
+    def last_dx(self):
+        """Przesunięcie pocisku na osi X w ostatnim kroku."""
+        if self.store is None:
+            return self._last_dx
+        return float(self.store.last_dx[self.store_index])
+
+    @last_dx.setter
+    def last_dx(self, value):
+        if self.store is None:
+            self._last_dx = value
+        else:
+            self.store.last_dx[self.store_index] = value
+
+    @property
+    def last_dy(self):
+        """Przesunięcie pocisku na osi Y w ostatnim kroku."""
+        if self.store is None:
+            return self._last_dy
+        return float(self.store.last_dy[self.store_index])
+
+    @last_dy.setter
+    def last_dy(self, value):
+        if self.store is None:
+            self._last_dy = value
+        else:
+            self.store.last_dy[self.store_index] = value
+
+    def register_hit(self):
+        """
+        Zlicza trafienie wroga zgodnie z atrybutem piercing.
+        piercing=True: nieskończone przebicia (np. tarcza)
+        piercing=False: brak przebić (zwykłe kule)
+        piercing=liczba: liczba przebić (np. laser z piercing=2)
 
         Returns:
-            Pokolorowany obraz
+            True jeśli pocisk powinien zniknąć po tym trafieniu
         """
-        # Utwórz kopię obrazu
-        colorized = image.copy()
-
-        # Utwórz powierzchnię z kolorem
-        color_surface = pygame.Surface(colorized.get_size())
-        color_surface.fill(color)
+        if self.piercing is True:
+            return False
+        self.piercing_count += 1
+        return self.piercing_count >= get_max_hits(self.piercing)
 
-        # Nałóż kolor na obraz (używając alpha channel)
-        colorized.blit(color_surface, (0, 0), special_flags=pygame.BLEND_MULT)
-
-        return colorized
-
-    def move(self, dt):
+    def _colorize_image(self, image, color):
         """
-        Przesuwa pocisk na podstawie prędkości i kierunku.
+        Pokoloruje obraz na podstawie podanego koloru.
+        Białe piksele będą pokolorowane na podany kolor.
+        Wariant jest budowany raz i współdzielony przez TintCache.
 
         Args:
-            dt: Delta czasu od ostatniej klatki
-        """
-        displacement = self.speed * dt
-        self.rect.left += self.direction_x * displacement
-        self.rect.top += self.direction_y * displacement
+            image: Obraz pygame
+            color: Kolor RGB (tuple)
 
-    def update(self, dt):
+        Returns:
+            Pokolorowany obraz (współdzielony, tylko do odczytu)
         """
-        Aktualizuje stan pocisku (ruch, czas życia).
+        return tint_cache.get_tinted(image, color, pygame.BLEND_MULT)
 
-        Args:
-            dt: Delta czasu od ostatniej klatki
+    def needs_swept_test(self):
+        """
+        Sprawdza, czy ostatni krok był dłuższy niż rozmiar pocisku.
+        Wtedy test kolizji w końcowej pozycji mógłby przeoczyć wroga, przez którego pocisk przeskoczył.
 
         Returns:
-            True jeśli pocisk powinien być usunięty, False w przeciwnym razie
+            True jeśli kolizję trzeba sprawdzić na całej drodze pocisku
         """
-        self.move(dt)
-
-        # Aktualizuj czas życia
-        if self.lifetime is not None:
-            self.elapsed_time += dt
-            if self.elapsed_time >= self.lifetime:
-                return True  # Pocisk powinien być usunięty
+        return abs(self.last_dx) > self.rect.width or abs(self.last_dy) > self.rect.height
 
-        return False  # Pocisk powinien pozostać
+    def get_step_start_rect(self):
+        """Zwraca prostokąt pocisku na początku ostatniego kroku."""
+        return self.rect.move(-self.last_dx, -self.last_dy)
 
-    def draw(self, surface):
+    def draw(self, surface, offset_x=0, offset_y=0):
         """
         Rysuje pocisk na powierzchni.
 
         Args:
             surface: Powierzchnia pygame do rysowania
+            offset_x: Przesunięcie X odejmowane od pozycji (np. kamera)
+            offset_y: Przesunięcie Y odejmowane od pozycji (np. kamera)
         """
-        surface.blit(self.image, self.rect.topleft)
+        surface.blit(self.image, (self.rect.x - offset_x, self.rect.y - offset_y))
 
     def is_off_screen(self, screen_width, screen_height):
         """
@@ -144,7 +245,10 @@ class Bullet(Projectile):
     Dziedziczy z Projectile i ustawia domyślne parametry dla zwykłej kuli.
     """
 
-    def __init__(self, x, y, speed=350, damage=10, weapon_source=None):
+    IMAGE_PATH = os.path.join('assets', 'gfx', 'bullet.png')
+    COLOR = (255, 200, 0)  # Żółty kolor dla zwykłych kul
+
+    def __init__(self, x, y, speed=350, damage=10, weapon_source=None, direction_x=1, direction_y=0):
         """
         Inicjalizuje Bullet.
 
@@ -154,19 +258,24 @@ class Bullet(Projectile):
             speed: Prędkość pocisku (domyślnie 350)
             damage: Obrażenia (domyślnie 10)
             weapon_source: Referencja do broni, która wystrzelił ten pocisk
+            direction_x: Kierunek na osi X (domyślnie 1 - w prawo)
+            direction_y: Kierunek na osi Y (domyślnie 0)
         """
-        image_path = os.path.join('assets', 'gfx', 'bullet.png')
         super().__init__(
             x=x,
             y=y - 32,  # Przesunięcie w górę
-            image_path=image_path,
+            image_path=self.IMAGE_PATH,
             speed=speed,
             damage=damage,
             lifetime=None,  # Kula żyje nieskończenie długo
-            direction_x=1,  # Porusza się w prawo
-            direction_y=0,
+            direction_x=direction_x,  # Domyślnie porusza się w prawo
+            direction_y=direction_y,
             weapon_source=weapon_source,
             piercing=False,  # Zwykłe kule są usuwane po trafieniu
-            color=(255, 200, 0)  # Żółty kolor dla zwykłych kul
+            color=self.COLOR
         )
 
+
+# Zarejestruj kolory z wyprzedzeniem, aby nie kolorować w trakcie rozgrywki
+register_tint(Bullet.IMAGE_PATH, Bullet.COLOR)
+
@@ -0,0 +1,228 @@
+"""
+Projectile Store - wspólny magazyn pocisków wszystkich broni w układzie struktury tablic.
+Pozycje, kierunki, prędkości, czas życia, obrażenia i przebicia są trzymane w tablicach NumPy,
+a ruch (prosty i po orbicie), wygasanie i usuwanie pocisków spoza widoku kamery
+są operacjami na całych tablicach.
+Obiekty Projectile pozostają cienkimi widokami (rect do rysowania i kolizji), a bronie
+trzymają do nich uchwyty - bez osobnych list pocisków przeglądanych w każdej klatce.
+"""
+import math
+import numpy as np
+
+
+# Tablice float64 z danymi pocisków (indeks = pozycja w ProjectileStore.projectiles)
+# lifetime = inf dla pocisków bez limitu, max_hits = inf dla pocisków przebijających wszystkich,
+# orbit_radius > 0 oznacza pocisk krążący wokół gracza (angle, angular_velocity)
+FIELDS = ('x', 'y', 'width', 'height', 'direction_x', 'direction_y', 'speed', 'damage',
+          'lifetime', 'elapsed', 'hits', 'max_hits', 'last_dx', 'last_dy',
+          'angle', 'angular_velocity', 'orbit_radius')
+
+
+def get_max_hits(piercing):
+    """
+    Zamienia atrybut piercing pocisku na liczbę trafień, po której pocisk znika.
+
+    Args:
+        piercing: False (znika po pierwszym trafieniu), True (nie znika) lub liczba przebić
+
+    Returns:
+        Liczba trafień (math.inf dla piercing=True)
+    """
+    if isinstance(piercing, bool):
+        return math.inf if piercing else 1
+    return piercing
+
+
+class ProjectileStore:
+    """
+    Magazyn aktywnych pocisków. Indeks pocisku w tablicach odpowiada jego pozycji w self.projectiles.
+    Tablice rosną dwukrotnie, gdy zabraknie miejsca.
+    """
+
+    def __init__(self, capacity=128):
+        """
+        Inicjalizuje ProjectileStore.
+
+        Args:
+            capacity: Początkowa pojemność tablic (domyślnie 128)
+        """
+        self.count = 0
+        # Widoki Projectile w kolejności indeksów tablic
+        self.projectiles = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Tworzy (lub powiększa) tablice, zachowując dane aktywnych pocisków."""
+        n = self.count
+        old = getattr(self, 'x', None)
+        for name in FIELDS:
+            array = np.zeros(capacity, dtype=np.float64)
+            if old is not None:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        # Pociski oznaczone do usunięcia przy najbliższym compact()
+        removed = np.zeros(capacity, dtype=bool)
+        if old is not None:
+            removed[:n] = self.removed[:n]
+        self.removed = removed
+        self.capacity = capacity
+
+    def add(self, projectile):
+        """
+        Dodaje pocisk do magazynu. Od tej chwili jego ruch, czas życia i trafienia są w tablicach.
+
+        Args:
+            projectile: Obiekt Projectile (nie może być w innym magazynie)
+
+        Returns:
+            Indeks pocisku w tablicach
+        """
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.count
+        rect = projectile.rect
+        self.x[index] = rect.x
+        self.y[index] = rect.y
+        self.width[index] = rect.width
+        self.height[index] = rect.height
+        self.direction_x[index] = projectile.direction_x
+        self.direction_y[index] = projectile.direction_y
+        self.speed[index] = projectile.speed
+        self.damage[index] = projectile.damage
+        self.lifetime[index] = math.inf if projectile.lifetime is None else projectile.lifetime
+        self.elapsed[index] = projectile.elapsed_time
+        self.hits[index] = projectile.piercing_count
+        self.max_hits[index] = get_max_hits(projectile.piercing)
+        self.last_dx[index] = 0.0
+        self.last_dy[index] = 0.0
+        self.angle[index] = getattr(projectile, 'angle', 0.0)
+        self.angular_velocity[index] = getattr(projectile, 'angular_velocity', 0.0)
+        self.orbit_radius[index] = getattr(projectile, 'orbit_radius', 0.0)
+        self.removed[index] = False
+
+        self.projectiles.append(projectile)
+        self.count += 1
+        projectile.attach_store(self, index)
+        return index
+
+    def mark_removed(self, projectile):
+        """
+        Oznacza pocisk do usunięcia przy najbliższym compact().
+        Nie zmienia indeksów innych pocisków, więc można wywoływać w trakcie iteracji po self.projectiles.
+
+        Args:
+            projectile: Obiekt Projectile z tego magazynu
+        """
+        if projectile.store is not self:
+            return
+        self.removed[projectile.store_index] = True
+
+    def step(self, dt, player_x, player_y):
+        """
+        Wykonuje krok wszystkich pocisków naraz: ruch prosty lub po orbicie wokół gracza
+        i oznaczenie pocisków, którym skończył się czas życia.
+
+        Args:
+            dt: Delta czasu od ostatniej klatki
+            player_x: Pozycja X środka gracza (środek orbit)
+            player_y: Pozycja Y środka gracza
+        """
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        old_x = x.copy()
+        old_y = y.copy()
+
+        # Ruch prosty
+        displacement = self.speed[:n] * dt
+        x += self.direction_x[:n] * displacement
+        y += self.direction_y[:n] * displacement
+
+        # Orbity - pozycja wynika z kąta, a nie z poprzedniej pozycji
+        orbiting = self.orbit_radius[:n] > 0
+        if orbiting.any():
+            angle = self.angle[:n]
+            angle += self.angular_velocity[:n] * dt
+            radius = self.orbit_radius[:n]
+            x[orbiting] = (player_x + np.cos(angle) * radius - self.width[:n] // 2)[orbiting]
+            y[orbiting] = (player_y + np.sin(angle) * radius - self.height[:n] // 2)[orbiting]
+
+        # Przesunięcie w tym kroku (dla testu kolizji z przemiataniem)
+        np.subtract(x, old_x, out=self.last_dx[:n])
+        np.subtract(y, old_y, out=self.last_dy[:n])
+
+        # Czas życia
+        elapsed = self.elapsed[:n]
+        elapsed += dt
+        self.removed[:n] |= elapsed >= self.lifetime[:n]
+
+    def cull(self, view_rect):
+        """
+        Oznacza pociski całkowicie poza prostokątem widoku (jak World.is_visible, dla wszystkich naraz).
+
+        Args:
+            view_rect: pygame.Rect widoku kamery w pikselach świata
+        """
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        visible = ((x + self.width[:n] >= view_rect.left) & (x <= view_rect.right) &
+                   (y + self.height[:n] >= view_rect.top) & (y <= view_rect.bottom))
+        self.removed[:n] |= ~visible
+
+    def compact(self):
+        """
+        Usuwa oznaczone pociski jedną operacją na tablicach, odłącza je od magazynu
+        i usuwa ich uchwyty z broni, które je wystrzeliły.
+
+        Returns:
+            Lista usuniętych pocisków
+        """
+        n = self.count
+        removed = self.removed[:n]
+        if not removed.any():
+            return []
+
+        keep = ~removed
+        gone = [self.projectiles[index] for index in np.flatnonzero(removed).tolist()]
+        for projectile in gone:
+            projectile.detach_store()
+            if projectile.weapon_source is not None:
+                projectile.weapon_source.projectiles.discard(projectile)
+
+        kept = int(keep.sum())
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.removed[:n] = False
+
+        self.projectiles = [projectile for projectile, flag in zip(self.projectiles, keep.tolist()) if flag]
+        self.count = kept
+        for index, projectile in enumerate(self.projectiles):
+            projectile.store_index = index
+        return gone
+
+    def sync_rects(self):
+        """Przepisuje pozycje z tablic do rect widoków Projectile (dla rysowania i kolizji)."""
+        n = self.count
+        xs = self.x[:n].astype(np.int64).tolist()
+        ys = self.y[:n].astype(np.int64).tolist()
+        for projectile, x, y in zip(self.projectiles, xs, ys):
+            projectile.rect.topleft = (x, y)
+
+    def update(self, dt, player_x, player_y):
+        """
+        Krok, usunięcie wygasłych pocisków i przepisanie pozycji do rect - raz na klatkę.
+
+        Args:
+            dt: Delta czasu od ostatniej klatki
+            player_x: Pozycja X środka gracza
+            player_y: Pozycja Y środka gracza
+        """
+        self.step(dt, player_x, player_y)
+        self.compact()
+        self.sync_rects()
@@ -1,10 +1,92 @@
+import os
 import pygame
-pygame.init()
-(SCREEN_WIDTH, SCREEN_HEIGHT) = pygame.display.get_desktop_sizes()[0]
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+
+# Tryby wyświetlania
+DISPLAY_FULLSCREEN = 'fullscreen'
+DISPLAY_WINDOWED = 'windowed'
+DISPLAY_HEADLESS = 'headless'
+DISPLAY_MODES = (DISPLAY_FULLSCREEN, DISPLAY_WINDOWED, DISPLAY_HEADLESS)
+
+# Domyślna rozdzielczość dla trybu okienkowego i headless
+DEFAULT_RESOLUTION = (1280, 720)
+
+# Rozmiar ekranu i powierzchnia ekranu - ustawiane przez init_display()
+# Import modułu nie inicjalizuje pygame ani nie otwiera okna
+(SCREEN_WIDTH, SCREEN_HEIGHT) = DEFAULT_RESOLUTION
+SCREEN = None
+
 FPS = 60
+
+# Świat jest większy niż ekran - rozmiar w ekranach, ustawiany w pikselach przez init_display()
+WORLD_SCREENS = (8, 8)
+(WORLD_WIDTH, WORLD_HEIGHT) = (SCREEN_WIDTH * WORLD_SCREENS[0], SCREEN_HEIGHT * WORLD_SCREENS[1])
+
+# Świat jest podzielony na kawałki (chunki) o boku CHUNK_SIZE pikseli
+# Kawałki dalej niż CHUNK_WAKE_MARGIN kawałków od widoku kamery śpią (bez aktualizacji i kolizji)
+CHUNK_SIZE = 512
+CHUNK_WAKE_MARGIN = 1
+
+# Backend broadphase kolizji (klucz src.broadphase.BROADPHASE_BACKENDS)
+BROADPHASE = os.environ.get('VOID_BLOOM_BROADPHASE', 'grid')
+
 BLACK = (0, 0, 0)
 GREEN = (0, 250, 0)
 RED = (250, 0, 0)
 BLUE = (0, 0, 250)
-WHITE = (250, 250, 250)
\ No newline at end of file
+WHITE = (250, 250, 250)
+
+
+def parse_resolution(value):
+    """
+    Parsuje rozdzielczość w formacie "SZEROKOŚĆxWYSOKOŚĆ".
+
+    Args:
+        value: Tekst, np. "1920x1080"
+
+    Returns:
+        Krotka (szerokość, wysokość)
+    """
+    width, height = value.lower().split('x')
+    return (int(width), int(height))
+
+
+def init_display(mode=None, resolution=None):
+    """
+    Inicjalizuje pygame i otwiera ekran w wybranym trybie.
+    Bez argumentów tryb i rozdzielczość są brane ze zmiennych środowiskowych
+    VOID_BLOOM_DISPLAY i VOID_BLOOM_RESOLUTION (domyślnie pełny ekran w rozdzielczości pulpitu).
+
+    Args:
+        mode: Tryb wyświetlania (DISPLAY_FULLSCREEN, DISPLAY_WINDOWED lub DISPLAY_HEADLESS)
+        resolution: Krotka (szerokość, wysokość) lub None dla domyślnej
+
+    Returns:
+        Powierzchnia ekranu
+    """
+    global SCREEN, SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, WORLD_HEIGHT
+
+    if mode is None:
+        mode = os.environ.get('VOID_BLOOM_DISPLAY', DISPLAY_FULLSCREEN)
+    if mode not in DISPLAY_MODES:
+        raise ValueError(f"Nieznany tryb wyświetlania: {mode}")
+    if resolution is None and os.environ.get('VOID_BLOOM_RESOLUTION'):
+        resolution = parse_resolution(os.environ['VOID_BLOOM_RESOLUTION'])
+
+    # Sterownik dummy musi być ustawiony przed inicjalizacją SDL
+    if mode == DISPLAY_HEADLESS:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    pygame.init()
+
+    if resolution is None:
+        if mode == DISPLAY_FULLSCREEN:
+            resolution = pygame.display.get_desktop_sizes()[0]
+        else:
+            resolution = DEFAULT_RESOLUTION
+
+    flags = pygame.FULLSCREEN if mode == DISPLAY_FULLSCREEN else 0
+    (SCREEN_WIDTH, SCREEN_HEIGHT) = resolution
+    (WORLD_WIDTH, WORLD_HEIGHT) = (SCREEN_WIDTH * WORLD_SCREENS[0], SCREEN_HEIGHT * WORLD_SCREENS[1])
+    SCREEN = pygame.display.set_mode(resolution, flags)
+    return SCREEN
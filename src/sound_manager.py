@@ -1,5 +1,6 @@
 import pygame
 import os
+from src.asset_cache import asset_cache, load_sound
 
 
 class SoundManager:
@@ -8,6 +9,16 @@ class SoundManager:
     Obsługuje efekty dźwiękowe i muzykę.
     """
 
+    # Definiuj dostępne dźwięki
+    SFX_DIR = os.path.join('assets', 'sfx')
+    SOUND_FILES = {
+        'hit': 'hit.wav',
+        'enemy_death': 'enemy_death.wav',
+        'xp_pickup': 'xp_pickup.wav',
+        'level_up': 'level_up.wav',
+        'shoot': 'shoot.wav',
+    }
+
     def __init__(self):
         """Inicjalizuje SoundManager."""
         pygame.mixer.init()
@@ -17,24 +28,17 @@ class SoundManager:
         self._load_sounds()
 
     def _load_sounds(self):
-        """Ładuje wszystkie dźwięki z folderu assets/sfx."""
-        sfx_dir = os.path.join('assets', 'sfx')
-
-        # Definiuj dostępne dźwięki
-        sound_files = {
-            'hit': 'hit.wav',
-            'enemy_death': 'enemy_death.wav',
-            'xp_pickup': 'xp_pickup.wav',
-            'level_up': 'level_up.wav',
-            'shoot': 'shoot.wav',
-        }
-
+        """
+        Ładuje wszystkie dźwięki z folderu assets/sfx.
+        Dźwięki wczytane wcześniej przez preloader są brane z pamięci podręcznej,
+        a pozostałe z zamontowanego pliku pack lub z luźnych plików.
+        """
         # Spróbuj załadować każdy dźwięk
-        for sound_name, filename in sound_files.items():
-            filepath = os.path.join(sfx_dir, filename)
+        for sound_name, filename in self.SOUND_FILES.items():
+            filepath = os.path.join(self.SFX_DIR, filename)
             try:
-                if os.path.exists(filepath):
-                    self.sounds[sound_name] = pygame.mixer.Sound(filepath)
+                if asset_cache.exists(filepath):
+                    self.sounds[sound_name] = load_sound(filepath)
                     self.sounds[sound_name].set_volume(self.sfx_volume)
                 else:
                     # Utwórz dummy sound jeśli plik nie istnieje
@@ -1,7 +1,35 @@
 """
 Spatial Grid - system optymalizacji kolizji.
 Dzieli ekran na siatką komórek do szybszego wyszukiwania kolizji.
+Siatka jest trwała: obiekty dodaje się raz, a przy ruchu przenosi się tylko te,
+które zmieniły komórkę (update_object).
+Duże obiekty (bossowie, strefy AoE) mogą być wstawione do wszystkich komórek,
+które pokrywa ich rect (multi_cell=True).
+Z auto_tune=True siatka zbiera statystyki zajętości i zapytań, a gdy średnia liczba
+kandydatów na zapytanie wyjdzie poza docelowy przedział (albo najgęstsza komórka
+przekroczy max_cell_occupancy), przebudowuje się z nowym rozmiarem komórki (maybe_retune).
 """
+import math
+from src.utils import get_swept_bounds, get_swept_hits
+
+
+def rects_overlap(obj, other):
+    """
+    Predykat dla query_nearby: czy prostokąty obu obiektów nachodzą na siebie.
+
+    Args:
+        obj: Obiekt referencyjny
+        other: Kandydat z siatki
+
+    Returns:
+        True jeśli prostokąty nachodzą na siebie
+    """
+    return obj.rect.colliderect(other.rect)
+
+
+def _distance_key(item):
+    """Klucz sortowania krotek (kwadrat odległości, obiekt) - obiektów nie da się porównywać."""
+    return item[0]
 
 
 class SpatialGrid:
@@ -10,7 +38,9 @@ class SpatialGrid:
     Dzieli ekran na komórki i przechowuje obiekty w odpowiednich komórkach.
     """
 
-    def __init__(self, screen_width, screen_height, cell_size=100):
+    def __init__(self, screen_width, screen_height, cell_size=100, auto_tune=False,
+                 target_candidates=(4, 16), min_cell_size=32, max_cell_size=None, tune_interval=60,
+                 max_cell_occupancy=None):
         """
         Inicjalizuje SpatialGrid.
 
@@ -18,31 +48,65 @@ class SpatialGrid:
             screen_width: Szerokość ekranu
             screen_height: Wysokość ekranu
             cell_size: Rozmiar komórki siatki (domyślnie 100)
+            auto_tune: Czy automatycznie dobierać rozmiar komórki (domyślnie False)
+            target_candidates: Docelowy przedział (min, max) średniej liczby kandydatów na zapytanie
+            min_cell_size: Najmniejszy dopuszczalny rozmiar komórki w pikselach (domyślnie 32)
+            max_cell_size: Największy dopuszczalny rozmiar komórki (domyślnie połowa krótszego boku ekranu)
+            tune_interval: Co ile wywołań maybe_retune() sprawdzać statystyki (domyślnie 60, czyli co sekundę)
+            max_cell_occupancy: Liczba obiektów w najgęstszej komórce, powyżej której siatka się zagęszcza,
+                choć średnia jest w normie (domyślnie None - tylko średnia liczba kandydatów)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.cell_size = cell_size
-
-        # Oblicz wymiary siatki
-        self.grid_width = (screen_width // cell_size) + 1
-        self.grid_height = (screen_height // cell_size) + 1
+        self._set_grid_size(cell_size)
+
+        # Automatyczny dobór rozmiaru komórki
+        self.auto_tune = auto_tune
+        self.target_candidates = target_candidates
+        self.min_cell_size = min_cell_size
+        self.max_cell_size = max_cell_size or max(min_cell_size, min(screen_width, screen_height) // 2)
+        self.tune_interval = tune_interval
+        self.max_cell_occupancy = max_cell_occupancy
+        self.retune_count = 0
+        # Największy bok obiektu w siatce - komórka nie może być mniejsza,
+        # bo sąsiedztwo 3x3 przestałoby obejmować nachodzące obiekty
+        self.max_object_size = 0
+
+        # Statystyki zapytań w bieżącym oknie pomiaru
+        self.frames_since_tune = 0
+        self.query_count = 0
+        self.candidate_count = 0
+        self.last_mean_candidates = 0.0
+
+        # Zbiór wielokrotnego użytku do usuwania powtórzeń w query_nearby
+        self._seen = set()
 
         # Inicjalizuj siatkę
+        # Słownik: (cell_x, cell_y) -> lista obiektów; komórki są tworzone przy pierwszym użyciu
         self.grid = {}
 
         # Śledzenie pozycji obiektów dla optymalizacji
         # Słownik: id(obj) -> (cell_x, cell_y)
         self.object_positions = {}
 
+        # Śledzenie obiektów wstawionych do wielu komórek
+        # Słownik: id(obj) -> (min_cell_x, min_cell_y, max_cell_x, max_cell_y)
+        self.object_spans = {}
+
         self.clear()
 
+    def _set_grid_size(self, cell_size):
+        """Ustawia rozmiar komórki i oblicza wymiary siatki."""
+        self.cell_size = cell_size
+        self.grid_width = (self.screen_width // cell_size) + 1
+        self.grid_height = (self.screen_height // cell_size) + 1
+
     def clear(self):
         """Czyści siatkę i śledzenie pozycji."""
         self.grid = {}
         self.object_positions = {}
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                self.grid[(x, y)] = []
+        self.object_spans = {}
 
     def _get_cell_coords(self, obj):
         """
@@ -63,17 +127,70 @@ class SpatialGrid:
 
         return (cell_x, cell_y)
 
-    def add_object(self, obj):
+    def _get_cell_span(self, rect):
+        """
+        Oblicza zakres komórek pokrywanych przez prostokąt.
+
+        Args:
+            rect: pygame.Rect
+
+        Returns:
+            Krotka (min_cell_x, min_cell_y, max_cell_x, max_cell_y) ograniczona do siatki
+        """
+        min_x = max(0, min(int(rect.left // self.cell_size), self.grid_width - 1))
+        min_y = max(0, min(int(rect.top // self.cell_size), self.grid_height - 1))
+        # right/bottom są poza prostokątem, więc bierzemy ostatni piksel
+        max_x = max(0, min(int((rect.right - 1) // self.cell_size), self.grid_width - 1))
+        max_y = max(0, min(int((rect.bottom - 1) // self.cell_size), self.grid_height - 1))
+        return (min_x, min_y, max(min_x, max_x), max(min_y, max_y))
+
+    def _add_to_span(self, obj, span):
+        """Dodaje obiekt do wszystkich komórek zakresu."""
+        min_x, min_y, max_x, max_y = span
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                self.grid.setdefault((cell_x, cell_y), []).append(obj)
+
+    def _remove_from_span(self, obj, span):
+        """Usuwa obiekt ze wszystkich komórek zakresu."""
+        min_x, min_y, max_x, max_y = span
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self.grid.get((cell_x, cell_y))
+                if cell is not None:
+                    try:
+                        cell.remove(obj)
+                    except ValueError:
+                        pass  # Obiekt nie był w komórce
+
+    def add_object(self, obj, multi_cell=False):
         """
         Dodaje obiekt do siatki.
 
         Args:
             obj: Obiekt z atrybutem rect (pygame.Rect)
+            multi_cell: Czy wstawić obiekt do każdej komórki pokrywanej przez jego rect
+                (dla dużych obiektów), zamiast tylko do komórki środka
         """
-        cell_coords = self._get_cell_coords(obj)
         obj_id = id(obj)
+        if not multi_cell:
+            size = max(obj.rect.width, obj.rect.height)
+            if size > self.max_object_size:
+                self.max_object_size = size
+                # Obiekt większy od komórki wypadłby z sąsiedztwa 3x3 do najbliższego przestrojenia
+                # (kolizje byłyby gubione), więc przy auto_tune powiększ komórkę od razu
+                if self.auto_tune and size > self.cell_size:
+                    self.set_cell_size(max(self.min_cell_size, size))
+                    self.retune_count += 1
+        if multi_cell:
+            span = self._get_cell_span(obj.rect)
+            self._add_to_span(obj, span)
+            self.object_spans[obj_id] = span
+            return
 
-        self.grid[cell_coords].append(obj)
+        cell_coords = self._get_cell_coords(obj)
+
+        self.grid.setdefault(cell_coords, []).append(obj)
         self.object_positions[obj_id] = cell_coords
 
     def update_object(self, obj):
@@ -81,11 +198,21 @@ class SpatialGrid:
         Aktualizuje pozycję obiektu w siatce.
         Jeśli obiekt przesunął się do innej komórki, przesuwa go.
         Jeśli pozostał w tej samej komórce, nic nie robi (optymalizacja).
+        Obiekty wielokomórkowe są przenoszone, gdy zmieni się zakres pokrywanych komórek.
 
         Args:
             obj: Obiekt z atrybutem rect (pygame.Rect)
         """
         obj_id = id(obj)
+        old_span = self.object_spans.get(obj_id)
+        if old_span is not None:
+            new_span = self._get_cell_span(obj.rect)
+            if new_span != old_span:
+                self._remove_from_span(obj, old_span)
+                self._add_to_span(obj, new_span)
+                self.object_spans[obj_id] = new_span
+            return
+
         new_cell_coords = self._get_cell_coords(obj)
         old_cell_coords = self.object_positions.get(obj_id)
 
@@ -101,7 +228,7 @@ class SpatialGrid:
                 pass  # Obiekt nie był w starej komórce
 
         # Dodaj obiekt do nowej komórki
-        self.grid[new_cell_coords].append(obj)
+        self.grid.setdefault(new_cell_coords, []).append(obj)
         self.object_positions[obj_id] = new_cell_coords
 
     def remove_object(self, obj):
@@ -112,6 +239,11 @@ class SpatialGrid:
             obj: Obiekt do usunięcia
         """
         obj_id = id(obj)
+        span = self.object_spans.pop(obj_id, None)
+        if span is not None:
+            self._remove_from_span(obj, span)
+            return
+
         cell_coords = self.object_positions.get(obj_id)
 
         if cell_coords is not None and cell_coords in self.grid:
@@ -146,12 +278,324 @@ class SpatialGrid:
                 check_x = cell_x + dx
                 check_y = cell_y + dy
                 
-                # Sprawdź granice
-                if 0 <= check_x < self.grid_width and 0 <= check_y < self.grid_height:
-                    nearby.extend(self.grid[(check_x, check_y)])
+                # Pomiń puste (jeszcze nieutworzone) komórki
+                cell = self.grid.get((check_x, check_y))
+                if cell:
+                    nearby.extend(cell)
         
+        # Obiekty wielokomórkowe mogą wystąpić w kilku komórkach
+        if self.object_spans:
+            nearby = self._deduplicate(nearby)
+
+        self.query_count += 1
+        self.candidate_count += len(nearby)
         return nearby
 
+    def iter_nearby_cells(self, obj, radius=1):
+        """
+        Leniwie zwraca niepuste komórki w pobliżu obiektu, bez kopiowania ich zawartości.
+        Obiekty wielokomórkowe mogą wystąpić w kilku zwróconych komórkach.
+        Nie modyfikuj siatki w trakcie iteracji.
+
+        Args:
+            obj: Obiekt referencyjny
+            radius: Promień wyszukiwania w komórkach (domyślnie 1)
+
+        Yields:
+            Listy obiektów kolejnych komórek
+        """
+        cell_x = int(obj.rect.centerx // self.cell_size)
+        cell_y = int(obj.rect.centery // self.cell_size)
+        grid = self.grid
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                cell = grid.get((cell_x + dx, cell_y + dy))
+                if cell:
+                    yield cell
+
+    def query_nearby(self, obj, out, radius=1, predicate=None, first_hit=False):
+        """
+        Wersja get_nearby_objects bez alokacji: wypełnia listę podaną przez wywołującego.
+        Lista jest najpierw czyszczona, więc można jej używać wielokrotnie w każdej klatce.
+
+        Args:
+            obj: Obiekt referencyjny
+            out: Lista do wypełnienia pasującymi obiektami
+            radius: Promień wyszukiwania w komórkach (domyślnie 1)
+            predicate: Funkcja predicate(obj, kandydat) -> bool filtrująca kandydatów
+                (np. rects_overlap); None przepuszcza wszystkich
+            first_hit: Czy zakończyć po pierwszym pasującym obiekcie
+
+        Returns:
+            Liczba obiektów w out
+        """
+        out.clear()
+        cell_x = int(obj.rect.centerx // self.cell_size)
+        cell_y = int(obj.rect.centery // self.cell_size)
+        grid = self.grid
+        # Obiekty wielokomórkowe mogą wystąpić w kilku komórkach
+        seen = self._seen if self.object_spans else None
+        if seen is not None:
+            seen.clear()
+
+        self.query_count += 1
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                cell = grid.get((cell_x + dx, cell_y + dy))
+                if not cell:
+                    continue
+                self.candidate_count += len(cell)
+                for other in cell:
+                    if seen is not None:
+                        other_id = id(other)
+                        if other_id in seen:
+                            continue
+                        seen.add(other_id)
+                    if predicate is None or predicate(obj, other):
+                        out.append(other)
+                        if first_hit:
+                            return 1
+        return len(out)
+
+    def _iter_ring_cells(self, cell_x, cell_y, ring):
+        """
+        Zwraca niepuste komórki leżące dokładnie w odległości ring (w komórkach) od komórki środka.
+
+        Args:
+            cell_x: Współrzędna X komórki środka
+            cell_y: Współrzędna Y komórki środka
+            ring: Numer pierścienia (0 = sama komórka środka)
+
+        Yields:
+            Listy obiektów kolejnych komórek pierścienia
+        """
+        grid = self.grid
+        if ring == 0:
+            cell = grid.get((cell_x, cell_y))
+            if cell:
+                yield cell
+            return
+        for check_x in range(cell_x - ring, cell_x + ring + 1):
+            for check_y in (cell_y - ring, cell_y + ring):
+                cell = grid.get((check_x, check_y))
+                if cell:
+                    yield cell
+        for check_y in range(cell_y - ring + 1, cell_y + ring):
+            for check_x in (cell_x - ring, cell_x + ring):
+                cell = grid.get((check_x, check_y))
+                if cell:
+                    yield cell
+
+    def _get_ring_bound(self, x, y, cell_x, cell_y, ring):
+        """
+        Oblicza najmniejszą możliwą odległość punktu od obiektów spoza pierścieni 0..ring.
+        Obiekty są przypisane do komórek swoich środków (z ograniczeniem do siatki),
+        więc każdy nieodwiedzony obiekt ma środek poza kwadratem odwiedzonych komórek.
+        Boki kwadratu leżące na krawędzi siatki lub poza nią nic nie ograniczają.
+
+        Returns:
+            Odległość w pikselach lub None, jeśli odwiedzono już całą siatkę
+        """
+        cell_size = self.cell_size
+        bounds = []
+        if cell_x - ring > 0:
+            bounds.append(x - (cell_x - ring) * cell_size)
+        if cell_x + ring < self.grid_width - 1:
+            bounds.append((cell_x + ring + 1) * cell_size - x)
+        if cell_y - ring > 0:
+            bounds.append(y - (cell_y - ring) * cell_size)
+        if cell_y + ring < self.grid_height - 1:
+            bounds.append((cell_y + ring + 1) * cell_size - y)
+        if not bounds:
+            return None
+        return max(0, min(bounds))
+
+    def get_k_nearest(self, x, y, k, max_distance=None, predicate=None):
+        """
+        Zwraca k obiektów najbliższych punktowi (według środków), od najbliższego.
+        Przeszukuje siatkę pierścień po pierścieniu i kończy, gdy odległość k-tego
+        obiektu jest nie większa niż odległość do nieodwiedzonych komórek.
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            k: Liczba szukanych obiektów
+            max_distance: Maksymalna odległość w pikselach (None = bez limitu)
+            predicate: Funkcja predicate(kandydat) -> bool filtrująca kandydatów lub None
+
+        Returns:
+            Lista co najwyżej k obiektów posortowana rosnąco po odległości
+        """
+        if k <= 0:
+            return []
+        cell_x = max(0, min(int(x // self.cell_size), self.grid_width - 1))
+        cell_y = max(0, min(int(y // self.cell_size), self.grid_height - 1))
+        max_distance_sq = max_distance * max_distance if max_distance is not None else math.inf
+        # Obiekty wielokomórkowe mogą wystąpić w kilku komórkach
+        seen = set() if self.object_spans else None
+
+        # Lista krotek (kwadrat odległości, obiekt)
+        found = []
+        ring = 0
+        while True:
+            for cell in self._iter_ring_cells(cell_x, cell_y, ring):
+                for obj in cell:
+                    if seen is not None:
+                        if id(obj) in seen:
+                            continue
+                        seen.add(id(obj))
+                    if predicate is not None and not predicate(obj):
+                        continue
+                    dx = obj.rect.centerx - x
+                    dy = obj.rect.centery - y
+                    distance_sq = dx * dx + dy * dy
+                    if distance_sq <= max_distance_sq:
+                        found.append((distance_sq, obj))
+
+            bound = self._get_ring_bound(x, y, cell_x, cell_y, ring)
+            if bound is None or bound * bound > max_distance_sq:
+                break
+            if len(found) >= k:
+                found.sort(key=_distance_key)
+                del found[k:]
+                # K-ty obiekt jest bliżej niż cokolwiek w nieodwiedzonych komórkach
+                if found[-1][0] <= bound * bound:
+                    break
+            ring += 1
+
+        found.sort(key=_distance_key)
+        return [obj for _, obj in found[:k]]
+
+    def get_nearest(self, x, y, max_distance=None, predicate=None):
+        """
+        Zwraca obiekt najbliższy punktowi lub None.
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            max_distance: Maksymalna odległość w pikselach (None = bez limitu)
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Najbliższy obiekt lub None
+        """
+        nearest = self.get_k_nearest(x, y, 1, max_distance=max_distance, predicate=predicate)
+        return nearest[0] if nearest else None
+
+    def get_within_radius(self, x, y, radius, predicate=None):
+        """
+        Zwraca obiekty, których środki leżą w promieniu od punktu, od najbliższego.
+
+        Args:
+            x: Współrzędna X punktu
+            y: Współrzędna Y punktu
+            radius: Promień w pikselach
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista obiektów posortowana rosnąco po odległości
+        """
+        cell_size = self.cell_size
+        min_x = max(0, min(int((x - radius) // cell_size), self.grid_width - 1))
+        max_x = max(0, min(int((x + radius) // cell_size), self.grid_width - 1))
+        min_y = max(0, min(int((y - radius) // cell_size), self.grid_height - 1))
+        max_y = max(0, min(int((y + radius) // cell_size), self.grid_height - 1))
+        radius_sq = radius * radius
+        seen = set() if self.object_spans else None
+
+        found = []
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self.grid.get((cell_x, cell_y))
+                if not cell:
+                    continue
+                for obj in cell:
+                    if seen is not None:
+                        if id(obj) in seen:
+                            continue
+                        seen.add(id(obj))
+                    if predicate is not None and not predicate(obj):
+                        continue
+                    dx = obj.rect.centerx - x
+                    dy = obj.rect.centery - y
+                    distance_sq = dx * dx + dy * dy
+                    if distance_sq <= radius_sq:
+                        found.append((distance_sq, obj))
+
+        found.sort(key=_distance_key)
+        return [obj for _, obj in found]
+
+    def _deduplicate(self, objects):
+        """
+        Usuwa powtórzenia z listy obiektów, zachowując kolejność.
+
+        Args:
+            objects: Lista obiektów
+
+        Returns:
+            Lista bez powtórzeń
+        """
+        seen = set()
+        unique = []
+        for obj in objects:
+            obj_id = id(obj)
+            if obj_id not in seen:
+                seen.add(obj_id)
+                unique.append(obj)
+        return unique
+
+    def query_rect(self, rect, margin=0):
+        """
+        Zwraca obiekty z komórek pokrywanych przez prostokąt (bez powtórzeń).
+        Odwiedza dokładnie komórki, które pokrywa rect, zamiast stałego sąsiedztwa 3x3.
+
+        Obiekty wstawione do jednej komórki są przypisane do komórki swojego środka,
+        więc aby znaleźć wszystkie nachodzące na rect, podaj margin równy
+        połowie rozmiaru największego takiego obiektu.
+
+        Args:
+            rect: pygame.Rect obszaru zapytania
+            margin: Dodatkowy margines wokół prostokąta w pikselach (domyślnie 0)
+
+        Returns:
+            Lista obiektów (kandydatów do kolizji)
+        """
+        if margin:
+            rect = rect.inflate(2 * margin, 2 * margin)
+        min_x, min_y, max_x, max_y = self._get_cell_span(rect)
+
+        result = []
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self.grid.get((cell_x, cell_y))
+                if cell:
+                    result.extend(cell)
+
+        if self.object_spans and (max_x > min_x or max_y > min_y):
+            result = self._deduplicate(result)
+
+        self.query_count += 1
+        self.candidate_count += len(result)
+        return result
+
+    def query_swept(self, rect, dx, dy, predicate=None):
+        """
+        Zwraca obiekty, z którymi zetknie się prostokąt przesuwany o (dx, dy), w kolejności kontaktu.
+        Dla szybkich pocisków, które w jednej klatce mogą przeskoczyć przez wroga.
+
+        Args:
+            rect: pygame.Rect w pozycji początkowej
+            dx: Przesunięcie na osi X
+            dy: Przesunięcie na osi Y
+            predicate: Funkcja predicate(kandydat) -> bool lub None
+
+        Returns:
+            Lista obiektów posortowana rosnąco po chwili kontaktu
+        """
+        # Obiekty jednokomórkowe są w komórkach swoich środków - margines obejmuje ich połowę
+        candidates = self.query_rect(get_swept_bounds(rect, dx, dy), margin=self.max_object_size // 2 + 1)
+        return get_swept_hits(candidates, rect, dx, dy, predicate)
+
     def get_objects_in_cell(self, cell_x, cell_y):
         """
         Zwraca obiekty w danej komórce.
@@ -163,9 +607,11 @@ class SpatialGrid:
         Returns:
             Lista obiektów w komórce
         """
-        if 0 <= cell_x < self.grid_width and 0 <= cell_y < self.grid_height:
-            return self.grid[(cell_x, cell_y)]
-        return []
+        return self.grid.get((cell_x, cell_y), [])
+
+    def get_object_count(self):
+        """Zwraca liczbę obiektów w siatce."""
+        return len(self.object_positions) + len(self.object_spans)
 
     def rebuild(self, objects):
         """
@@ -178,3 +624,90 @@ class SpatialGrid:
         for obj in objects:
             self.add_object(obj)
 
+    def get_stats(self):
+        """
+        Zwraca statystyki zajętości siatki i zapytań (do diagnostyki).
+
+        Returns:
+            Słownik: cell_size, objects, occupied_cells, mean_per_cell, max_per_cell,
+            mean_candidates (średnia z ostatniego okna pomiaru), retunes
+        """
+        occupied = [len(cell) for cell in self.grid.values() if cell]
+        return {
+            'cell_size': self.cell_size,
+            'objects': self.get_object_count(),
+            'occupied_cells': len(occupied),
+            'mean_per_cell': sum(occupied) / len(occupied) if occupied else 0.0,
+            'max_per_cell': max(occupied, default=0),
+            'mean_candidates': self.last_mean_candidates,
+            'retunes': self.retune_count,
+        }
+
+    def maybe_retune(self):
+        """
+        Zlicza klatkę i co tune_interval klatek sprawdza statystyki zapytań.
+        Jeśli auto_tune jest włączone, a średnia liczba kandydatów na zapytanie
+        wyszła poza target_candidates, przebudowuje siatkę z nowym rozmiarem komórki.
+        Skupisko (najgęstsza komórka ponad max_cell_occupancy) zmniejsza komórkę także przy
+        średniej w normie - ale nie przy średniej poniżej przedziału, żeby siatka nie oscylowała.
+        Wywołuj raz na klatkę, po aktualizacji pozycji obiektów.
+
+        Returns:
+            True jeśli rozmiar komórki został zmieniony, False w przeciwnym razie
+        """
+        self.frames_since_tune += 1
+        if self.frames_since_tune < self.tune_interval:
+            return False
+
+        queries = self.query_count
+        mean_candidates = self.candidate_count / queries if queries else 0.0
+        self.last_mean_candidates = mean_candidates
+        self.frames_since_tune = 0
+        self.query_count = 0
+        self.candidate_count = 0
+
+        if not self.auto_tune or not queries:
+            return False
+
+        target_min, target_max = self.target_candidates
+        if target_min <= mean_candidates <= target_max:
+            scale = 1.0
+        else:
+            # Liczba kandydatów rośnie z polem sąsiedztwa, czyli z kwadratem rozmiaru komórki
+            target = (target_min + target_max) / 2
+            scale = math.sqrt(target / mean_candidates) if mean_candidates else 2.0
+
+        # Średnia ukrywa skupiska - zapytania w najgęstszej komórce kosztują najwięcej
+        if self.max_cell_occupancy is not None and mean_candidates >= target_min:
+            max_per_cell = max((len(cell) for cell in self.grid.values()), default=0)
+            if max_per_cell > self.max_cell_occupancy:
+                scale = min(scale, math.sqrt(self.max_cell_occupancy / max_per_cell))
+
+        if scale == 1.0:
+            return False
+        scale = max(0.5, min(scale, 2.0))
+        lower = max(self.min_cell_size, self.max_object_size)
+        new_cell_size = int(max(lower, min(self.cell_size * scale, self.max_cell_size)))
+
+        # Pomiń drobne zmiany, żeby siatka nie oscylowała
+        if abs(new_cell_size - self.cell_size) < self.cell_size * 0.1:
+            return False
+
+        self.set_cell_size(new_cell_size)
+        self.retune_count += 1
+        return True
+
+    def set_cell_size(self, cell_size):
+        """
+        Zmienia rozmiar komórki i ponownie rozmieszcza wszystkie obiekty.
+
+        Args:
+            cell_size: Nowy rozmiar komórki w pikselach
+        """
+        multi_cell_ids = set(self.object_spans)
+        objects = self._deduplicate([obj for cell in self.grid.values() for obj in cell])
+
+        self._set_grid_size(cell_size)
+        self.clear()
+        for obj in objects:
+            self.add_object(obj, multi_cell=id(obj) in multi_cell_ids)
@@ -0,0 +1,158 @@
+"""
+Texture Atlas - łączenie sprite'ów w jedną teksturę.
+Pakuje obrazy z assets/gfx w jedną powierzchnię i udostępnia nazwane regiony (subsurface).
+"""
+import os
+import math
+import pygame
+from src.asset_cache import asset_cache, load_image
+
+
+class TextureAtlas:
+    """
+    Atlas tekstur złożony z wielu małych obrazów.
+    Obrazy są pakowane algorytmem półkowym (shelf packing): sortowane malejąco po wysokości
+    i układane w wierszach o stałej szerokości atlasu.
+    """
+
+    # Tło parallax jest duże i rysowane osobno, więc nie trafia do atlasu
+    DEFAULT_EXCLUDE = ('parallax-space-background.png',)
+
+    def __init__(self, padding=1):
+        """
+        Inicjalizuje TextureAtlas.
+
+        Args:
+            padding: Odstęp między regionami w pikselach (domyślnie 1)
+        """
+        self.padding = padding
+        self.surface = None
+
+        # Słownik: nazwa regionu -> pygame.Rect w atlasie
+        self.rects = {}
+        # Słownik: nazwa regionu -> subsurface atlasu
+        self.regions = {}
+
+    def _get_atlas_width(self, images):
+        """
+        Oblicza szerokość atlasu (potęga dwójki mieszcząca wszystkie obrazy).
+
+        Args:
+            images: Słownik nazwa -> pygame.Surface
+
+        Returns:
+            Szerokość atlasu w pikselach
+        """
+        total_area = 0
+        widest = 0
+        for image in images.values():
+            width = image.get_width() + self.padding
+            height = image.get_height() + self.padding
+            total_area += width * height
+            widest = max(widest, width)
+
+        target = max(widest, int(math.ceil(math.sqrt(total_area))))
+        width = 1
+        while width < target:
+            width *= 2
+        return width
+
+    def build(self, images):
+        """
+        Pakuje obrazy w jeden atlas.
+
+        Args:
+            images: Słownik nazwa -> pygame.Surface
+
+        Returns:
+            Powierzchnia atlasu
+        """
+        atlas_width = self._get_atlas_width(images)
+
+        # Sortuj malejąco po wysokości - półki są wtedy najciaśniej wypełnione
+        order = sorted(images.items(), key=lambda item: item[1].get_height(), reverse=True)
+
+        self.rects = {}
+        x = 0
+        y = 0
+        shelf_height = 0
+        for name, image in order:
+            width, height = image.get_size()
+            if x + width > atlas_width:
+                # Przejdź do nowej półki
+                x = 0
+                y += shelf_height + self.padding
+                shelf_height = 0
+            self.rects[name] = pygame.Rect(x, y, width, height)
+            x += width + self.padding
+            shelf_height = max(shelf_height, height)
+
+        atlas_height = y + shelf_height
+
+        self.surface = pygame.Surface((atlas_width, max(1, atlas_height)), pygame.SRCALPHA)
+        for name, image in images.items():
+            self.surface.blit(image, self.rects[name])
+
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+        self.regions = {name: self.surface.subsurface(rect) for name, rect in self.rects.items()}
+        return self.surface
+
+    def build_from_directory(self, directory, exclude=DEFAULT_EXCLUDE):
+        """
+        Pakuje wszystkie pliki PNG z katalogu.
+        Nazwą regionu jest ścieżka pliku (os.path.join(directory, nazwa_pliku)).
+        Obrazy są brane z AssetCache, więc wczytane przez preloader nie są dekodowane ponownie.
+
+        Args:
+            directory: Katalog z obrazami
+            exclude: Nazwy plików pomijanych przy pakowaniu
+
+        Returns:
+            Powierzchnia atlasu
+        """
+        images = {}
+        for filename in asset_cache.list_directory(directory):
+            if not filename.lower().endswith('.png') or filename in exclude:
+                continue
+            path = os.path.join(directory, filename)
+            images[path] = load_image(path)
+        return self.build(images)
+
+    def get_region(self, name):
+        """
+        Zwraca region atlasu o podanej nazwie.
+
+        Args:
+            name: Nazwa regionu
+
+        Returns:
+            Subsurface atlasu lub None, jeśli regionu nie ma
+        """
+        return self.regions.get(name)
+
+    def get_resident_bytes(self):
+        """Zwraca ilość pamięci zajmowanej przez atlas."""
+        if self.surface is None:
+            return 0
+        return self.surface.get_pitch() * self.surface.get_height()
+
+
+def blit_group(surface, objects, offset_x=0, offset_y=0):
+    """
+    Rysuje grupę obiektów jednym wywołaniem Surface.blits().
+
+    Args:
+        surface: Powierzchnia pygame do rysowania
+        objects: Obiekty z atrybutami image i rect
+        offset_x: Przesunięcie X odejmowane od pozycji (np. parallax)
+        offset_y: Przesunięcie Y odejmowane od pozycji (np. parallax)
+    """
+    if offset_x or offset_y:
+        surface.blits(
+            [(obj.image, (obj.rect.x - offset_x, obj.rect.y - offset_y)) for obj in objects],
+            doreturn=False
+        )
+    else:
+        surface.blits([(obj.image, obj.rect.topleft) for obj in objects], doreturn=False)
@@ -0,0 +1,121 @@
+"""
+Utils - funkcje pomocnicze geometrii kolizji.
+Test odcinka z prostokątem (metoda płyt) i test przesuwanego prostokąta (swept AABB)
+dla szybkich pocisków, które w jednej klatce mogłyby przeskoczyć przez wroga.
+"""
+import math
+import pygame
+
+
+def _get_slab_entry(start_x, start_y, dx, dy, left, top, right, bottom):
+    """
+    Oblicza moment wejścia punktu poruszającego się po odcinku do otwartego prostokąta.
+
+    Args:
+        start_x: Początkowa współrzędna X punktu
+        start_y: Początkowa współrzędna Y punktu
+        dx: Przesunięcie na osi X
+        dy: Przesunięcie na osi Y
+        left, top, right, bottom: Granice prostokąta (bez krawędzi, jak w Rect.colliderect)
+
+    Returns:
+        Ułamek odcinka t z przedziału [0, 1] lub None, jeśli odcinek nie wchodzi do prostokąta
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+    for start, delta, low, high in ((start_x, dx, left, right), (start_y, dy, top, bottom)):
+        if delta == 0:
+            # Ruch równoległy do płyty - punkt musi już być między jej krawędziami
+            if not low < start < high:
+                return None
+            continue
+        t_low = (low - start) / delta
+        t_high = (high - start) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        t_enter = max(t_enter, t_low)
+        t_exit = min(t_exit, t_high)
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+
+def segment_intersects_rect(x0, y0, x1, y1, rect):
+    """
+    Sprawdza, czy odcinek przecina wnętrze prostokąta.
+
+    Args:
+        x0, y0: Początek odcinka
+        x1, y1: Koniec odcinka
+        rect: pygame.Rect
+
+    Returns:
+        Ułamek odcinka t (0 = początek, 1 = koniec) w punkcie wejścia lub None
+    """
+    return _get_slab_entry(x0, y0, x1 - x0, y1 - y0, rect.left, rect.top, rect.right, rect.bottom)
+
+
+def sweep_rect(rect, dx, dy, target):
+    """
+    Sprawdza, czy prostokąt przesuwany o (dx, dy) zetknie się z nieruchomym prostokątem.
+    Test jest sprowadzony do odcinka przesuwającego lewy górny róg rect względem
+    celu poszerzonego o rozmiar rect (suma Minkowskiego).
+
+    Args:
+        rect: pygame.Rect w pozycji początkowej
+        dx: Przesunięcie na osi X
+        dy: Przesunięcie na osi Y
+        target: Nieruchomy pygame.Rect
+
+    Returns:
+        Ułamek ruchu t z przedziału [0, 1] w chwili pierwszego kontaktu lub None
+    """
+    return _get_slab_entry(
+        rect.left, rect.top, dx, dy,
+        target.left - rect.width, target.top - rect.height, target.right, target.bottom
+    )
+
+
+def get_swept_bounds(rect, dx, dy):
+    """
+    Zwraca prostokąt obejmujący cały ruch prostokąta o (dx, dy).
+
+    Args:
+        rect: pygame.Rect w pozycji początkowej
+        dx: Przesunięcie na osi X
+        dy: Przesunięcie na osi Y
+
+    Returns:
+        pygame.Rect obejmujący pozycję początkową i końcową
+    """
+    # Zaokrąglenie na zewnątrz - Rect.move obciąłby ułamkowe przesunięcie
+    left = math.floor(min(rect.left, rect.left + dx))
+    top = math.floor(min(rect.top, rect.top + dy))
+    right = math.ceil(max(rect.right, rect.right + dx))
+    bottom = math.ceil(max(rect.bottom, rect.bottom + dy))
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def get_swept_hits(candidates, rect, dx, dy, predicate=None):
+    """
+    Wybiera kandydatów, z którymi zetknie się przesuwany prostokąt, w kolejności kontaktu.
+
+    Args:
+        candidates: Obiekty z atrybutem rect (np. z broadphase.query_rect)
+        rect: pygame.Rect w pozycji początkowej
+        dx: Przesunięcie na osi X
+        dy: Przesunięcie na osi Y
+        predicate: Funkcja predicate(kandydat) -> bool lub None
+
+    Returns:
+        Lista obiektów posortowana rosnąco po chwili kontaktu
+    """
+    hits = []
+    for candidate in candidates:
+        if predicate is not None and not predicate(candidate):
+            continue
+        t = sweep_rect(rect, dx, dy, candidate.rect)
+        if t is not None:
+            hits.append((t, candidate))
+    hits.sort(key=lambda hit: hit[0])
+    return [candidate for _, candidate in hits]
@@ -0,0 +1,168 @@
+"""
+Wave Director - rozkłada spawny wrogów na wiele klatek.
+Krzywa trudności (interwał spawnu, liczba wrogów na falę, limit wrogów) i zdarzenia
+z osi czasu fal (np. nagłe wysypy wrogów) tylko dopisują spawny do kolejki.
+W każdej klatce z kolejki wykonuje się najwyżej max_spawns_per_frame spawnów
+(i opcjonalnie nie dłużej niż max_spawn_ms), więc duże fale nie dają skoków czasu klatki.
+"""
+from collections import deque
+import heapq
+import json
+import math
+import os
+import time
+
+DEFAULT_TIMELINE_PATH = os.path.join('assets', 'data', 'waves.json')
+
+
+def load_timeline(path):
+    """
+    Wczytuje oś czasu fal z pliku JSON.
+
+    Format: {"events": [{"time": 90, "count": 20, "archetype": "swarm", "repeat": 60, "until": 600}, ...]}
+    time - sekunda gry, count - liczba wrogów, archetype - nazwa typu wroga (opcjonalnie,
+    bez niej typ jest losowany jak dla krzywej fal), repeat - co ile sekund powtarzać (opcjonalnie),
+    until - do której sekundy powtarzać (opcjonalnie).
+
+    Args:
+        path: Ścieżka do pliku JSON
+
+    Returns:
+        Lista zdarzeń (słowników)
+    """
+    with open(path, 'r', encoding='utf-8') as timeline_file:
+        data = json.load(timeline_file)
+    events = data.get('events', [])
+    for event in events:
+        if 'time' not in event or 'count' not in event:
+            raise ValueError(f"Zdarzenie fali bez pola time lub count: {event}")
+    return events
+
+
+class WaveDirector:
+    """
+    Reżyser fal: krzywa trudności i oś czasu zamieniane na kolejkę spawnów z budżetem na klatkę.
+    """
+
+    def __init__(self, max_enemies=30, max_spawns_per_frame=2, max_spawn_ms=None, timeline=None):
+        """
+        Inicjalizuje WaveDirector.
+
+        Args:
+            max_enemies: Początkowa maksymalna liczba wrogów (domyślnie 30)
+            max_spawns_per_frame: Najwięcej spawnów w jednej klatce (domyślnie 2)
+            max_spawn_ms: Budżet czasu spawnów na klatkę w milisekundach (domyślnie None - bez limitu czasu)
+            timeline: Lista zdarzeń osi czasu (z load_timeline) lub None
+        """
+        self.base_max_enemies = max_enemies  # Bazowa liczba wrogów
+        self.max_enemies = max_enemies  # Dynamicznie skalowana maksymalna liczba wrogów
+        self.wave = 0
+        self.time_elapsed = 0.0
+        self.spawn_timer = 0.0
+        self.spawn_interval = 1.5  # Początkowy interwał spawnu (sekundy)
+        self.enemies_per_wave = 2  # Liczba wrogów na falę
+
+        # Budżet spawnów na klatkę
+        self.max_spawns_per_frame = max_spawns_per_frame
+        self.max_spawn_ms = max_spawn_ms
+
+        # Kolejka spawnów: serie [nazwa typu lub None, liczba wrogów] i łączna liczba czekających
+        self.queue = deque()
+        self.pending = 0
+        self.peak_pending = 0
+
+        # Kopiec zdarzeń osi czasu: (czas, numer, zdarzenie)
+        self.timeline = []
+        for order, event in enumerate(timeline or []):
+            heapq.heappush(self.timeline, (event['time'], order, event))
+        self.timeline_order = len(self.timeline)
+
+    def update(self, dt, live_count):
+        """
+        Przesuwa krzywą trudności i oś czasu, dopisując spawny do kolejki.
+
+        Args:
+            dt: Delta czasu od ostatniej klatki
+            live_count: Liczba aktywnych wrogów
+        """
+        self.time_elapsed += dt
+        self.spawn_timer += dt
+
+        # Zwiększaj trudność co 30 sekund, ale z bardziej płynną krzywą
+        # Używamy logarytmicznej funkcji zamiast liniowej, aby uniknąć gwałtownych skoków
+        if self.time_elapsed > 30 * (self.wave + 1):
+            self.wave += 1
+            # Logarytmiczna krzywa dla interwału spawnu (zmniejsza się wolniej)
+            # log(wave + 1) zapobiega zbyt szybkiemu zmniejszaniu się interwału
+            self.spawn_interval = max(0.3, 1.0 - math.log(self.wave + 1) * 0.15)
+            # Logarytmiczna krzywa dla liczby wrogów (rośnie wolniej)
+            self.enemies_per_wave = 3 + int(math.log(self.wave + 1) * 2)
+            # Dynamicznie skaluj maksymalną liczbę wrogów wraz z postępem fali
+            # Wzór: base_max_enemies + wave * 5 (np. 30 + 0*5 = 30, 30 + 1*5 = 35, itd.)
+            # Logarytmiczne skalowanie zapobiega zbyt szybkiemu wzrostowi
+            self.max_enemies = self.base_max_enemies + int(math.log(self.wave + 1) * 8)
+
+        # Fala z krzywej (jeśli razem z kolejką nie przekroczy limitu)
+        if self.spawn_timer >= self.spawn_interval and live_count + self.pending < self.max_enemies:
+            self._enqueue(self.enemies_per_wave)
+            self.spawn_timer = 0.0
+
+        # Zdarzenia z osi czasu - wysypy zaprojektowane ręcznie omijają limit wrogów
+        while self.timeline and self.timeline[0][0] <= self.time_elapsed:
+            event_time, _, event = heapq.heappop(self.timeline)
+            self._enqueue(event['count'], event.get('archetype'))
+            repeat = event.get('repeat')
+            if repeat:
+                next_time = event_time + repeat
+                if event.get('until') is None or next_time <= event['until']:
+                    heapq.heappush(self.timeline, (next_time, self.timeline_order, event))
+                    self.timeline_order += 1
+
+    def _enqueue(self, count, archetype=None):
+        """Dopisuje serię spawnów do kolejki (None = typ losowany przy spawnie)."""
+        if count <= 0:
+            return
+        self.queue.append([archetype, count])
+        self.pending += count
+        self.peak_pending = max(self.peak_pending, self.pending)
+
+    def spawn(self, spawn_function, *args):
+        """
+        Wykonuje spawny z kolejki w ramach budżetu klatki.
+
+        Args:
+            spawn_function: Funkcja tworząca jednego wroga, wywoływana jako spawn_function(archetype, *args),
+                gdzie archetype to nazwa typu z osi czasu lub None
+            *args: Dodatkowe argumenty dla spawn_function
+
+        Returns:
+            Liczba wykonanych spawnów
+        """
+        spawned = 0
+        start = time.perf_counter()
+        while self.pending > 0 and spawned < self.max_spawns_per_frame:
+            # Co najmniej jeden spawn na klatkę, żeby kolejka zawsze się opróżniała
+            if self.max_spawn_ms is not None and spawned > 0:
+                if (time.perf_counter() - start) * 1000 >= self.max_spawn_ms:
+                    break
+            run = self.queue[0]
+            spawn_function(run[0], *args)
+            run[1] -= 1
+            if run[1] == 0:
+                self.queue.popleft()
+            self.pending -= 1
+            spawned += 1
+        return spawned
+
+    def get_stats(self):
+        """
+        Zwraca statystyki kolejki (do diagnostyki).
+
+        Returns:
+            Słownik: wave, pending, peak_pending
+        """
+        return {
+            'wave': self.wave,
+            'pending': self.pending,
+            'peak_pending': self.peak_pending,
+        }
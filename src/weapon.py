@@ -1,4 +1,6 @@
+import math
 from src.projectile import Bullet
+from src.projectile_store import ProjectileStore
 
 
 class Weapon:
@@ -7,7 +9,8 @@ class Weapon:
     Zarządza tworzeniem i aktualizacją pocisków.
     """
 
-    def __init__(self, player_x, player_y, fire_rate=1.0, projectile_class=Bullet, projectile_config=None, damage=10, name="Domyślna"):
+    def __init__(self, player_x, player_y, fire_rate=1.0, projectile_class=Bullet, projectile_config=None, damage=10, name="Domyślna",
+                 projectile_store=None):
         """
         Inicjalizuje broń.
 
@@ -19,12 +22,17 @@ class Weapon:
             projectile_config: Słownik z konfiguracją pocisku (speed, damage, lifetime, itp.)
             damage: Obrażenia pocisku (domyślnie 10)
             name: Nazwa broni (domyślnie "Domyślna")
+            projectile_store: Wspólny ProjectileStore aktualizowany przez właściciela
+                (domyślnie własny magazyn aktualizowany w update())
         """
         self.name = name
         self.fire_rate = fire_rate  # Strzały na sekundę
         self.cooldown_duration = 1.0 / fire_rate  # Czas między strzałami
         self.cooldown_timer = 0.0
-        self.projectiles = []
+        # Pociski są w magazynie - broń trzyma tylko uchwyty do swoich pocisków
+        self.owns_store = projectile_store is None
+        self.projectile_store = ProjectileStore() if projectile_store is None else projectile_store
+        self.projectiles = set()
         self.player_x = player_x
         self.player_y = player_y
         self.damage = damage
@@ -37,6 +45,10 @@ class Weapon:
         # Sound manager (będzie ustawiony później)
         self.sound_manager = None
 
+        # Auto-celowanie: obiekt z get_nearest() (np. SpatialGrid z wrogami), ustawiany później
+        self.target_finder = None
+        self.aim_range = 600  # Maksymalna odległość celu w pikselach
+
     def update(self, dt, player_x, player_y, velocity_x=0, velocity_y=0):
         """
         Aktualizuje broń i zarządza cooldownem.
@@ -58,11 +70,9 @@ class Weapon:
             # Jeśli cooldown skończył się, strzelaj automatycznie
             self.shoot()
 
-        # Aktualizuj pociski
-        for projectile in self.projectiles[:]:
-            should_remove = projectile.update(dt)
-            if should_remove:
-                self.projectiles.remove(projectile)
+        # Aktualizuj pociski (wspólny magazyn aktualizuje jego właściciel)
+        if self.owns_store:
+            self.projectile_store.update(dt, player_x, player_y)
 
     def set_sound_manager(self, sound_manager):
         """
@@ -73,6 +83,34 @@ class Weapon:
         """
         self.sound_manager = sound_manager
 
+    def set_target_finder(self, target_finder):
+        """
+        Ustawia źródło celów dla auto-celowania.
+
+        Args:
+            target_finder: Obiekt z metodą get_nearest(x, y, max_distance) (np. SpatialGrid) lub None
+        """
+        self.target_finder = target_finder
+
+    def get_aim_direction(self):
+        """
+        Zwraca znormalizowany kierunek do najbliższego wroga w zasięgu.
+
+        Returns:
+            Krotka (direction_x, direction_y) lub None, jeśli brak celu
+        """
+        if self.target_finder is None:
+            return None
+        target = self.target_finder.get_nearest(self.player_x, self.player_y, max_distance=self.aim_range)
+        if target is None:
+            return None
+        dx = target.rect.centerx - self.player_x
+        dy = target.rect.centery - self.player_y
+        length = math.sqrt(dx**2 + dy**2)
+        if length == 0:
+            return None
+        return (dx / length, dy / length)
+
     def shoot(self):
         """Tworzy nowy pocisk na pozycji gracza z konfiguracją."""
         # Odtwórz dźwięk strzału
@@ -81,25 +119,30 @@ class Weapon:
 
         config = self.projectile_config.copy()
         config['weapon_source'] = self
+        # Celuj w najbliższego wroga, jeśli jest w zasięgu
+        aim_direction = self.get_aim_direction()
+        if aim_direction is not None:
+            config['direction_x'], config['direction_y'] = aim_direction
         projectile = self.projectile_class(self.player_x, self.player_y, **config)
-        self.projectiles.append(projectile)
+        self.projectile_store.add(projectile)
+        self.projectiles.add(projectile)
         self.cooldown_timer = self.cooldown_duration
 
     def get_projectiles(self):
-        """Zwraca listę pocisków."""
+        """Zwraca uchwyty pocisków tej broni (zbiór)."""
         return self.projectiles
 
     def get_bullets(self):
-        """Zwraca listę pocisków (alias dla kompatybilności wstecznej)."""
+        """Zwraca uchwyty pocisków tej broni (alias dla kompatybilności wstecznej)."""
         return self.projectiles
 
     def remove_projectile(self, projectile):
-        """Usuwa pocisk z listy."""
+        """Oznacza pocisk do usunięcia z magazynu (uchwyt znika przy ProjectileStore.compact())."""
         if projectile in self.projectiles:
-            self.projectiles.remove(projectile)
+            self.projectile_store.mark_removed(projectile)
 
     def remove_bullet(self, bullet):
-        """Usuwa pocisk z listy (alias dla kompatybilności wstecznej)."""
+        """Oznacza pocisk do usunięcia (alias dla kompatybilności wstecznej)."""
         self.remove_projectile(bullet)
 
     def set_damage(self, damage):
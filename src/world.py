@@ -0,0 +1,311 @@
+"""
+World - świat większy niż ekran, podzielony na kawałki (chunki).
+Kamera podąża za graczem, a aktywne są tylko kawałki w jej pobliżu.
+Byty z kawałków, które zasnęły, są odkładane do list tych kawałków (bez aktualizacji,
+rysowania i kolizji) i wracają do menedżerów, gdy kamera się zbliży.
+Koszt klatki zależy więc od liczby aktywnych kawałków, a nie od rozmiaru świata.
+"""
+import pygame
+
+
+class Chunk:
+    """
+    Kawałek świata. Przechowuje uśpione byty, pogrupowane według rodzaju
+    (np. 'enemies', 'gems'). Aktywne byty należą do swoich menedżerów.
+    """
+
+    def __init__(self, chunk_x, chunk_y):
+        """
+        Inicjalizuje Chunk.
+
+        Args:
+            chunk_x: Współrzędna X kawałka
+            chunk_y: Współrzędna Y kawałka
+        """
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        # Słownik: rodzaj bytu -> lista uśpionych bytów
+        self.sleeping = {}
+
+    def get_sleeping(self, kind):
+        """Zwraca listę uśpionych bytów danego rodzaju (tworzy ją przy pierwszym użyciu)."""
+        return self.sleeping.setdefault(kind, [])
+
+
+class World:
+    """
+    Świat o podanym rozmiarze z kamerą i strumieniowaniem kawałków.
+    Kawałki są tworzone przy pierwszym użyciu, więc pusty obszar świata nic nie kosztuje.
+    """
+
+    def __init__(self, width, height, screen_width, screen_height, chunk_size=512, wake_margin=1):
+        """
+        Inicjalizuje World.
+
+        Args:
+            width: Szerokość świata w pikselach
+            height: Wysokość świata w pikselach
+            screen_width: Szerokość ekranu (widoku kamery)
+            screen_height: Wysokość ekranu (widoku kamery)
+            chunk_size: Bok kawałka w pikselach (domyślnie 512)
+            wake_margin: Ile kawałków poza widokiem kamery pozostaje aktywnych (domyślnie 1)
+        """
+        self.width = width
+        self.height = height
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.chunk_size = chunk_size
+        self.wake_margin = wake_margin
+
+        # Słownik: (chunk_x, chunk_y) -> Chunk
+        self.chunks = {}
+
+        # Lewy górny róg widoku kamery w pikselach świata
+        self.camera_x = 0
+        self.camera_y = 0
+
+        # Zakres aktywnych kawałków (min_x, min_y, max_x, max_y) - włącznie
+        self.active_span = None
+        # Zwiększany przy każdej zmianie zakresu aktywnych kawałków
+        self.activation_version = 0
+        # Słownik: rodzaj bytu -> wersja, dla której byty były ostatnio strumieniowane
+        self.streamed_versions = {}
+        # Liczba uśpionych bytów we wszystkich kawałkach i według rodzaju
+        self.sleeping_count = 0
+        self.sleeping_counts = {}
+
+    def get_center(self):
+        """Zwraca środek świata."""
+        return (self.width // 2, self.height // 2)
+
+    def clamp_rect(self, rect):
+        """
+        Przesuwa prostokąt do wnętrza świata.
+
+        Args:
+            rect: pygame.Rect (modyfikowany w miejscu)
+
+        Returns:
+            Krotka (clamped_x, clamped_y) - czy prostokąt został przesunięty na danej osi
+        """
+        clamped_x = clamped_y = False
+        if rect.left < 0:
+            rect.left = 0
+            clamped_x = True
+        elif rect.right > self.width:
+            rect.right = self.width
+            clamped_x = True
+        if rect.top < 0:
+            rect.top = 0
+            clamped_y = True
+        elif rect.bottom > self.height:
+            rect.bottom = self.height
+            clamped_y = True
+        return clamped_x, clamped_y
+
+    # ------------------------------------------------------------------
+    # Kamera
+    # ------------------------------------------------------------------
+
+    def update_camera(self, target_rect):
+        """
+        Ustawia kamerę na środku celu (z ograniczeniem do świata) i przelicza aktywne kawałki.
+        Wywołuj raz na klatkę, po ruchu gracza.
+
+        Args:
+            target_rect: pygame.Rect śledzonego obiektu (gracza)
+
+        Returns:
+            True jeśli zakres aktywnych kawałków się zmienił
+        """
+        self.camera_x = max(0, min(target_rect.centerx - self.screen_width // 2, self.width - self.screen_width))
+        self.camera_y = max(0, min(target_rect.centery - self.screen_height // 2, self.height - self.screen_height))
+
+        margin = self.wake_margin
+        min_x, min_y = self.get_chunk_coords(self.camera_x, self.camera_y)
+        max_x, max_y = self.get_chunk_coords(self.camera_x + self.screen_width - 1, self.camera_y + self.screen_height - 1)
+        span = (min_x - margin, min_y - margin, max_x + margin, max_y + margin)
+        if span == self.active_span:
+            return False
+        self.active_span = span
+        self.activation_version += 1
+        return True
+
+    def get_camera_offset(self):
+        """Zwraca przesunięcie kamery (odejmowane od pozycji przy rysowaniu)."""
+        return (self.camera_x, self.camera_y)
+
+    def get_view_rect(self):
+        """Zwraca widok kamery jako pygame.Rect w pikselach świata."""
+        return pygame.Rect(self.camera_x, self.camera_y, self.screen_width, self.screen_height)
+
+    def get_active_rect(self):
+        """Zwraca obszar aktywnych kawałków jako pygame.Rect w pikselach świata (ograniczony do świata)."""
+        if self.active_span is None:
+            return pygame.Rect(0, 0, self.width, self.height)
+        min_x, min_y, max_x, max_y = self.active_span
+        size = self.chunk_size
+        rect = pygame.Rect(min_x * size, min_y * size, (max_x - min_x + 1) * size, (max_y - min_y + 1) * size)
+        return rect.clip(pygame.Rect(0, 0, self.width, self.height))
+
+    def is_visible(self, rect):
+        """
+        Sprawdza, czy prostokąt jest w widoku kamery.
+
+        Args:
+            rect: pygame.Rect w pikselach świata
+
+        Returns:
+            True jeśli choć część prostokąta jest widoczna
+        """
+        return (
+            rect.right >= self.camera_x
+            and rect.left <= self.camera_x + self.screen_width
+            and rect.bottom >= self.camera_y
+            and rect.top <= self.camera_y + self.screen_height
+        )
+
+    # ------------------------------------------------------------------
+    # Kawałki
+    # ------------------------------------------------------------------
+
+    def get_chunk_coords(self, x, y):
+        """Zwraca współrzędne kawałka zawierającego punkt."""
+        return (int(x // self.chunk_size), int(y // self.chunk_size))
+
+    def get_chunk(self, chunk_x, chunk_y):
+        """Zwraca kawałek o podanych współrzędnych (tworzy go przy pierwszym użyciu)."""
+        key = (chunk_x, chunk_y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = Chunk(chunk_x, chunk_y)
+            self.chunks[key] = chunk
+        return chunk
+
+    def is_active_at(self, x, y):
+        """
+        Sprawdza, czy punkt leży w aktywnym kawałku.
+
+        Args:
+            x: Współrzędna X w pikselach świata
+            y: Współrzędna Y w pikselach świata
+
+        Returns:
+            True jeśli kawałek punktu jest aktywny (przed pierwszym update_camera wszystko jest aktywne)
+        """
+        if self.active_span is None:
+            return True
+        min_x, min_y, max_x, max_y = self.active_span
+        chunk_x, chunk_y = self.get_chunk_coords(x, y)
+        return min_x <= chunk_x <= max_x and min_y <= chunk_y <= max_y
+
+    def iter_active_chunks(self):
+        """Zwraca istniejące kawałki z aktywnego zakresu (bez tworzenia nowych)."""
+        if self.active_span is None:
+            return
+        min_x, min_y, max_x, max_y = self.active_span
+        chunks = self.chunks
+        for chunk_x in range(min_x, max_x + 1):
+            for chunk_y in range(min_y, max_y + 1):
+                chunk = chunks.get((chunk_x, chunk_y))
+                if chunk is not None:
+                    yield chunk
+
+    def stream(self, kind, objects, on_sleep=None, on_wake=None):
+        """
+        Usypia byty spoza aktywnych kawałków i budzi byty z kawałków, które stały się aktywne.
+        Nic nie robi, jeśli zakres aktywnych kawałków nie zmienił się od ostatniego wywołania
+        dla danego rodzaju, więc można wywoływać w każdej klatce.
+
+        Args:
+            kind: Rodzaj bytów (np. 'enemies') - nazwa listy w kawałkach
+            objects: Lista aktywnych bytów z atrybutem rect
+            on_sleep: Funkcja on_sleep(obj) wywoływana dla usypianych bytów lub None
+            on_wake: Funkcja on_wake(obj) wywoływana dla budzonych bytów lub None
+
+        Returns:
+            Nowa lista aktywnych bytów (lub ta sama lista, jeśli nic się nie zmieniło)
+        """
+        if self.streamed_versions.get(kind) == self.activation_version:
+            return objects
+        self.streamed_versions[kind] = self.activation_version
+
+        slept = 0
+        active = []
+        for obj in objects:
+            x, y = obj.rect.center
+            if self.is_active_at(x, y):
+                active.append(obj)
+            else:
+                self.get_chunk(*self.get_chunk_coords(x, y)).get_sleeping(kind).append(obj)
+                slept += 1
+                if on_sleep is not None:
+                    on_sleep(obj)
+
+        for chunk in self.iter_active_chunks():
+            sleeping = chunk.sleeping.get(kind)
+            if not sleeping:
+                continue
+            if on_wake is not None:
+                for obj in sleeping:
+                    on_wake(obj)
+            active.extend(sleeping)
+            slept -= len(sleeping)
+            sleeping.clear()
+
+        self.sleeping_count += slept
+        self.sleeping_counts[kind] = self.sleeping_counts.get(kind, 0) + slept
+        return active
+
+    def get_sleeping_count(self, kind):
+        """Zwraca liczbę uśpionych bytów danego rodzaju we wszystkich kawałkach."""
+        return self.sleeping_counts.get(kind, 0)
+
+    def evict_sleeping(self, kind, count):
+        """
+        Wyjmuje uśpione byty z kawałków najdalszych od kamery, np. aby oddać je do puli.
+        Wyjęte byty nie wrócą już przy budzeniu kawałków.
+
+        Args:
+            kind: Rodzaj bytów (np. 'enemies')
+            count: Najwięcej bytów do wyjęcia
+
+        Returns:
+            Lista wyjętych bytów
+        """
+        if count <= 0 or not self.sleeping_counts.get(kind):
+            return []
+        center_x, center_y = self.get_chunk_coords(
+            self.camera_x + self.screen_width // 2, self.camera_y + self.screen_height // 2
+        )
+        chunks = [chunk for chunk in self.chunks.values() if chunk.sleeping.get(kind)]
+        chunks.sort(key=lambda chunk: (chunk.chunk_x - center_x) ** 2 + (chunk.chunk_y - center_y) ** 2, reverse=True)
+
+        evicted = []
+        for chunk in chunks:
+            sleeping = chunk.sleeping[kind]
+            taken = min(count - len(evicted), len(sleeping))
+            evicted.extend(sleeping[len(sleeping) - taken:])
+            del sleeping[len(sleeping) - taken:]
+            if len(evicted) == count:
+                break
+        self.sleeping_count -= len(evicted)
+        self.sleeping_counts[kind] -= len(evicted)
+        return evicted
+
+    def get_stats(self):
+        """
+        Zwraca statystyki kawałków (do diagnostyki).
+
+        Returns:
+            Słownik: chunks (utworzone), active_chunks, sleeping (uśpione byty)
+        """
+        active_chunks = 0
+        if self.active_span is not None:
+            min_x, min_y, max_x, max_y = self.active_span
+            active_chunks = (max_x - min_x + 1) * (max_y - min_y + 1)
+        return {
+            'chunks': len(self.chunks),
+            'active_chunks': active_chunks,
+            'sleeping': self.sleeping_count,
+        }
@@ -1,6 +1,7 @@
 import pygame
 import os
 import math
+from src.asset_cache import load_image
 
 
 class XPGem:
@@ -22,7 +23,8 @@ class XPGem:
         if image_path is None:
             image_path = os.path.join('assets', 'gfx', 'crystal.png')
 
-        self.image = pygame.image.load(image_path)
+        # Obraz współdzielony przez wszystkie klejnoty (tylko do odczytu)
+        self.image = load_image(image_path)
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
 
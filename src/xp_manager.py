@@ -1,7 +1,7 @@
 import random
 import math
 from src.xp_gem import XPGem
-from src.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from src import settings
 
 
 class XPManager:
@@ -10,9 +10,17 @@ class XPManager:
     Odpowiada za spawnowanie, aktualizację i zbieranie klejnotów.
     """
 
-    def __init__(self):
-        """Inicjalizuje XPManager."""
+    def __init__(self, world=None):
+        """
+        Inicjalizuje XPManager.
+
+        Args:
+            world: World, w którego kawałkach zasypiają klejnoty spoza kamery (opcjonalnie);
+                bez świata klejnoty poza ekranem są usuwane
+        """
+        # Aktywne klejnoty - uśpione są w kawałkach świata
         self.gems = []
+        self.world = world
 
     def spawn_gem(self, x, y, xp_value=10):
         """
@@ -60,6 +68,10 @@ class XPManager:
         collected_gems = []
         magnet_range = player.get_magnet_range()
 
+        # Klejnoty z oddalonych kawałków zasypiają zamiast znikać
+        if self.world is not None:
+            self.gems = self.world.stream('gems', self.gems)
+
         for gem in self.gems[:]:
             # Aktualizuj klejnot (przyciąganie, ruch) z dynamicznym zasięgiem magnesu
             gem.update(dt, player.rect.centerx, player.rect.centery, magnet_range=magnet_range)
@@ -69,15 +81,15 @@ class XPManager:
                 collected_xp += gem.xp_value
                 collected_gems.append(gem)
                 self.gems.remove(gem)
-            # Usuń klejnot, jeśli wyszedł poza ekran
-            elif gem.is_off_screen(SCREEN_WIDTH, SCREEN_HEIGHT):
+            # Usuń klejnot, jeśli wyszedł poza ekran (tylko bez świata)
+            elif self.world is None and gem.is_off_screen(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT):
                 self.gems.remove(gem)
 
         return collected_xp, collected_gems
 
     def get_gems(self):
         """
-        Zwraca listę wszystkich klejnotów.
+        Zwraca listę aktywnych klejnotów.
 
         Returns:
             Lista klejnotów
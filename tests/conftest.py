@@ -0,0 +1,20 @@
+"""
+Wspólna konfiguracja testów: pygame bez okna i dźwięku, import pakietu src z katalogu głównego repozytorium.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    """Uruchamia test w katalogu głównym, bo ścieżki grafik (assets/gfx/...) są względne."""
+    monkeypatch.chdir(ROOT)
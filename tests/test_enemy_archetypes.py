@@ -0,0 +1,25 @@
+"""
+Testy Enemy.from_archetype - widok dostaje przeskalowaną grafikę typu bez wczytywania nieprzeskalowanego sprite'a.
+"""
+import pytest
+
+import src.entity
+from src.enemy import Enemy
+from src.enemy_archetypes import ArchetypeTable
+
+
+def test_from_archetype_uses_scaled_image_without_loading_sprite(monkeypatch):
+    archetypes = ArchetypeTable([{'name': 'tiny', 'size': [24, 16], 'health': 7, 'speed': 150}])
+    image = archetypes.get_image(0)
+
+    def fail_load(path):
+        raise AssertionError(f"Niepotrzebnie wczytano {path}")
+
+    monkeypatch.setattr(src.entity, 'load_image', fail_load)
+    enemy = Enemy.from_archetype(archetypes, 0, 30, 40)
+
+    assert enemy.image is image
+    assert enemy.rect == (30, 40, 24, 16)
+    assert (enemy.width, enemy.height) == (24, 16)
+    assert enemy.health == pytest.approx(7)
+    assert enemy.max_velocity_x == pytest.approx(150)
@@ -0,0 +1,141 @@
+"""
+Testy EnemyStore - swap-remove i compact muszą utrzymywać store_index widoków zgodny z tablicami.
+"""
+import numpy as np
+import pytest
+
+from src.enemy import Enemy
+from src.enemy_store import EnemyStore
+
+
+def _make_store(count):
+    store = EnemyStore(capacity=2)
+    enemies = []
+    for index in range(count):
+        enemy = Enemy(index * 10, index * 20, health=100 + index)
+        store.add(enemy)
+        enemies.append(enemy)
+    return store, enemies
+
+
+def _assert_consistent(store):
+    assert len(store.enemies) == store.count
+    for index, enemy in enumerate(store.enemies):
+        assert enemy.store is store
+        assert enemy.store_index == index
+        assert store.x[index] == enemy.rect.x
+        assert store.health[index] == enemy.health
+
+
+def test_add_grows_arrays():
+    store, _ = _make_store(5)
+    assert store.capacity >= 5
+    _assert_consistent(store)
+
+
+def test_remove_moves_last_enemy_into_gap():
+    store, enemies = _make_store(4)
+    enemies[1].health = 7
+
+    assert store.remove(enemies[1])
+    assert store.count == 3
+    assert store.enemies[1] is enemies[3]
+    assert enemies[3].store_index == 1
+    _assert_consistent(store)
+    # Usunięty wróg zachowuje swój stan poza magazynem
+    assert enemies[1].store is None
+    assert enemies[1].health == 7
+
+
+def test_remove_last_and_unknown_enemy():
+    store, enemies = _make_store(3)
+    assert store.remove(enemies[2])
+    assert store.enemies == enemies[:2]
+    assert not store.remove(enemies[2])
+    assert not store.remove(Enemy(0, 0))
+    _assert_consistent(store)
+
+
+def test_remove_keeps_removed_flag_of_moved_enemy():
+    store, enemies = _make_store(3)
+    store.mark_removed(enemies[2])
+    store.remove(enemies[0])
+    # Oznaczony wróg przeniesiony na indeks 0 nadal jest do usunięcia
+    assert store.removed[0]
+    store.compact()
+    assert store.enemies == [enemies[1]]
+    _assert_consistent(store)
+
+
+def test_compact_drops_dead_and_marked_enemies():
+    store, enemies = _make_store(5)
+    enemies[1].health = 0
+    enemies[3].health = -5
+    store.mark_removed(enemies[4])
+
+    dead = store.compact()
+
+    assert dead == [enemies[1], enemies[3]]
+    assert store.enemies == [enemies[0], enemies[2]]
+    assert all(enemy.store is None for enemy in (enemies[1], enemies[3], enemies[4]))
+    assert not store.removed[:store.count].any()
+    _assert_consistent(store)
+
+
+def test_compact_without_changes_returns_empty():
+    store, enemies = _make_store(3)
+    assert store.compact() == []
+    assert store.enemies == enemies
+    _assert_consistent(store)
+
+
+def test_health_reads_through_store_after_remove():
+    store, enemies = _make_store(3)
+    store.remove(enemies[0])
+    enemies[2].health = 42
+    assert store.health[enemies[2].store_index] == pytest.approx(42)
+
+
+def _make_lod_store():
+    store = EnemyStore()
+    positions = [(100, 100), (130, 110), (900, 400), (915, 420), (1500, 1500), (400, 1200)]
+    enemies = [Enemy(x, y) for x, y in positions]
+    # Oddział: przywódca 2 (pomijany w kroku), podwładny 3 z miejscem w szyku
+    enemies[2].join_squad(7, leader=True)
+    enemies[3].join_squad(7, formation_x=40, formation_y=0)
+    for enemy in enemies:
+        store.add(enemy)
+    return store
+
+
+def test_step_with_indices_matches_zero_dt_for_skipped_rows():
+    full = _make_lod_store()
+    partial = _make_lod_store()
+    updated = np.array([0, 3, 5])
+    dt = np.array([0.016, 0.032, 0.064])
+    full_dt = np.zeros(full.count)
+    full_dt[updated] = dt
+
+    full.apply_separation(full_dt, 40, 300, cohesion=20)
+    full.step(full_dt, 1000, 1000, 3000, 3000)
+    partial.apply_separation(dt, 40, 300, cohesion=20, indices=updated)
+    partial.step(dt, 1000, 1000, 3000, 3000, indices=updated)
+
+    for name in ('x', 'y', 'velocity_x', 'velocity_y'):
+        assert np.allclose(getattr(partial, name)[:partial.count], getattr(full, name)[:full.count])
+    # Pominięci nie ruszyli się wcale
+    skipped = [1, 2, 4]
+    assert np.all(partial.velocity_x[skipped] == 0)
+
+
+def test_schedule_lod_returns_dt_of_updated_rows_only():
+    store = _make_lod_store()
+    bands = [(300, 1), (None, 4)]
+    total = np.zeros(store.count)
+    for frame in range(1, 9):
+        step_dt, updated = store.schedule_lod(0.01, 100, 100, bands, frame)
+        assert len(step_dt) == len(updated)
+        total[updated] += step_dt
+    # Czas z aktualizacji i czas czekający na następną sumują się do czasu wszystkich klatek
+    assert np.allclose(total + store.pending_dt[:store.count], 0.08)
+    assert np.all(total > 0)
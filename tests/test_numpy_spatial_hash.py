@@ -0,0 +1,66 @@
+"""
+Testy NumpySpatialHash - zapytania po usunięciu obiektów, gdy indeks czeka na przebudowę.
+"""
+import numpy as np
+import pygame
+
+from src.numpy_spatial_hash import NumpySpatialHash
+
+
+class _Box:
+    """Minimalny obiekt z rect, jak wrogowie w broadphase."""
+
+    def __init__(self, x, y, size=20):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+def _make_hash(count):
+    spatial_hash = NumpySpatialHash(1000, 1000, cell_size=100)
+    boxes = [_Box(100 + index * 30, 100) for index in range(count)]
+    for box in boxes:
+        spatial_hash.add_object(box)
+    spatial_hash.build()
+    return spatial_hash, boxes
+
+
+def test_queries_after_remove_with_dirty_index():
+    spatial_hash, boxes = _make_hash(5)
+    spatial_hash.remove_object(boxes[0])
+    spatial_hash.remove_object(boxes[2])
+    spatial_hash.update_object(boxes[1])  # indeks do przebudowy przy zapytaniu
+    expected = [boxes[1], boxes[3], boxes[4]]
+
+    assert spatial_hash.dirty
+    assert spatial_hash.get_within_radius(100, 110, 500) == expected
+    assert spatial_hash.get_k_nearest(100, 110, 5) == expected
+    assert spatial_hash.get_nearest(100, 110) is boxes[1]
+
+
+def test_queries_after_remove_without_rebuild():
+    spatial_hash, boxes = _make_hash(4)
+    spatial_hash.remove_object(boxes[1])
+
+    assert not spatial_hash.dirty
+    assert spatial_hash.get_within_radius(100, 110, 500) == [boxes[0], boxes[2], boxes[3]]
+    assert boxes[1] not in spatial_hash.query_rect(pygame.Rect(0, 0, 400, 400))
+    assert boxes[1] not in spatial_hash.get_nearby_objects(boxes[0])
+    candidates = spatial_hash.query_batch_objects([_Box(100, 100, 80)], exact=True)
+    assert candidates == [[boxes[0], boxes[2]]]
+    assert spatial_hash.get_object_count() == 3
+
+
+def test_rebuild_from_rects_matches_build_from_objects():
+    boxes = [_Box(x, y, size) for x, y, size in ((50, 50, 20), (420, 80, 300), (60, 70, 20), (900, 900, 40))]
+    from_objects = NumpySpatialHash(1000, 1000, cell_size=100)
+    for box in boxes:
+        from_objects.add_object(box)
+    from_objects.build()
+    from_rects = NumpySpatialHash(1000, 1000, cell_size=100)
+    from_rects.rebuild_from_rects(boxes, np.array([box.rect[:] for box in boxes], dtype=np.float64))
+
+    for spatial_hash in (from_objects, from_rects):
+        # Obiekty jednej komórki leżą obok siebie w kolejności dodania
+        assert spatial_hash.get_objects_in_cell(0, 0) == [boxes[0], boxes[2]]
+        assert spatial_hash.query_batch_objects([_Box(500, 200, 10)], exact=True) == [[boxes[1]]]
+        spatial_hash.remove_object(boxes[0])
+        assert spatial_hash.get_objects_in_cell(0, 0) == [boxes[2]]
@@ -0,0 +1,103 @@
+"""
+Testy ProjectileStore.compact - usunięte pociski znikają z tablic i ze zbioru projectiles broni.
+"""
+import pygame
+import pytest
+
+from src.active_weapons import LaserWeapon
+from src.projectile import Bullet
+from src.projectile_store import ProjectileStore
+from src.weapon import Weapon
+
+
+def _assert_consistent(store):
+    assert len(store.projectiles) == store.count
+    for index, projectile in enumerate(store.projectiles):
+        assert projectile.store is store
+        assert projectile.store_index == index
+        assert store.x[index] == projectile.rect.x
+
+
+def _shoot(weapon, count):
+    for _ in range(count):
+        weapon.shoot()
+    return list(weapon.projectiles)
+
+
+def test_compact_discards_handle_from_weapon():
+    weapon = Weapon(100, 100)
+    store = weapon.projectile_store
+    projectiles = _shoot(weapon, 3)
+    target = store.projectiles[1]
+
+    weapon.remove_projectile(target)
+    # Oznaczenie nie zmienia indeksów ani uchwytów do czasu compact()
+    assert target in weapon.projectiles
+    assert store.count == 3
+
+    gone = store.compact()
+
+    assert gone == [target]
+    assert target not in weapon.projectiles
+    assert weapon.projectiles == set(projectiles) - {target}
+    assert target.store is None
+    _assert_consistent(store)
+
+
+def test_compact_with_shared_store_discards_from_each_weapon():
+    store = ProjectileStore(capacity=2)
+    gun = Weapon(100, 100, projectile_store=store)
+    laser = LaserWeapon(100, 100, projectile_store=store)
+    _shoot(gun, 2)
+    _shoot(laser, 2)
+    gun_target = next(iter(gun.projectiles))
+    laser_target = next(iter(laser.projectiles))
+
+    gun.remove_projectile(gun_target)
+    laser.remove_projectile(laser_target)
+    store.compact()
+
+    assert len(gun.projectiles) == 1 and gun_target not in gun.projectiles
+    assert len(laser.projectiles) == 1 and laser_target not in laser.projectiles
+    assert set(store.projectiles) == gun.projectiles | laser.projectiles
+    _assert_consistent(store)
+
+
+def test_remove_projectile_ignores_other_weapons_projectiles():
+    store = ProjectileStore()
+    gun = Weapon(100, 100, projectile_store=store)
+    other = Weapon(100, 100, projectile_store=store)
+    _shoot(gun, 1)
+    _shoot(other, 1)
+
+    gun.remove_projectile(next(iter(other.projectiles)))
+
+    assert store.compact() == []
+    assert len(other.projectiles) == 1
+
+
+def test_compact_keeps_state_of_removed_projectile():
+    store = ProjectileStore()
+    bullet = Bullet(0, 0, speed=100, damage=12, direction_x=1, direction_y=0)
+    store.add(bullet)
+    store.step(0.5, 0, 0)
+    store.mark_removed(bullet)
+    store.compact()
+
+    assert bullet.store is None
+    assert bullet.rect.x == 50
+    assert bullet.damage == pytest.approx(12)
+    assert bullet.elapsed_time == pytest.approx(0.5)
+
+
+def test_cull_and_compact_drop_projectiles_outside_view():
+    weapon = Weapon(100, 100)
+    store = weapon.projectile_store
+    _shoot(weapon, 2)
+    store.update(0.1, 0, 0)
+    assert len(weapon.projectiles) == 2
+
+    store.cull(pygame.Rect(-1000, -1000, 10, 10))
+    store.compact()
+    assert weapon.projectiles == set()
+    assert store.count == 0
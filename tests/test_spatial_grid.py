@@ -0,0 +1,52 @@
+"""
+Testy SpatialGrid.maybe_retune - skupisko w jednej komórce zmniejsza komórkę przy średniej w normie.
+"""
+import pygame
+
+from src.spatial_grid import SpatialGrid
+
+
+class _Box:
+    """Minimalny obiekt z rect, jak wrogowie w siatce."""
+
+    def __init__(self, x, y, size=10):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+def _make_grid(max_cell_occupancy):
+    grid = SpatialGrid(2000, 2000, cell_size=200, auto_tune=True, target_candidates=(4, 16),
+                       min_cell_size=32, max_cell_size=400, tune_interval=1,
+                       max_cell_occupancy=max_cell_occupancy)
+    # Skupisko 40 obiektów w jednej komórce i rzadkie obiekty wokół
+    boxes = [_Box(1000 + (index % 8) * 20, 1000 + (index // 8) * 20) for index in range(40)]
+    boxes += [_Box(x, 200) for x in range(100, 2000, 200)]
+    for box in boxes:
+        grid.add_object(box)
+    return grid, boxes
+
+
+def _record_queries(grid, count, candidates):
+    grid.query_count += count
+    grid.candidate_count += count * candidates
+
+
+def test_dense_cell_shrinks_grid_with_mean_in_range():
+    grid, _ = _make_grid(max_cell_occupancy=10)
+    _record_queries(grid, 10, 8)
+
+    assert grid.maybe_retune()
+    assert grid.cell_size == 100  # sqrt(10 / 40) = 0.5
+    assert grid.get_stats()['max_per_cell'] < 40
+
+
+def test_dense_cell_ignored_without_limit_or_with_low_mean():
+    grid, _ = _make_grid(max_cell_occupancy=None)
+    _record_queries(grid, 10, 8)
+    assert not grid.maybe_retune()
+    assert grid.cell_size == 200
+
+    # Przy średniej poniżej przedziału siatka rośnie mimo skupiska
+    grid, _ = _make_grid(max_cell_occupancy=10)
+    _record_queries(grid, 10, 1)
+    assert grid.maybe_retune()
+    assert grid.cell_size == 400
@@ -0,0 +1,89 @@
+"""
+Testy geometrii kolizji z src/utils.py - wejście i wyjście z płyt na krawędziach, zerowe przesunięcie.
+"""
+import pygame
+import pytest
+
+from src.utils import get_swept_hits, segment_intersects_rect, sweep_rect
+
+
+class _Box:
+    """Minimalny obiekt z rect, jak kandydaci z broadphase."""
+
+    def __init__(self, x, y, width, height):
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+RECT = pygame.Rect(10, 10, 10, 10)  # wnętrze: 10 < x < 20, 10 < y < 20
+
+
+def test_segment_entry_fraction():
+    assert segment_intersects_rect(0, 15, 40, 15, RECT) == pytest.approx(0.25)
+
+
+def test_segment_starting_inside_enters_at_zero():
+    assert segment_intersects_rect(15, 15, 40, 15, RECT) == 0.0
+
+
+def test_segment_ending_on_left_edge_misses():
+    # Krawędzie nie należą do wnętrza (jak w Rect.colliderect)
+    assert segment_intersects_rect(0, 15, 10, 15, RECT) is None
+
+
+def test_segment_starting_on_right_edge_and_leaving_misses():
+    assert segment_intersects_rect(20, 15, 40, 15, RECT) is None
+
+
+def test_segment_along_edge_misses():
+    # Ruch równoległy po krawędzi górnej - punkt nigdy nie jest ściśle między top i bottom
+    assert segment_intersects_rect(0, 10, 40, 10, RECT) is None
+
+
+def test_segment_beyond_far_edge_does_not_wrap():
+    assert segment_intersects_rect(25, 15, 40, 15, RECT) is None
+
+
+def test_zero_length_segment_inside_and_outside():
+    assert segment_intersects_rect(15, 15, 15, 15, RECT) == 0.0
+    assert segment_intersects_rect(5, 15, 5, 15, RECT) is None
+    assert segment_intersects_rect(10, 15, 10, 15, RECT) is None
+
+
+def test_sweep_rect_touching_target_does_not_hit():
+    rect = pygame.Rect(0, 10, 5, 5)
+    # Prawa krawędź przesuwanego prostokąta dochodzi dokładnie do lewej krawędzi celu
+    assert sweep_rect(rect, 5, 0, RECT) is None
+    assert sweep_rect(rect, 6, 0, RECT) == pytest.approx(5 / 6)
+
+
+def test_sweep_rect_zero_displacement_matches_colliderect():
+    overlapping = pygame.Rect(18, 18, 5, 5)
+    touching = pygame.Rect(20, 10, 5, 5)
+    assert sweep_rect(overlapping, 0, 0, RECT) == 0.0
+    assert overlapping.colliderect(RECT)
+    assert sweep_rect(touching, 0, 0, RECT) is None
+    assert not touching.colliderect(RECT)
+
+
+def test_sweep_rect_through_target_in_one_step():
+    # Pocisk przeskakuje przez cel w jednej klatce - końcowa pozycja go nie dotyka
+    rect = pygame.Rect(0, 12, 4, 4)
+    assert not rect.move(40, 0).colliderect(RECT)
+    assert sweep_rect(rect, 40, 0, RECT) == pytest.approx(6 / 40)
+
+
+def test_swept_hits_sorted_by_contact_time():
+    near = _Box(10, 0, 5, 20)
+    far = _Box(30, 0, 5, 20)
+    behind = _Box(-20, 0, 5, 20)
+    touching_end = _Box(50, 0, 5, 20)
+    hits = get_swept_hits([far, behind, touching_end, near], pygame.Rect(0, 5, 4, 4), 46, 0)
+    assert hits == [near, far]
+
+
+def test_swept_hits_zero_displacement_and_predicate():
+    inside = _Box(0, 0, 10, 10)
+    skipped = _Box(0, 0, 10, 10)
+    rect = pygame.Rect(2, 2, 4, 4)
+    hits = get_swept_hits([inside, skipped], rect, 0, 0, predicate=lambda box: box is not skipped)
+    assert hits == [inside]
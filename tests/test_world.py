@@ -0,0 +1,49 @@
+"""
+Testy World - liczniki uśpionych bytów według rodzaju i wyjmowanie nadmiaru z najdalszych kawałków.
+"""
+import pygame
+
+from src.world import World
+
+
+class _Box:
+    """Minimalny byt z rect, jak wrogowie i kryształy."""
+
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 10, 10)
+
+
+def _make_world():
+    world = World(10000, 10000, 800, 600, chunk_size=500, wake_margin=0)
+    world.update_camera(pygame.Rect(400, 300, 10, 10))
+    return world
+
+
+def test_stream_counts_sleeping_by_kind():
+    world = _make_world()
+    enemies = [_Box(100, 100), _Box(3000, 100), _Box(6000, 100)]
+    gems = [_Box(3000, 3000)]
+
+    assert world.stream('enemies', enemies) == enemies[:1]
+    world.stream('gems', gems)
+
+    assert world.get_sleeping_count('enemies') == 2
+    assert world.get_sleeping_count('gems') == 1
+    assert world.sleeping_count == 3
+
+
+def test_evict_sleeping_takes_farthest_chunks_first():
+    world = _make_world()
+    near, middle, far = _Box(1200, 100), _Box(3000, 100), _Box(9000, 100)
+    world.stream('enemies', [far, near, middle])
+
+    assert world.evict_sleeping('enemies', 2) == [far, middle]
+    assert world.get_sleeping_count('enemies') == 1
+    assert world.evict_sleeping('enemies', 0) == []
+
+    # Wyjęte byty nie wracają przy budzeniu kawałków
+    world.update_camera(pygame.Rect(9000, 300, 10, 10))
+    assert world.stream('enemies', []) == []
+    world.update_camera(pygame.Rect(1200, 300, 10, 10))
+    assert world.stream('enemies', []) == [near]
+    assert world.sleeping_count == 0